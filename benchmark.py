@@ -0,0 +1,363 @@
+"""
+Benchmark Module for PDF to Text Converter
+Generates a deterministic synthetic PDF corpus and measures extraction speed
+Created by Jaswanth
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from utils import FileUtilities
+
+
+# ============================================================================
+# SYNTHETIC CORPUS
+# ============================================================================
+
+# name: (files, pages per file, page kind)
+CORPUS_PROFILES = {
+    'many_small': (200, 2, 'text'),
+    'huge': (2, 1000, 'text'),
+    'text_dense': (20, 20, 'dense'),
+    'image_only': (10, 10, 'image'),
+}
+
+WORDS = ("agreement party clause section payment term notice liability service "
+         "customer report annual revenue growth market product quarter budget "
+         "policy review schedule delivery invoice contract renewal amendment "
+         "the of and to in for with on by as is be this that").split()
+
+CORPUS_VERSION = 1
+
+
+def _escape_pdf_string(text):
+    """Escape text for use inside a PDF literal string."""
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def _make_text_stream(rng, lines, words_per_line):
+    """Build a content stream that shows lines of random words."""
+    parts = ["BT /F1 10 Tf 12 TL 50 760 Td"]
+    for _ in range(lines):
+        line = ' '.join(rng.choice(WORDS) for _ in range(words_per_line))
+        parts.append(f"({_escape_pdf_string(line)}) Tj T*")
+    parts.append("ET")
+    return '\n'.join(parts).encode('latin-1')
+
+
+def _make_image_stream(rng, width=64, height=64):
+    """Build a content stream that paints an inline greyscale image."""
+    pixels = bytes(rng.randrange(256) for _ in range(width * height)).hex()
+    return (f"q 500 0 0 700 50 50 cm\nBI /W {width} /H {height} /CS /G /BPC 8 "
+            f"/F /AHx ID\n{pixels}>\nEI Q").encode('latin-1')
+
+
+def build_pdf(streams):
+    """Build a PDF file with one page per content stream."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for stream in streams:
+        page_number = len(objects) + 1
+        kids.append(f"{page_number} 0 R")
+        objects.append((f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                        f"/Resources << /Font << /F1 3 0 R >> >> "
+                        f"/Contents {page_number + 1} 0 R >>").encode('latin-1'))
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n".encode('latin-1')
+                       + stream + b"\nendstream")
+    objects[1] = (f"<< /Type /Pages /Kids [{' '.join(kids)}] "
+                  f"/Count {len(streams)} >>").encode('latin-1')
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n".encode('latin-1') + body + b"\nendobj\n"
+    xref_offset = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode('latin-1')
+    for offset in offsets:
+        output += f"{offset:010d} 00000 n \n".encode('latin-1')
+    output += (f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+               f"startxref\n{xref_offset}\n%%EOF\n").encode('latin-1')
+    return bytes(output)
+
+
+class CorpusGenerator:
+    """Write the benchmark corpus; identical seed and scale give identical bytes."""
+
+    def __init__(self, directory, seed=0, scale=1.0):
+        self.directory = directory
+        self.seed = seed
+        self.scale = scale
+
+    def make_page_stream(self, rng, kind):
+        """Build the content stream for one page of the given kind."""
+        if kind == 'dense':
+            return _make_text_stream(rng, lines=60, words_per_line=14)
+        if kind == 'image':
+            return _make_image_stream(rng)
+        return _make_text_stream(rng, lines=25, words_per_line=8)
+
+    def remove(self, marker):
+        """Delete the PDFs an older corpus.json lists, leaving anything else alone."""
+        for name, paths in marker.get('profiles', {}).items():
+            profile_directory = os.path.abspath(os.path.join(self.directory, name))
+            for path in paths:
+                path = os.path.abspath(path)
+                if os.path.dirname(path) != profile_directory or not path.endswith('.pdf'):
+                    continue
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            try:
+                # Only succeeds once the profile folder is empty
+                os.rmdir(profile_directory)
+            except OSError:
+                pass
+        os.remove(os.path.join(self.directory, 'corpus.json'))
+
+    def generate(self):
+        """Create (or reuse) the corpus; returns {profile: [pdf paths]}."""
+        marker_path = os.path.join(self.directory, 'corpus.json')
+        params = {'version': CORPUS_VERSION, 'seed': self.seed, 'scale': self.scale}
+        if os.path.exists(marker_path):
+            with open(marker_path, 'r', encoding='utf-8') as f:
+                marker = json.load(f)
+            if marker.get('params') == params:
+                return marker['profiles']
+            self.remove(marker)
+
+        FileUtilities.ensure_directory_exists(self.directory)
+        profiles = {}
+        for name, (files, pages, kind) in sorted(CORPUS_PROFILES.items()):
+            rng = random.Random(f"{self.seed}:{name}")
+            profile_directory = os.path.join(self.directory, name)
+            FileUtilities.ensure_directory_exists(profile_directory)
+            paths = []
+            for file_number in range(max(1, round(files * self.scale))):
+                path = os.path.join(profile_directory, f"{name}_{file_number:04d}.pdf")
+                streams = [self.make_page_stream(rng, kind) for _ in range(pages)]
+                with open(path, 'wb') as f:
+                    f.write(build_pdf(streams))
+                paths.append(path)
+            profiles[name] = paths
+
+        with open(marker_path, 'w', encoding='utf-8') as f:
+            json.dump({'params': params, 'profiles': profiles}, f, indent=2)
+        return profiles
+
+
+# ============================================================================
+# MEASUREMENT
+# ============================================================================
+
+def percentile(values, fraction):
+    """Get a percentile from a list of values by linear interpolation."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def get_peak_rss_mb():
+    """Get peak resident set size of this process and its children in MB."""
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return max(own, children) / scale
+
+
+def make_extractor(mode, cache_directory):
+    """Create the extractor measured by a benchmark mode."""
+    from extractor import TextExtractor
+    if mode == 'sequential':
+        return TextExtractor(mode='pypdf2')
+    if mode == 'fast':
+        return TextExtractor(mode='fast')
+    if mode == 'parallel':
+        from parallel import ParallelExtractor
+        return ParallelExtractor()
+    if mode in ('cache_cold', 'cache_warm'):
+        from cache import PageCache
+        return TextExtractor(cache=PageCache(cache_directory))
+    raise ValueError(f"Unknown benchmark mode: {mode}")
+
+
+def run_case(mode, files, cache_directory=None):
+    """Extract files with one mode in this process and return its measurements."""
+    extractor = make_extractor(mode, cache_directory)
+    if mode == 'cache_warm':
+        for _ in extractor.iter_pages(files):
+            pass
+
+    latencies = []
+    characters = 0
+    started = time.perf_counter()
+    for record in extractor.iter_pages(files):
+        latencies.append(record['extract_time'])
+        characters += len(record['text'])
+    elapsed = time.perf_counter() - started
+
+    return {
+        'files': len(files),
+        'pages': len(latencies),
+        'characters': characters,
+        'seconds': elapsed,
+        'pages_per_sec': len(latencies) / elapsed if elapsed > 0 else 0.0,
+        'latency_ms': {
+            'p50': percentile(latencies, 0.50) * 1000,
+            'p95': percentile(latencies, 0.95) * 1000,
+            'p99': percentile(latencies, 0.99) * 1000,
+            'max': max(latencies, default=0.0) * 1000,
+        },
+        'peak_rss_mb': get_peak_rss_mb(),
+    }
+
+
+def measure_startup(repeat=5):
+    """Time a fresh interpreter importing the extraction stack, in milliseconds."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, '-c', 'import extractor'], cwd=here, check=True)
+        timings.append((time.perf_counter() - started) * 1000)
+    return {'median_ms': statistics.median(timings), 'min_ms': min(timings)}
+
+
+def run_isolated_case(mode, profile, files, cache_directory):
+    """Run one case in a fresh interpreter so peak RSS is not shared between cases."""
+    here = os.path.abspath(__file__)
+    request = json.dumps({'mode': mode, 'files': files, 'cache': cache_directory})
+    completed = subprocess.run([sys.executable, here, '--run-case'], input=request,
+                               capture_output=True, text=True, check=True,
+                               cwd=os.path.dirname(here))
+    result = json.loads(completed.stdout)
+    result['mode'] = mode
+    result['profile'] = profile
+    return result
+
+
+def run_benchmarks(corpus, modes, profiles=None):
+    """Run every mode against every corpus profile; returns the report dict."""
+    cases = []
+    for profile, files in sorted(corpus.items()):
+        if profiles and profile not in profiles:
+            continue
+        for mode in modes:
+            cache_directory = tempfile.mkdtemp(prefix='pdf_bench_cache_')
+            try:
+                cases.append(run_isolated_case(mode, profile, files, cache_directory))
+            finally:
+                shutil.rmtree(cache_directory, ignore_errors=True)
+
+    return {
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'startup': measure_startup(),
+        'cases': cases,
+    }
+
+
+# ============================================================================
+# BASELINE COMPARISON
+# ============================================================================
+
+def compare_to_baseline(report, baseline, tolerance=0.10):
+    """List regressions of report against baseline beyond the given tolerance."""
+    regressions = []
+    previous = {(case['profile'], case['mode']): case for case in baseline.get('cases', [])}
+    for case in report['cases']:
+        old = previous.get((case['profile'], case['mode']))
+        if old is None:
+            continue
+        name = f"{case['profile']}/{case['mode']}"
+        if case['pages_per_sec'] < old['pages_per_sec'] * (1 - tolerance):
+            regressions.append(f"{name}: pages/sec {case['pages_per_sec']:.1f} "
+                               f"< baseline {old['pages_per_sec']:.1f}")
+        if case['latency_ms']['p95'] > old['latency_ms']['p95'] * (1 + tolerance):
+            regressions.append(f"{name}: p95 latency {case['latency_ms']['p95']:.2f} ms "
+                               f"> baseline {old['latency_ms']['p95']:.2f} ms")
+        if case['peak_rss_mb'] > old['peak_rss_mb'] * (1 + tolerance):
+            regressions.append(f"{name}: peak RSS {case['peak_rss_mb']:.1f} MB "
+                               f"> baseline {old['peak_rss_mb']:.1f} MB")
+
+    old_startup = baseline.get('startup', {}).get('median_ms')
+    if old_startup and report['startup']['median_ms'] > old_startup * (1 + tolerance):
+        regressions.append(f"startup: {report['startup']['median_ms']:.1f} ms "
+                           f"> baseline {old_startup:.1f} ms")
+    return regressions
+
+
+def build_parser():
+    """Build the command-line argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark text extraction against a synthetic PDF corpus.")
+    parser.add_argument('--corpus-dir',
+                        default=os.path.join(tempfile.gettempdir(), 'pdf_bench_corpus'),
+                        help="where the generated corpus is kept between runs")
+    parser.add_argument('--seed', type=int, default=0, help="corpus random seed")
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help="multiply the number of files in each profile")
+    parser.add_argument('--modes', default='sequential,fast,parallel,cache_cold,cache_warm',
+                        help="comma-separated extraction modes to measure")
+    parser.add_argument('--profiles', help="comma-separated corpus profiles to run")
+    parser.add_argument('-o', '--output', help="write the JSON report here")
+    parser.add_argument('--baseline', help="JSON report to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help="allowed relative slowdown before failing (default 0.10)")
+    parser.add_argument('--run-case', action='store_true', help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv=None):
+    """Run the benchmark; exits 1 if any regression against the baseline is found."""
+    args = build_parser().parse_args(argv)
+
+    if args.run_case:
+        request = json.loads(sys.stdin.read())
+        print(json.dumps(run_case(request['mode'], request['files'], request['cache'])))
+        return 0
+
+    corpus = CorpusGenerator(args.corpus_dir, args.seed, args.scale).generate()
+    modes = [mode.strip() for mode in args.modes.split(',') if mode.strip()]
+    profiles = args.profiles.split(',') if args.profiles else None
+    report = run_benchmarks(corpus, modes, profiles)
+    report['corpus'] = {'seed': args.seed, 'scale': args.scale}
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(report, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
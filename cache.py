@@ -0,0 +1,180 @@
+"""
+Page Cache Module for PDF to Text Converter
+Persistent content-addressed cache of extracted page text with LRU eviction
+Created by Jaswanth
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+import config
+from utils import FileUtilities
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS documents (
+    digest TEXT NOT NULL,
+    version TEXT NOT NULL,
+    num_pages INTEGER NOT NULL,
+    PRIMARY KEY (digest, version)
+);
+CREATE TABLE IF NOT EXISTS pages (
+    digest TEXT NOT NULL,
+    version TEXT NOT NULL,
+    page_index INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (digest, version, page_index)
+);
+CREATE INDEX IF NOT EXISTS pages_last_access ON pages (last_access);
+"""
+
+
+def default_cache_directory():
+    """Get the cache directory configured in CACHE, or the per-user default."""
+    directory = config.CACHE.get('directory')
+    if directory:
+        return directory
+    return os.path.join(os.path.expanduser('~'), '.cache', 'pdf_to_text')
+
+
+class PageCache:
+    """SQLite-backed cache keyed by (PDF content hash, page index, extractor version)."""
+
+    def __init__(self, directory=None, max_size_mb=None):
+        self.directory = directory or default_cache_directory()
+        max_size_mb = config.CACHE['max_size_mb'] if max_size_mb is None else max_size_mb
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        FileUtilities.ensure_directory_exists(self.directory)
+
+        self.path = os.path.join(self.directory, 'pages.sqlite3')
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, timeout=30,
+                                           check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.executescript(SCHEMA)
+        self._connection.commit()
+        # Running estimate so eviction only scans the table when the cap may be hit
+        self._size_estimate = self.total_size()
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def get_digest(self, filepath):
+        """Get the content hash of a file, skipping the rehash if its stat is unchanged."""
+        path = os.path.abspath(filepath)
+        size, mtime_ns = FileUtilities.get_file_signature(path)
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT size, mtime_ns, digest FROM files WHERE path = ?',
+                (path,)).fetchone()
+        if row and row[0] == size and row[1] == mtime_ns:
+            return row[2]
+
+        digest = FileUtilities.hash_file(path)
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO files (path, size, mtime_ns, digest) '
+                'VALUES (?, ?, ?, ?)', (path, size, mtime_ns, digest))
+            self._connection.commit()
+        return digest
+
+    def get_num_pages(self, digest, version):
+        """Get the cached page count of a document, or None if unknown."""
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT num_pages FROM documents WHERE digest = ? AND version = ?',
+                (digest, version)).fetchone()
+        return row[0] if row else None
+
+    def get_pages(self, digest, version, start=0, stop=None):
+        """Get (num_pages, texts) for pages [start, stop), or None on any miss."""
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT num_pages FROM documents WHERE digest = ? AND version = ?',
+                (digest, version)).fetchone()
+            if row is None:
+                return None
+            num_pages = row[0]
+            stop = num_pages if stop is None else min(stop, num_pages)
+            if stop <= start:
+                return num_pages, []
+
+            rows = self._connection.execute(
+                'SELECT page_index, text FROM pages WHERE digest = ? AND version = ? '
+                'AND page_index >= ? AND page_index < ? ORDER BY page_index',
+                (digest, version, start, stop)).fetchall()
+            if len(rows) != stop - start:
+                return None
+
+            self._connection.execute(
+                'UPDATE pages SET last_access = ? WHERE digest = ? AND version = ? '
+                'AND page_index >= ? AND page_index < ?',
+                (time.time(), digest, version, start, stop))
+            self._connection.commit()
+        return num_pages, [text for _, text in rows]
+
+    def put_pages(self, digest, version, num_pages, start, texts):
+        """Store texts for consecutive pages beginning at start, then evict if over size."""
+        now = time.time()
+        rows = [(digest, version, start + offset, text, len(text.encode('utf-8')), now)
+                for offset, text in enumerate(texts)]
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO documents (digest, version, num_pages) '
+                'VALUES (?, ?, ?)', (digest, version, num_pages))
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO pages '
+                '(digest, version, page_index, text, size, last_access) '
+                'VALUES (?, ?, ?, ?, ?, ?)', rows)
+            self._connection.commit()
+        self._size_estimate += sum(row[4] for row in rows)
+        if self._size_estimate > self.max_size_bytes:
+            self.evict()
+
+    def total_size(self):
+        """Get the total size of cached page text in bytes."""
+        with self._lock:
+            row = self._connection.execute('SELECT SUM(size) FROM pages').fetchone()
+        return row[0] or 0
+
+    def evict(self):
+        """Drop least recently used pages until the cache is back under its size cap."""
+        self._size_estimate = self.total_size()
+        excess = self._size_estimate - self.max_size_bytes
+        if excess <= 0:
+            return 0
+
+        removed = 0
+        with self._lock:
+            cursor = self._connection.execute(
+                'SELECT rowid, size FROM pages ORDER BY last_access')
+            doomed = []
+            for rowid, size in cursor:
+                doomed.append((rowid,))
+                removed += size
+                if removed >= excess:
+                    break
+            self._connection.executemany('DELETE FROM pages WHERE rowid = ?', doomed)
+            self._connection.commit()
+        self._size_estimate -= removed
+        return removed
+
+    def clear(self):
+        """Remove every cached entry."""
+        with self._lock:
+            self._connection.executescript(
+                'DELETE FROM pages; DELETE FROM documents; DELETE FROM files;')
+            self._connection.commit()
+        self._size_estimate = 0
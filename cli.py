@@ -0,0 +1,313 @@
+"""
+Command-Line Module for PDF to Text Converter
+Headless batch conversion with parallel jobs and a resumable manifest
+Created by Jaswanth
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from operator import itemgetter
+
+import config
+from cache import PageCache, default_cache_directory
+from dedup import get_deduplicator
+from extractor import TextExtractor
+from manifest import Manifest
+from metrics import MetricsRecorder, get_recorder
+from page_records import get_record_index_path
+from search_index import InvertedIndex, get_index_path
+from supervisor import SupervisedExtractor
+from utils import FileUtilities, ValidationUtilities
+from worker import ProgressTracker
+from writers import create_writer, get_output_files
+
+
+def scan_directory(directory, recursive=True):
+    """Yield PDF paths under a directory using os.scandir."""
+    stack = [directory]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = sorted(os.scandir(current), key=lambda entry: entry.name)
+        except OSError:
+            continue
+        subdirectories = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirectories.append(entry.path)
+            elif entry.is_file() and FileUtilities.is_valid_pdf(entry.name):
+                yield entry.path
+        if recursive:
+            stack.extend(reversed(subdirectories))
+
+
+def iter_inputs(inputs, recursive=True):
+    """Yield (pdf_path, base_directory) for files, directories and glob patterns."""
+    for item in inputs:
+        if os.path.isdir(item):
+            for path in scan_directory(item, recursive):
+                yield path, item
+        elif os.path.isfile(item):
+            yield item, os.path.dirname(item)
+        else:
+            for match in sorted(glob.glob(item, recursive=True)):
+                if os.path.isdir(match):
+                    for path in scan_directory(match, recursive):
+                        yield path, match
+                elif os.path.isfile(match):
+                    yield match, os.path.dirname(match)
+
+
+def get_output_path(pdf_file, base_directory, output_directory, extension=None):
+    """Mirror the input's path below its base directory inside the output directory."""
+    relative = os.path.relpath(pdf_file, base_directory or '.')
+    if relative.startswith(os.pardir):
+        relative = os.path.basename(pdf_file)
+    name = os.path.splitext(relative)[0] + (extension or config.DEFAULT_OUTPUT_EXTENSION)
+    return os.path.join(output_directory, name)
+
+
+def convert_file(pdf_file, output_path, cache_directory=None, search_index=None):
+    """Worker entry point: extract one PDF to its own text file.
+
+    With search_index (default OUTPUT['search_index']) the pages are also
+    indexed and the index is saved next to the output.
+    """
+    if search_index is None:
+        search_index = config.OUTPUT.get('search_index')
+    started = time.perf_counter()
+    size, mtime_ns = FileUtilities.get_file_signature(pdf_file)
+    digest = FileUtilities.hash_file(pdf_file)
+
+    cache = PageCache(cache_directory) if cache_directory else None
+    metrics = MetricsRecorder() if config.METRICS.get('enabled') else None
+    if config.SUPERVISION.get('enabled'):
+        extractor = SupervisedExtractor(cache=cache, metrics=metrics)
+    else:
+        # The deduplicator lives as long as this worker process, so pages
+        # repeated across files are stored once per worker
+        extractor = TextExtractor(cache=cache, metrics=metrics, dedup=get_deduplicator())
+    FileUtilities.ensure_directory_exists(os.path.dirname(os.path.abspath(output_path)))
+    index = InvertedIndex() if search_index else None
+    pages = 0
+    try:
+        with create_writer(output_path) as writer:
+            for record in extractor.iter_pages([pdf_file]):
+                writer.write_page(record, extractor.format_page(record))
+                if index is not None:
+                    index.add_page(record)
+                pages += 1
+    finally:
+        if cache is not None:
+            cache.close()
+
+    # A file that could not be opened at all is a failure of the whole job
+    if not pages and extractor.errors:
+        for path in get_output_files(output_path) + [get_record_index_path(output_path),
+                                                     get_index_path(output_path)]:
+            if os.path.exists(path):
+                os.remove(path)
+        raise RuntimeError(extractor.errors[0]['message'])
+    files = get_output_files(output_path)
+    if index is not None:
+        index.save(get_index_path(output_path))
+        files.append(get_index_path(output_path))
+    report_path = output_path + config.ERROR_REPORT_EXTENSION
+    if not extractor.write_error_report(report_path) and os.path.exists(report_path):
+        os.remove(report_path)
+
+    return {
+        'path': pdf_file,
+        'output': output_path,
+        # Compressed or sharded outputs never create output_path itself
+        'files': [os.path.abspath(name) for name in files],
+        'digest': digest,
+        'pages': pages,
+        'size': size,
+        'mtime_ns': mtime_ns,
+        'seconds': time.perf_counter() - started,
+        'failed_pages': len(extractor.errors),
+        'duplicate_pages': extractor.duplicate_pages,
+        'stage_seconds': dict(extractor.pipeline.stage_seconds) if extractor.pipeline else {},
+        'metrics': extractor.metrics.snapshot(),
+    }
+
+
+def collect_jobs(inputs, output_directory, recursive=True, manifest=None, log=None,
+                 extension=None):
+    """Yield (pdf_file, output_path) for valid inputs not already in the manifest."""
+    validation = config.VALIDATION
+    seen_outputs = set()
+    results = ValidationUtilities.iter_validated_files(
+        iter_inputs(inputs, recursive), key=itemgetter(0),
+        max_size_mb=validation['max_file_size_mb'],
+        sniff_bytes=validation['sniff_bytes'], max_workers=validation['max_workers'])
+    for (pdf_file, base_directory), is_valid, message in results:
+        if not is_valid:
+            if log:
+                log(f"Skipping {pdf_file}: {message}")
+            continue
+
+        output_path = get_output_path(pdf_file, base_directory, output_directory,
+                                      extension)
+        stem, output_extension = os.path.splitext(output_path)
+        suffix = 1
+        while output_path in seen_outputs:
+            output_path = f"{stem}_{suffix}{output_extension}"
+            suffix += 1
+        seen_outputs.add(output_path)
+
+        if manifest is not None and manifest.is_complete(pdf_file):
+            continue
+        yield pdf_file, output_path
+
+
+def run_batch(jobs, workers, manifest=None, cache_directory=None, log=None,
+              progress_interval=5.0, on_failure=None, search_index=None):
+    """Convert (pdf_file, output_path) jobs in a process pool; returns (done, failed).
+
+    Each result is passed to manifest.record(); on_failure(pdf_file, error)
+    is called for files that could not be converted. search_index is passed
+    on to convert_file.
+    """
+    done = failed = duplicates = 0
+    stage_seconds = {}
+    progress = ProgressTracker()
+    metrics = get_recorder()
+    last_report = time.monotonic()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+        jobs = iter(jobs)
+        exhausted = False
+        while pending or not exhausted:
+            # Keep a bounded number of jobs queued so huge batches stream
+            while not exhausted and len(pending) < workers * 4:
+                try:
+                    pdf_file, output_path = next(jobs)
+                except StopIteration:
+                    exhausted = True
+                    break
+                future = executor.submit(convert_file, pdf_file, output_path,
+                                         cache_directory, search_index)
+                pending[future] = pdf_file
+            if not pending:
+                break
+
+            metrics.record_queue_depth(len(pending))
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                pdf_file = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    failed += 1
+                    if log:
+                        log(f"Error extracting text from {pdf_file}: {e}")
+                    if on_failure is not None:
+                        on_failure(pdf_file, e)
+                    continue
+                done += 1
+                progress.done += result['pages']
+                duplicates += result['duplicate_pages']
+                for name, seconds in result.pop('stage_seconds').items():
+                    stage_seconds[name] = stage_seconds.get(name, 0.0) + seconds
+                if log and result['failed_pages']:
+                    log(f"{result['failed_pages']} page(s) of {pdf_file} failed; see "
+                        f"{result['output']}{config.ERROR_REPORT_EXTENSION}")
+                metrics.merge(result.pop('metrics'))
+                if manifest is not None:
+                    manifest.record(**result)
+
+            if log and time.monotonic() - last_report >= progress_interval:
+                last_report = time.monotonic()
+                log(f"{done} file(s) converted, {failed} failed | "
+                    f"{progress.done} pages | {progress.rate():.1f} pages/sec")
+    if log and stage_seconds:
+        log("Post-processing: " + ", ".join(f"{name} {seconds:.2f}s"
+                                            for name, seconds in stage_seconds.items()))
+    if log and duplicates:
+        log(f"{duplicates} of {progress.done} pages were duplicates written as "
+            f"references (dedup ratio {duplicates / progress.done:.1%})")
+    return done, failed
+
+
+def build_parser():
+    """Build the command-line argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Convert PDF files to text without opening the GUI.")
+    parser.add_argument('inputs', nargs='+',
+                        help="PDF files, directories or glob patterns")
+    parser.add_argument('-o', '--output-dir', default='.',
+                        help="directory for the .txt outputs (default: current)")
+    parser.add_argument('-j', '--jobs', type=int,
+                        default=config.PERFORMANCE.get('max_workers') or os.cpu_count(),
+                        help="number of files converted in parallel")
+    parser.add_argument('-f', '--format', choices=('text', 'jsonl'), default='text',
+                        help="'jsonl' writes one JSON record per page plus a "
+                             "byte-offset index for random access (default: text)")
+    parser.add_argument('-m', '--manifest',
+                        help="JSONL checkpoint used to skip finished files on rerun")
+    parser.add_argument('--no-recursive', action='store_true',
+                        help="only convert PDFs directly inside given directories")
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help="only report errors")
+    parser.add_argument('-w', '--watch', type=float, metavar='SECONDS',
+                        help="keep a single input directory in sync, rescanning "
+                             "every SECONDS; only new or changed files are extracted "
+                             "and outputs of deleted files are removed")
+    parser.add_argument('--index',
+                        help="stat index used by --watch (default: OUTPUT_DIR/.watch_index.json)")
+    parser.add_argument('-s', '--search-index', action='store_true',
+                        default=config.OUTPUT.get('search_index'),
+                        help="also save a .search index next to every output, "
+                             "for search_index.py")
+    return parser
+
+
+def main(argv=None):
+    """Run the batch converter; returns the process exit code."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    def log(message):
+        print(message, file=sys.stderr, flush=True)
+
+    extension = config.RECORD_OUTPUT_EXTENSION if args.format == 'jsonl' else None
+    if args.watch is not None:
+        if len(args.inputs) != 1 or not os.path.isdir(args.inputs[0]):
+            parser.error("--watch takes exactly one input directory")
+        from watcher import FolderWatcher
+        watcher = FolderWatcher(args.inputs[0], args.output_dir, args.index,
+                                max(1, args.jobs), None if args.quiet else log, extension,
+                                args.search_index)
+        try:
+            watcher.watch(args.watch)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    manifest = Manifest(args.manifest) if args.manifest else None
+    cache_directory = default_cache_directory() if config.CACHE.get('enabled') else None
+    jobs = collect_jobs(args.inputs, args.output_dir, not args.no_recursive,
+                        manifest, log, extension)
+    try:
+        done, failed = run_batch(jobs, max(1, args.jobs), manifest, cache_directory,
+                                 None if args.quiet else log,
+                                 search_index=args.search_index)
+    finally:
+        if manifest is not None:
+            manifest.close()
+        get_recorder().flush()
+
+    if not args.quiet or failed:
+        log(f"Converted {done} file(s), {failed} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
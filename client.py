@@ -0,0 +1,176 @@
+"""
+Client Module for PDF to Text Converter
+Thin command-line client for the extraction daemon; imports neither tkinter nor PyPDF2
+Created by Jaswanth
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+
+import config
+
+
+# Requests sent ahead of their responses on one connection
+CLIENT_WINDOW = 64
+
+
+class DaemonUnavailable(OSError):
+    """No daemon is listening on the socket."""
+
+
+def get_socket_path():
+    """Get the daemon socket configured in DAEMON, or the per-user default."""
+    path = config.DAEMON.get('socket_path')
+    if path:
+        return path
+    directory = os.environ.get('XDG_RUNTIME_DIR') or os.environ.get('TMPDIR') or '/tmp'
+    return os.path.join(directory, f"pdf_converter-{os.getuid()}.sock")
+
+
+def get_client_output_path(pdf_file, output_directory, extension=None):
+    """Get the absolute output path for a PDF written into output_directory."""
+    name = os.path.splitext(os.path.basename(pdf_file))[0]
+    return os.path.abspath(os.path.join(
+        output_directory, name + (extension or config.DEFAULT_OUTPUT_EXTENSION)))
+
+
+class DaemonClient:
+    """One connection to the extraction daemon speaking JSON lines.
+
+    Every request is answered by exactly one response line, in request
+    order, so several requests can be in flight on the same connection.
+    """
+
+    def __init__(self, socket_path=None, timeout=None):
+        self.socket_path = socket_path or get_socket_path()
+        self.timeout = timeout or config.DAEMON.get('request_timeout')
+        self.sock = None
+        self.reader = None
+
+    def connect(self):
+        """Open the connection; raises DaemonUnavailable if nothing is listening."""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            sock.close()
+            raise DaemonUnavailable(f"No extraction daemon at {self.socket_path}: {e}")
+        self.sock = sock
+        self.reader = sock.makefile('rb')
+        return self
+
+    def send(self, message):
+        """Send one request without waiting for its response."""
+        if self.sock is None:
+            self.connect()
+        self.sock.sendall(json.dumps(message).encode('utf-8') + b'\n')
+
+    def receive(self):
+        """Read the response to the oldest outstanding request."""
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("Extraction daemon closed the connection")
+        return json.loads(line)
+
+    def request(self, message):
+        """Send a request and wait for its response."""
+        self.send(message)
+        return self.receive()
+
+    def ping(self):
+        """Check the daemon is alive; returns its status response."""
+        return self.request({'op': 'ping'})
+
+    def shutdown(self):
+        """Ask the daemon to stop after finishing requests in progress."""
+        return self.request({'op': 'shutdown'})
+
+    def convert(self, pdf_file, output_path):
+        """Convert one PDF; returns the daemon's response."""
+        return self.request({'op': 'convert', 'input': os.path.abspath(pdf_file),
+                             'output': os.path.abspath(output_path)})
+
+    def convert_many(self, jobs, window=CLIENT_WINDOW):
+        """Convert (pdf_file, output_path) jobs; yields (pdf_file, response) in order."""
+        pending = []
+        for pdf_file, output_path in jobs:
+            self.send({'op': 'convert', 'input': os.path.abspath(pdf_file),
+                       'output': os.path.abspath(output_path)})
+            pending.append(pdf_file)
+            if len(pending) >= window:
+                yield pending.pop(0), self.receive()
+        for pdf_file in pending:
+            yield pdf_file, self.receive()
+
+    def close(self):
+        """Close the connection."""
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+def build_parser():
+    """Build the command-line argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Convert PDF files through a running extraction daemon.")
+    parser.add_argument('inputs', nargs='*', help="PDF files to convert")
+    parser.add_argument('-o', '--output-dir', default='.',
+                        help="directory for the outputs (default: current)")
+    parser.add_argument('-f', '--format', choices=('text', 'jsonl'), default='text',
+                        help="output format (default: text)")
+    parser.add_argument('-s', '--socket', help="daemon socket path")
+    parser.add_argument('--ping', action='store_true', help="check the daemon is running")
+    parser.add_argument('--shutdown', action='store_true', help="stop the daemon")
+    parser.add_argument('-q', '--quiet', action='store_true', help="only report errors")
+    return parser
+
+
+def main(argv=None):
+    """Run the client; returns 0 on success, 1 if a file failed, 2 if no daemon runs."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not (args.inputs or args.ping or args.shutdown):
+        parser.error("give PDF files to convert, --ping or --shutdown")
+
+    extension = config.RECORD_OUTPUT_EXTENSION if args.format == 'jsonl' else None
+    failed = 0
+    try:
+        with DaemonClient(args.socket).connect() as client:
+            if args.ping:
+                status = client.ping()
+                print(f"Daemon {status['pid']} running with {status['workers']} worker(s)")
+            jobs = [(pdf_file, get_client_output_path(pdf_file, args.output_dir, extension))
+                    for pdf_file in args.inputs]
+            for pdf_file, response in client.convert_many(jobs):
+                if not response['ok']:
+                    failed += 1
+                    print(f"Error extracting text from {pdf_file}: {response['error']}",
+                          file=sys.stderr)
+                elif not args.quiet:
+                    result = response['result']
+                    print(f"{result['output']} ({result['pages']} pages, "
+                          f"{result['seconds'] * 1000:.1f} ms)")
+            if args.shutdown:
+                client.shutdown()
+    except DaemonUnavailable as e:
+        print(f"{e}\nStart one with: python daemon.py", file=sys.stderr)
+        return 2
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -59,6 +59,11 @@ TEXT_ENCODING = 'utf-8'
 TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
 DEFAULT_OUTPUT_PREFIX = "extracted_text"
 DEFAULT_OUTPUT_EXTENSION = ".txt"
+SEARCH_INDEX_EXTENSION = ".search"  # Appended to the output path
+ERROR_REPORT_EXTENSION = ".errors.jsonl"  # Failed pages, appended to the output path
+RECORD_OUTPUT_EXTENSION = ".jsonl"  # Outputs with this extension get one JSON record per page
+RECORD_INDEX_EXTENSION = ".idx"  # Page offset index, appended to a .jsonl output path
+SHARD_MANIFEST_EXTENSION = ".shards.json"  # Lists the shards of a sharded output
 
 # ============================================================================
 # TEXT EXTRACTION CONFIGURATION
@@ -68,6 +73,7 @@ DEFAULT_OUTPUT_EXTENSION = ".txt"
 PAGE_SEPARATOR = "="*80
 PAGE_MARKER_FORMAT = "--- Page {page_num} ---"
 FILE_HEADER_FORMAT = "File: {filename}\nPages: {num_pages}"
+DUPLICATE_REFERENCE_FORMAT = "[Duplicate of {filename} page {page_num}]"
 
 # Text Processing
 ADD_PAGE_NUMBERS = True
@@ -131,6 +137,7 @@ FILE_LISTBOX_HEIGHT = 4
 
 TEXT_DISPLAY_HEIGHT = 15
 TEXT_DISPLAY_WRAP = 'word'
+TEXT_DISPLAY_WINDOW_PAGES = 6  # Pages kept loaded in the viewer at once
 
 # ============================================================================
 # FEATURES
@@ -154,6 +161,8 @@ VALIDATION = {
     'require_file_selection': True,
     'max_file_size_mb': 100,  # Max PDF file size
     'supported_extensions': ['.pdf'],
+    'sniff_bytes': 4096,  # Bytes read from each end to check header and trailer
+    'max_workers': 32,  # Threads validating files concurrently (I/O bound)
 }
 
 # ============================================================================
@@ -161,6 +170,111 @@ VALIDATION = {
 # ============================================================================
 
 PERFORMANCE = {
-    'buffer_size': 1024,
+    'buffer_size': 1024 * 1024,  # Output file write buffer in bytes
     'update_interval_ms': 100,
+    'max_events_per_tick': 500,  # Worker events the GUI handles per update, so it stays responsive
+    'parallel_extraction': False,  # Extract pages in a process pool
+    'max_workers': None,  # None = one worker per CPU core
+    'pages_per_task': 8,  # Smallest page range handed to a worker at a time
+    'max_buffered_pages': 4096,  # Pages finished ahead of the output before it is caught up
+    'memory_budget_mb': 256,  # Page text held in memory before it is spilled to disk; None = unlimited
+    # 'pypdf2' = PyPDF2 layout extraction for every page
+    # 'fast' = read Tj/TJ text straight from content streams, falling back
+    # to PyPDF2 on pages with unusual fonts, images or form XObjects
+    'extraction_mode': 'pypdf2',
+}
+
+# ============================================================================
+# OUTPUT SETTINGS
+# ============================================================================
+
+OUTPUT = {
+    'compression': None,  # None, 'gzip', 'bz2' or 'lzma' for text outputs
+    'compression_level': 6,  # 1 (fastest) to 9 (smallest)
+    'shard_size_mb': None,  # Start a new shard after this many MB on disk
+    'shard_pages': None,  # Start a new shard after this many pages
+    'queue_chunks': 256,  # Pages buffered for the compression thread
+    'search_index': False,  # Save a .search index next to CLI, watch and daemon outputs
+}
+
+# ============================================================================
+# DEDUPLICATION SETTINGS
+# ============================================================================
+
+DEDUP = {
+    'enabled': False,  # Write repeated pages as references to their first occurrence
+    'near_duplicates': False,  # Also catch near-identical pages (MinHash over text)
+    'near_threshold': 0.9,  # Estimated similarity at which pages count as duplicates
+    'shingle_words': 5,  # Words per shingle compared between pages
+    'minhash_bins': 64,  # Signature size per page (multiple of 4)
+}
+
+# ============================================================================
+# POST-PROCESSING SETTINGS
+# ============================================================================
+
+POSTPROCESS = {
+    # Stages applied to each page's text, in order; [] = leave text as extracted.
+    # 'line_endings', 'whitespace' (follows PRESERVE_WHITESPACE), 'dehyphenate',
+    # 'headers_footers' and 'unicode'
+    'stages': [],
+    'unicode_form': 'NFKC',  # NFC keeps ligatures and full-width forms; NFKC unfolds them
+    'header_footer_lines': 2,  # Lines at the top and bottom of a page checked for repeats
+    'header_footer_window': 8,  # Neighbouring pages each page is compared with
+    'header_footer_min_repeats': 3,  # Pages in the window a line must appear on to be dropped
+}
+
+# ============================================================================
+# SUPERVISION SETTINGS
+# ============================================================================
+
+SUPERVISION = {
+    'enabled': False,  # Extract in watched worker processes that are killed on hang/crash
+    'page_timeout': 60,  # Seconds a page may take before its worker is killed
+    'memory_limit_mb': 2048,  # Address space per worker (Unix only); None = unlimited
+}
+
+# ============================================================================
+# CACHE SETTINGS
+# ============================================================================
+
+CACHE = {
+    'enabled': False,  # Reuse text extracted from identical PDFs
+    'directory': None,  # None = ~/.cache/pdf_to_text
+    'max_size_mb': 512,  # Least recently used pages are evicted beyond this
+}
+
+# ============================================================================
+# METRICS SETTINGS
+# ============================================================================
+
+METRICS = {
+    'enabled': False,  # Record per-page timings (negligible cost when off)
+    'flush_pages': 1024,  # Samples buffered before they are aggregated
+    'json_path': None,  # Write a JSON summary here after each batch
+    'prometheus_path': None,  # node-exporter textfile, e.g. /var/lib/node_exporter/pdf.prom
+}
+
+# ============================================================================
+# DAEMON SETTINGS
+# ============================================================================
+
+DAEMON = {
+    'socket_path': None,  # None = pdf_converter-<uid>.sock in $XDG_RUNTIME_DIR or /tmp
+    'workers': None,  # Warm worker processes; None = one per CPU core
+    'request_timeout': 600,  # Seconds the client waits for one document
+}
+
+# ============================================================================
+# HTTP SERVER SETTINGS
+# ============================================================================
+
+SERVER = {
+    'host': '127.0.0.1',  # Uploads are not authenticated; keep to localhost
+    'port': 8765,
+    'workers': None,  # Extraction processes; None = one per CPU core
+    'max_queued': 8,  # Requests waiting for a worker before new ones get 429
+    'max_upload_mb': None,  # None = VALIDATION['max_file_size_mb']
+    'read_timeout': 30,  # Seconds to wait for each part of an upload
+    'upload_dir': None,  # Temporary upload files; None = system temp directory
 }
@@ -0,0 +1,232 @@
+"""
+Daemon Module for PDF to Text Converter
+Long-lived server keeping a warm extraction pool behind a local Unix socket
+Created by Jaswanth
+"""
+
+import argparse
+import json
+import os
+import queue
+import signal
+import socket
+import sys
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import config
+from cache import default_cache_directory
+from cli import convert_file
+from client import DaemonClient, DaemonUnavailable, get_socket_path
+from dedup import get_deduplicator
+from metrics import get_recorder
+
+
+# Seconds between checks of the stop flag while waiting for connections
+ACCEPT_POLL_SECONDS = 0.5
+
+# Socket permissions: only the owner may submit files
+SOCKET_MODE = 0o600
+
+
+def _convert(pdf_file, output_path, cache_directory):
+    """Worker entry point: convert one document independently of earlier requests."""
+    dedup = get_deduplicator()
+    if dedup is not None:
+        # Requests are unrelated documents, so never reference another one's pages
+        dedup.clear()
+    return convert_file(pdf_file, output_path, cache_directory)
+
+
+def _get_pid():
+    """Worker entry point used to start and warm up pool processes."""
+    return os.getpid()
+
+
+def _completed(value):
+    """Wrap an immediate response so it queues alongside pending conversions."""
+    future = Future()
+    future.set_result(value)
+    return future
+
+
+class ExtractionDaemon:
+    """Serve conversion requests over a Unix socket from a pool of warm workers.
+
+    Workers are forked from a process that has already imported the
+    extraction stack, and are started before the first request, so a
+    request only pays for the extraction itself. Each connection sends
+    JSON lines ({'op': 'convert', 'input': ..., 'output': ...}, 'ping' or
+    'shutdown') and gets one JSON line back per request, in order.
+    """
+
+    def __init__(self, socket_path=None, workers=None):
+        self.socket_path = socket_path or get_socket_path()
+        self.workers = max(1, workers or config.DAEMON.get('workers') or os.cpu_count() or 1)
+        self.cache_directory = (default_cache_directory() if config.CACHE.get('enabled')
+                                else None)
+        self.metrics = get_recorder()
+        self.pool = None
+        self.listener = None
+        self._pool_lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    def start_pool(self):
+        """Start every worker process and wait until all of them answer."""
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        futures = [self.pool.submit(_get_pid) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    def submit(self, pdf_file, output_path):
+        """Queue a conversion, replacing the pool if a crashed worker broke it."""
+        with self._pool_lock:
+            try:
+                return self.pool.submit(_convert, pdf_file, output_path,
+                                        self.cache_directory)
+            except BrokenProcessPool:
+                self.pool.shutdown(wait=False, cancel_futures=True)
+                self.start_pool()
+                return self.pool.submit(_convert, pdf_file, output_path,
+                                        self.cache_directory)
+
+    def bind(self):
+        """Listen on the socket, replacing a stale one left by a dead daemon."""
+        if os.path.exists(self.socket_path):
+            try:
+                DaemonClient(self.socket_path, timeout=1).connect().close()
+            except DaemonUnavailable:
+                os.remove(self.socket_path)
+            else:
+                raise RuntimeError(f"A daemon is already listening on {self.socket_path}")
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.listener.bind(self.socket_path)
+        os.chmod(self.socket_path, SOCKET_MODE)
+        self.listener.listen(64)
+        self.listener.settimeout(ACCEPT_POLL_SECONDS)
+
+    def start(self):
+        """Warm up the workers, then start listening."""
+        self.start_pool()
+        self.bind()
+
+    def stop(self):
+        """Ask serve_forever() to return; safe to call from a signal handler."""
+        self._stopping.set()
+
+    def serve_forever(self):
+        """Accept connections until stop() is called, then shut everything down."""
+        try:
+            while not self._stopping.is_set():
+                try:
+                    connection, _ = self.listener.accept()
+                except socket.timeout:
+                    continue
+                connection.settimeout(None)
+                threading.Thread(target=self.handle_connection, args=(connection,),
+                                 daemon=True).start()
+        finally:
+            self.close()
+
+    def close(self):
+        """Stop listening, remove the socket and stop the workers."""
+        if self.listener is not None:
+            self.listener.close()
+            self.listener = None
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+        if self.pool is not None:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            self.pool = None
+        self.metrics.flush()
+
+    def handle_connection(self, connection):
+        """Read requests from one client and answer them in order."""
+        responses = queue.Queue()
+        writer = threading.Thread(target=self._write_responses,
+                                  args=(connection, responses), daemon=True)
+        writer.start()
+        try:
+            with connection.makefile('rb') as reader:
+                for line in reader:
+                    responses.put(self.dispatch(line))
+        except OSError:
+            pass
+        finally:
+            responses.put(None)
+            writer.join()
+            connection.close()
+
+    def dispatch(self, line):
+        """Start handling one request line; returns a future of its response."""
+        try:
+            request = json.loads(line)
+            op = request.get('op')
+            if op == 'convert':
+                return self.submit(request['input'], request['output'])
+            if op == 'ping':
+                return _completed({'ok': True, 'pid': os.getpid(),
+                                   'workers': self.workers})
+            if op == 'shutdown':
+                self.stop()
+                return _completed({'ok': True})
+            return _completed({'ok': False, 'error': f"Unknown request: {op!r}"})
+        except Exception as e:
+            return _completed({'ok': False, 'error': f"Bad request: {e}"})
+
+    def _write_responses(self, connection, responses):
+        """Send each response as soon as it and every one before it is ready."""
+        connected = True
+        while True:
+            future = responses.get()
+            if future is None:
+                break
+            try:
+                response = future.result()
+                if 'ok' not in response:
+                    self.metrics.merge(response.pop('metrics'))
+                    response = {'ok': True, 'result': response}
+            except Exception as e:
+                response = {'ok': False, 'error': str(e) or type(e).__name__}
+            if not connected:
+                continue
+            try:
+                connection.sendall(json.dumps(response).encode('utf-8') + b'\n')
+            except OSError:
+                # The client went away; let its remaining conversions finish quietly
+                connected = False
+
+
+def build_parser():
+    """Build the command-line argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Run the PDF extraction daemon used by client.py.")
+    parser.add_argument('-s', '--socket', help="socket path (default: DAEMON['socket_path'])")
+    parser.add_argument('-j', '--workers', type=int,
+                        help="warm worker processes (default: DAEMON['workers'])")
+    return parser
+
+
+def main(argv=None):
+    """Run the daemon until it is asked to shut down or receives SIGTERM/SIGINT."""
+    args = build_parser().parse_args(argv)
+    daemon = ExtractionDaemon(args.socket, args.workers)
+    try:
+        daemon.start()
+    except (OSError, RuntimeError) as e:
+        print(f"Cannot start daemon: {e}", file=sys.stderr)
+        daemon.close()
+        return 1
+    signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+    print(f"Listening on {daemon.socket_path} with {daemon.workers} worker(s)",
+          file=sys.stderr, flush=True)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
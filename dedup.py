@@ -0,0 +1,218 @@
+"""
+Deduplication Module for PDF to Text Converter
+Exact page fingerprints before extraction and MinHash near-duplicate detection after
+Created by Jaswanth
+"""
+
+import hashlib
+import os
+import zlib
+from array import array
+
+import config
+
+
+# Font entries that do not influence extracted text but can be megabytes large
+SKIPPED_FONT_KEYS = frozenset(('/FontFile', '/FontFile2', '/FontFile3', '/Widths',
+                               '/FontBBox', '/CharProcs'))
+
+# Page resources that can change extracted text: fonts decode the content
+# streams and form XObjects are drawn, and read, through the Do operator
+TEXT_RESOURCE_KEYS = ('/Font', '/XObject')
+
+# Sentinel for MinHash bins no shingle fell into
+EMPTY_BIN = (1 << 64) - 1
+
+
+def _hash_object(obj, digest, seen, depth=0):
+    """Feed a canonical serialisation of a PDF object graph into a hash."""
+    if depth > 32:
+        return
+    reference = getattr(obj, 'idnum', None)
+    if reference is not None:
+        key = (reference, getattr(obj, 'generation', 0))
+        if key in seen:
+            # Number objects by first visit, so different shared objects differ
+            digest.update(b'R%d' % seen[key])
+            return
+        seen[key] = len(seen)
+        obj = obj.get_object()
+
+    if isinstance(obj, dict):
+        if obj.get('/Subtype') == '/Image':
+            # Images carry no text; their data can be megabytes
+            digest.update(b'image')
+            return
+        digest.update(b'<<')
+        for key in sorted(obj):
+            if key in SKIPPED_FONT_KEYS:
+                continue
+            digest.update(str(key).encode('utf-8', 'replace'))
+            _hash_object(obj[key], digest, seen, depth + 1)
+        data = getattr(obj, '_data', None)
+        if data is not None:
+            digest.update(b'stream')
+            digest.update(data)
+        digest.update(b'>>')
+    elif isinstance(obj, list):
+        digest.update(b'[')
+        for item in obj:
+            _hash_object(item, digest, seen, depth + 1)
+        digest.update(b']')
+    else:
+        digest.update(repr(obj).encode('utf-8', 'replace'))
+        digest.update(b' ')
+
+
+def get_page_fingerprint(page):
+    """Hash a page's raw content streams and text resources without extracting text.
+
+    Text extraction reads only the content streams, the fonts they select
+    and the form XObjects they draw, including each form's own stream and
+    resources, so all of these are hashed. Two pages with the same
+    fingerprint therefore produce the same text.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    contents = page.get('/Contents')
+    if contents is not None:
+        contents = contents.get_object()
+        for stream in (contents if isinstance(contents, list) else [contents]):
+            # The encoded bytes identify the content without decompressing it
+            stream = stream.get_object()
+            data = getattr(stream, '_data', None)
+            digest.update(data if data is not None else stream.get_data())
+    resources = page.get('/Resources')
+    resources = resources.get_object() if resources is not None else {}
+    seen = {}
+    for key in TEXT_RESOURCE_KEYS:
+        digest.update(b'\0' + key.encode('ascii'))
+        value = resources.get(key)
+        if value is not None:
+            _hash_object(value, digest, seen)
+    return digest.digest()
+
+
+def get_minhash_signature(text, num_bins, shingle_words):
+    """One-permutation MinHash of a text's word shingles, or None if it is too short."""
+    words = [zlib.crc32(word.encode('utf-8')) for word in text.lower().split()]
+    if len(words) < shingle_words:
+        return None
+    mins = [EMPTY_BIN] * num_bins
+    for start in range(len(words) - shingle_words + 1):
+        # hash() of an int tuple is the same in every process, unlike str hashes
+        value = hash(tuple(words[start:start + shingle_words])) & EMPTY_BIN
+        slot = value % num_bins
+        if value < mins[slot]:
+            mins[slot] = value
+    return mins
+
+
+class PageDeduplicator:
+    """Remember pages seen so far and find exact and near duplicates of new ones.
+
+    References are dicts with file, filename and page_num of the page whose
+    text was kept.
+    """
+
+    def __init__(self, near_duplicates=None, near_threshold=None, num_bins=None,
+                 shingle_words=None):
+        settings = config.DEDUP
+        self.near_duplicates = (settings.get('near_duplicates')
+                                if near_duplicates is None else near_duplicates)
+        self.near_threshold = near_threshold or settings['near_threshold']
+        self.num_bins = num_bins or settings['minhash_bins']
+        self.shingle_words = shingle_words or settings['shingle_words']
+        # Bands of rows for LSH; a pair shares a bucket with probability
+        # 1 - (1 - s^rows)^bands, about 0.99 at s = 0.8 for 16 bands of 4
+        self.rows = 4
+        self.bands = self.num_bins // self.rows
+        self.clear()
+
+    def clear(self):
+        """Forget every page seen."""
+        self.exact = {}
+        self.references = []
+        self.signatures = array('Q')
+        self.buckets = {}
+
+    @staticmethod
+    def make_reference(record):
+        """Build the reference stored for a page whose text is kept."""
+        return {'file': record['file'], 'filename': record['filename'],
+                'page_num': record['page_num']}
+
+    def find_exact(self, fingerprint):
+        """Get the reference for a fingerprint seen before, or None."""
+        return self.exact.get(fingerprint)
+
+    def add_exact(self, fingerprint, reference):
+        """Remember the page a fingerprint's text can be found on."""
+        self.exact.setdefault(fingerprint, reference)
+
+    def find_near(self, text):
+        """Look for a kept page with similar text.
+
+        Returns ((reference, similarity) or None, signature), where the
+        signature is passed to add_near() if the page is kept.
+        """
+        if not self.near_duplicates:
+            return None, None
+        signature = get_minhash_signature(text, self.num_bins, self.shingle_words)
+        if signature is None:
+            return None, None
+
+        checked = set()
+        best = None
+        for band in range(self.bands):
+            key = (band, tuple(signature[band * self.rows:(band + 1) * self.rows]))
+            for page_id in self.buckets.get(key, ()):
+                if page_id in checked:
+                    continue
+                checked.add(page_id)
+                similarity = self.estimate_similarity(signature, page_id)
+                if similarity >= self.near_threshold and (best is None
+                                                          or similarity > best[1]):
+                    best = (self.references[page_id], similarity)
+        return best, signature
+
+    def estimate_similarity(self, signature, page_id):
+        """Estimate Jaccard similarity with a stored page from matching bins."""
+        stored = self.signatures[page_id * self.num_bins:(page_id + 1) * self.num_bins]
+        matches = filled = 0
+        for value, other in zip(signature, stored):
+            if value == EMPTY_BIN and other == EMPTY_BIN:
+                continue
+            filled += 1
+            matches += value == other
+        return matches / filled if filled else 0.0
+
+    def add_near(self, signature, reference):
+        """Index a kept page's signature for later near-duplicate lookups."""
+        if signature is None:
+            return
+        page_id = len(self.references)
+        self.references.append(reference)
+        self.signatures.extend(signature)
+        for band in range(self.bands):
+            key = (band, tuple(signature[band * self.rows:(band + 1) * self.rows]))
+            self.buckets.setdefault(key, []).append(page_id)
+
+
+_deduplicator = None
+_deduplicator_pid = None
+
+
+def get_deduplicator():
+    """Get the process-wide deduplicator if DEDUP is enabled, else None.
+
+    Worker processes keep one for their lifetime, so duplicates are found
+    across every file a worker handles. A forked worker starts empty rather
+    than inheriting pages its parent saw.
+    """
+    global _deduplicator, _deduplicator_pid
+    if not config.DEDUP.get('enabled'):
+        return None
+    if _deduplicator is None or _deduplicator_pid != os.getpid():
+        _deduplicator = PageDeduplicator()
+        _deduplicator_pid = os.getpid()
+    return _deduplicator
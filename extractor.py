@@ -0,0 +1,332 @@
+"""
+Extraction Engine Module for PDF to Text Converter
+GUI-free text extraction that streams results one page at a time
+Created by Jaswanth
+"""
+
+import json
+import os
+import time
+
+import PyPDF2
+
+import config
+from dedup import get_deduplicator, get_page_fingerprint
+from fast_text import FAST_PATH_VERSION, FastTextExtractor, UnsupportedPage
+from metrics import get_recorder
+from postprocess import create_pipeline
+
+
+# Bump the suffix whenever a change alters the text produced for a page,
+# so cached results from older code are not reused
+EXTRACTOR_VERSION = f"pypdf2-{PyPDF2.__version__}-1"
+
+# Values of PERFORMANCE['extraction_mode']
+EXTRACTION_MODES = ('pypdf2', 'fast')
+
+# Pages written to the cache per transaction while a file is extracted
+CACHE_BATCH_PAGES = 64
+
+
+def get_content_length(page):
+    """Get the encoded size of a page's content streams without decoding them."""
+    try:
+        contents = page.get('/Contents')
+        if contents is None:
+            return 0
+        contents = contents.get_object()
+        streams = contents if isinstance(contents, list) else [contents]
+        # PyPDF2 drops /Length once a stream is read, so use the raw data size
+        return sum(len(getattr(stream.get_object(), '_data', b'') or b'')
+                   for stream in streams)
+    except Exception:
+        return 0
+
+
+def describe_error(error):
+    """Format an exception for the error report."""
+    message = str(error)
+    return f"{type(error).__name__}: {message}" if message else type(error).__name__
+
+
+class TextExtractor:
+    """Extract text from PDF files as a stream of page records.
+
+    In 'fast' mode pages are read with FastTextExtractor and fall back to
+    PyPDF2 wherever it reports the page as unsupported. Text leaving
+    iter_pages() has been through the POSTPROCESS pipeline; the cache and
+    worker processes only ever see text as extracted.
+    """
+
+    version = EXTRACTOR_VERSION
+
+    def __init__(self, add_page_numbers=None, add_file_headers=None, cache=None,
+                 metrics=None, dedup=None, mode=None, pipeline=None):
+        self.add_page_numbers = (config.ADD_PAGE_NUMBERS
+                                 if add_page_numbers is None else add_page_numbers)
+        self.add_file_headers = (config.ADD_FILE_HEADERS
+                                 if add_file_headers is None else add_file_headers)
+        self.cache = cache
+        self.metrics = metrics or get_recorder()
+        self.dedup = dedup
+        self.pipeline = create_pipeline() if pipeline is None else pipeline
+        self.mode = mode or config.PERFORMANCE.get('extraction_mode', 'pypdf2')
+        if self.mode not in EXTRACTION_MODES:
+            raise ValueError(f"Unknown extraction mode: {self.mode}")
+        if self.mode == 'fast':
+            # The fast path words some pages differently, so cache it apart
+            self.version = f"{EXTRACTOR_VERSION}+{FAST_PATH_VERSION}"
+        self.errors = []
+        self.duplicate_pages = 0
+        self.page_counts = {}
+
+    @staticmethod
+    def make_record(pdf_file, file_index, page_num, num_pages, text,
+                    open_time=0.0, extract_time=0.0, cached=False, bytes_in=0):
+        """Build the record yielded for a single page."""
+        return {
+            'file': pdf_file,
+            'filename': os.path.basename(pdf_file),
+            'file_index': file_index,
+            'page_num': page_num,
+            'num_pages': num_pages,
+            'text': text,
+            'open_time': open_time,
+            'extract_time': extract_time,
+            'cached': cached,
+            'bytes_in': bytes_in,
+        }
+
+    @classmethod
+    def make_failed_record(cls, pdf_file, file_index, page_num, num_pages, kind,
+                           message, extract_time=0.0):
+        """Build an empty record standing in for a page that could not be extracted."""
+        record = cls.make_record(pdf_file, file_index, page_num, num_pages, "",
+                                 extract_time=extract_time)
+        record['error'] = message
+        record['error_kind'] = kind
+        return record
+
+    @classmethod
+    def make_duplicate_record(cls, record, reference, kind, similarity=1.0):
+        """Turn a record into a reference to the page whose text is kept."""
+        record['text'] = ""
+        record['duplicate_of'] = reference
+        record['duplicate_kind'] = kind
+        record['similarity'] = similarity
+        return record
+
+    def start_batch(self):
+        """Reset the error report, duplicate count, page counts and seen pages for a new batch."""
+        self.errors.clear()
+        self.duplicate_pages = 0
+        self.page_counts.clear()
+        if self.pipeline:
+            self.pipeline.reset()
+        if self.dedup is not None:
+            self.dedup.clear()
+
+    def record_error(self, pdf_file, page_num, kind, message):
+        """Add an entry to the error report; page_num is None for whole-file errors."""
+        self.errors.append({'file': pdf_file, 'page': page_num, 'kind': kind,
+                            'message': message})
+        self.metrics.increment('page_errors')
+
+    def record_page(self, record):
+        """Account for a record about to be yielded: metrics and failed pages."""
+        self.metrics.record_page(record)
+        if 'duplicate_of' in record:
+            self.duplicate_pages += 1
+            self.metrics.increment('duplicate_pages')
+        if 'error' in record:
+            self.record_error(record['file'], record['page_num'], record['error_kind'],
+                              record['error'])
+
+    def write_error_report(self, path):
+        """Write the error report as JSON lines if anything failed; returns the count."""
+        if not self.errors:
+            return 0
+        with open(path, 'w', encoding='utf-8') as f:
+            for entry in self.errors:
+                f.write(json.dumps(entry) + '\n')
+        return len(self.errors)
+
+    def count_pages(self, pdf_file):
+        """Get the number of pages in a file, from the cache when possible.
+
+        Counts are kept in page_counts until the next start_batch(), so a
+        progress total counted up front is reused by the extraction itself.
+        """
+        num_pages = self.page_counts.get(pdf_file)
+        if num_pages is None and self.cache is not None:
+            num_pages = self.cache.get_num_pages(self.cache.get_digest(pdf_file),
+                                                 self.version)
+        if num_pages is None:
+            with open(pdf_file, 'rb') as file:
+                num_pages = len(PyPDF2.PdfReader(file).pages)
+        self.page_counts[pdf_file] = num_pages
+        return num_pages
+
+    def iter_pages(self, files):
+        """Yield a post-processed record for every page of every file, in order."""
+        if not self.pipeline:
+            return self.iter_extracted_pages(files)
+        return self.pipeline.process(self.iter_extracted_pages(files), self.metrics)
+
+    def iter_extracted_pages(self, files):
+        """Yield a record for every page of every file, in order, as extracted."""
+        for file_index, pdf_file in enumerate(files):
+            try:
+                for record in self.iter_file_pages(pdf_file, file_index):
+                    self.record_page(record)
+                    yield record
+            except GeneratorExit:
+                raise
+            except Exception as e:
+                # The file could not be opened; carry on with the next one
+                self.record_error(pdf_file, None, 'error', describe_error(e))
+
+    def iter_file_pages(self, pdf_file, file_index=0, start=0, stop=None):
+        """Yield records for pages [start, stop) of a single file."""
+        if self.cache is None:
+            yield from self.extract_file_pages(pdf_file, file_index, start, stop)
+            return
+
+        lookup_start = time.perf_counter()
+        digest = self.cache.get_digest(pdf_file)
+        cached = self.cache.get_pages(digest, self.version, start, stop)
+        if cached is not None:
+            num_pages, texts = cached
+            lookup_time = (time.perf_counter() - lookup_start) / max(len(texts), 1)
+            for offset, text in enumerate(texts):
+                yield self.make_record(pdf_file, file_index, start + offset + 1,
+                                       num_pages, text, extract_time=lookup_time,
+                                       cached=True)
+            return
+
+        batch_start = start
+        batch = []
+        for record in self.extract_file_pages(pdf_file, file_index, start, stop):
+            if 'error' in record or 'duplicate_of' in record:
+                # Leave out a failed page so it is retried next time, and a
+                # duplicate, whose text lives on another page; the pages after
+                # it are still cached for ranges that do not span the gap
+                if batch:
+                    self.cache.put_pages(digest, self.version, record['num_pages'],
+                                         batch_start, batch)
+                    batch = []
+                batch_start = record['page_num']
+            else:
+                batch.append(record['text'])
+                if len(batch) >= CACHE_BATCH_PAGES:
+                    self.cache.put_pages(digest, self.version, record['num_pages'],
+                                         batch_start, batch)
+                    batch_start += len(batch)
+                    batch = []
+            yield record
+        if batch:
+            self.cache.put_pages(digest, self.version, record['num_pages'],
+                                 batch_start, batch)
+
+    def extract_file_pages(self, pdf_file, file_index=0, start=0, stop=None):
+        """Yield records for pages [start, stop) of a file using PyPDF2."""
+        open_start = time.perf_counter()
+        with open(pdf_file, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            num_pages = len(pdf_reader.pages)
+            open_time = time.perf_counter() - open_start
+            # Font decoders are only valid within one document
+            fast_path = FastTextExtractor() if self.mode == 'fast' else None
+
+            stop = num_pages if stop is None else min(stop, num_pages)
+            for page_index in range(start, stop):
+                page_start = time.perf_counter()
+                fingerprint = original = None
+                try:
+                    page = pdf_reader.pages[page_index]
+                    if self.dedup is not None:
+                        fingerprint = get_page_fingerprint(page)
+                        original = self.dedup.find_exact(fingerprint)
+                    text = ("" if original is not None
+                            else self.extract_page_text(page, fast_path))
+                except Exception as e:
+                    kind = 'memory' if isinstance(e, MemoryError) else 'error'
+                    yield self.make_failed_record(pdf_file, file_index, page_index + 1,
+                                                  num_pages, kind, describe_error(e),
+                                                  time.perf_counter() - page_start)
+                    continue
+                extract_time = time.perf_counter() - page_start
+                record = self.make_record(pdf_file, file_index, page_index + 1,
+                                          num_pages, text, open_time, extract_time,
+                                          bytes_in=get_content_length(page))
+                if original is not None:
+                    record = self.make_duplicate_record(record, original, 'exact')
+                elif fingerprint is not None:
+                    record = self.deduplicate(record, fingerprint)
+                yield record
+
+    @staticmethod
+    def extract_page_text(page, fast_path=None):
+        """Extract one page's text, trying the fast path first when one is given."""
+        if fast_path is not None:
+            try:
+                return fast_path.extract_text(page)
+            except UnsupportedPage:
+                pass
+        return page.extract_text()
+
+    def deduplicate(self, record, fingerprint):
+        """Replace a near duplicate with a reference, or remember the page as kept."""
+        match, signature = self.dedup.find_near(record['text'])
+        if match is not None:
+            reference, similarity = match
+            self.dedup.add_exact(fingerprint, reference)
+            return self.make_duplicate_record(record, reference, 'near', similarity)
+        reference = self.dedup.make_reference(record)
+        self.dedup.add_exact(fingerprint, reference)
+        self.dedup.add_near(signature, reference)
+        return record
+
+    def format_file_header(self, filename, num_pages):
+        """Format the banner written before the first page of a file."""
+        header = config.FILE_HEADER_FORMAT.format(filename=filename,
+                                                  num_pages=num_pages)
+        return f"\n{config.PAGE_SEPARATOR}\n{header}\n{config.PAGE_SEPARATOR}\n\n"
+
+    def format_page(self, record):
+        """Format a page record as output text, including its file header."""
+        parts = []
+        if self.add_file_headers and record['page_num'] == 1:
+            parts.append(self.format_file_header(record['filename'],
+                                                 record['num_pages']))
+        if self.add_page_numbers:
+            parts.append(config.PAGE_MARKER_FORMAT.format(page_num=record['page_num']))
+            parts.append("\n")
+        if 'duplicate_of' in record:
+            parts.append(config.DUPLICATE_REFERENCE_FORMAT.format(**record['duplicate_of']))
+        else:
+            parts.append(record['text'])
+        parts.append("\n\n")
+        return ''.join(parts)
+
+
+def create_extractor():
+    """Create the extractor selected by the PERFORMANCE, SUPERVISION, CACHE and DEDUP settings.
+
+    Worker processes of the parallel and supervised extractors deduplicate
+    with their own get_deduplicator().
+    """
+    cache = None
+    if config.CACHE.get('enabled'):
+        from cache import PageCache
+        cache = PageCache()
+    if config.SUPERVISION.get('enabled'):
+        from supervisor import SupervisedExtractor
+        max_workers = 1
+        if config.PERFORMANCE.get('parallel_extraction'):
+            max_workers = config.PERFORMANCE.get('max_workers') or os.cpu_count() or 1
+        return SupervisedExtractor(max_workers=max_workers, cache=cache)
+    if config.PERFORMANCE.get('parallel_extraction'):
+        from parallel import ParallelExtractor
+        return ParallelExtractor(cache=cache)
+    return TextExtractor(cache=cache, dedup=get_deduplicator())
@@ -0,0 +1,332 @@
+"""
+Fast Text Module for PDF to Text Converter
+Lean content-stream text extraction for plain born-digital pages
+Created by Jaswanth
+"""
+
+import re
+
+from PyPDF2.generic import IndirectObject
+
+
+# Bump whenever a change alters the text produced by the fast path
+FAST_PATH_VERSION = "fast-1"
+
+# One content stream token: comment, literal string (one level of nested
+# parentheses), hex string, array/dict delimiter, name, number or operator.
+# Anything else ends up in the last group and makes the page unsupported.
+TOKEN_PATTERN = re.compile(rb"""
+    (%[^\r\n]*)
+  | (\((?:[^()\\]|\\.|\((?:[^()\\]|\\.)*\))*\))
+  | (<[0-9A-Fa-f\s]*>)
+  | (<<|>>|\[|\])
+  | (/[^\s/\[\]()<>{}%]*)
+  | ([+-]?(?:\d+\.?\d*|\.\d+))
+  | ([A-Za-z'"*][A-Za-z0-9*]*)
+  | (\S)
+""", re.VERBOSE | re.DOTALL)
+
+(COMMENT, LITERAL, HEX, DELIMITER, NAME, NUMBER, OPERATOR, UNKNOWN) = range(1, 9)
+
+LITERAL_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'\b', b'f': b'\f',
+                   b'(': b'(', b')': b')', b'\\': b'\\'}
+ESCAPE_PATTERN = re.compile(rb"\\([0-7]{1,3}|\r\n|[\s\S])")
+
+# Simple-font encodings that map byte for byte onto a Python codec
+SIMPLE_ENCODINGS = {'/WinAnsiEncoding': 'cp1252', '/MacRomanEncoding': 'mac_roman'}
+
+# Standard 14 fonts other than the symbolic ones use StandardEncoding when no
+# encoding is given; its printable ASCII range matches ASCII
+STANDARD_FONTS = frozenset((
+    '/Helvetica', '/Helvetica-Bold', '/Helvetica-Oblique', '/Helvetica-BoldOblique',
+    '/Times-Roman', '/Times-Bold', '/Times-Italic', '/Times-BoldItalic',
+    '/Courier', '/Courier-Bold', '/Courier-Oblique', '/Courier-BoldOblique',
+    '/Arial', '/Arial,Bold', '/Arial,Italic', '/Arial,BoldItalic',
+    '/TimesNewRoman', '/TimesNewRoman,Bold', '/TimesNewRoman,Italic',
+    '/TimesNewRoman,BoldItalic', '/CourierNew'))
+
+# A TJ adjustment more negative than this (thousandths of an em) is a word gap
+TJ_SPACE_THRESHOLD = -200
+
+CMAP_CODESPACE = re.compile(rb"begincodespacerange(.*?)endcodespacerange", re.DOTALL)
+CMAP_BFCHAR = re.compile(rb"beginbfchar(.*?)endbfchar", re.DOTALL)
+CMAP_BFRANGE = re.compile(rb"beginbfrange(.*?)endbfrange", re.DOTALL)
+CMAP_HEX = re.compile(rb"<([0-9A-Fa-f\s]*)>")
+CMAP_RANGE_ENTRY = re.compile(rb"<([0-9A-Fa-f]+)>\s*<([0-9A-Fa-f]+)>\s*(<[0-9A-Fa-f]*>|\[[^\]]*\])")
+
+
+class UnsupportedPage(Exception):
+    """The fast path cannot extract this page reliably; use PyPDF2 instead."""
+
+
+def _unescape_literal(token):
+    """Decode the body of a (literal string) token to bytes."""
+    body = token[1:-1]
+    if b'\\' not in body:
+        return body
+
+    def replace(match):
+        escape = match.group(1)
+        if escape in LITERAL_ESCAPES:
+            return LITERAL_ESCAPES[escape]
+        if escape[:1].isdigit():
+            return bytes((int(escape, 8) & 0xFF,))
+        if escape in (b'\r', b'\n', b'\r\n'):
+            return b''
+        return escape
+
+    return ESCAPE_PATTERN.sub(replace, body)
+
+
+def _decode_utf16(hex_digits):
+    """Decode a CMap destination hex string (UTF-16BE) to text."""
+    data = bytes.fromhex(hex_digits.decode('ascii'))
+    return data.decode('utf-16-be', 'surrogatepass')
+
+
+def parse_to_unicode(data):
+    """Parse a ToUnicode CMap; returns (code_length, {code: text})."""
+    code_length = 1
+    for block in CMAP_CODESPACE.findall(data):
+        for low in CMAP_HEX.findall(block)[::2]:
+            code_length = max(code_length, len(re.sub(rb"\s", b"", low)) // 2)
+
+    mapping = {}
+    for block in CMAP_BFCHAR.findall(data):
+        values = CMAP_HEX.findall(block)
+        for source, target in zip(values[::2], values[1::2]):
+            mapping[int(source, 16)] = _decode_utf16(re.sub(rb"\s", b"", target))
+    for block in CMAP_BFRANGE.findall(data):
+        for low, high, target in CMAP_RANGE_ENTRY.findall(block):
+            low, high = int(low, 16), int(high, 16)
+            if high - low > 0xFFFF:
+                raise UnsupportedPage("Oversized ToUnicode range")
+            if target.startswith(b'['):
+                for code, value in zip(range(low, high + 1), CMAP_HEX.findall(target)):
+                    mapping[code] = _decode_utf16(value)
+                continue
+            start = bytes.fromhex(target[1:-1].decode('ascii'))
+            prefix, last = start[:-2], int.from_bytes(start[-2:], 'big')
+            for offset in range(high - low + 1):
+                value = prefix + (last + offset).to_bytes(2, 'big')
+                mapping[low + offset] = value.decode('utf-16-be', 'surrogatepass')
+    return code_length, mapping
+
+
+class FontDecoder:
+    """Turn the bytes of a shown string into text for one font resource."""
+
+    def __init__(self, font):
+        self.code_length = 1
+        self.mapping = None
+        self.codec = None
+
+        to_unicode = font.get('/ToUnicode')
+        if to_unicode is not None:
+            self.code_length, self.mapping = parse_to_unicode(to_unicode.get_object().get_data())
+            if self.code_length > 2:
+                raise UnsupportedPage("ToUnicode codes longer than two bytes")
+            return
+
+        subtype = font.get('/Subtype')
+        if subtype not in ('/Type1', '/TrueType', '/MMType1'):
+            raise UnsupportedPage(f"{subtype} font without ToUnicode")
+        encoding = font.get('/Encoding')
+        if isinstance(encoding, IndirectObject):
+            encoding = encoding.get_object()
+        if encoding is None:
+            if font.get('/BaseFont') not in STANDARD_FONTS:
+                raise UnsupportedPage("Font with a built-in encoding")
+            self.codec = 'ascii'
+        elif encoding in SIMPLE_ENCODINGS:
+            self.codec = SIMPLE_ENCODINGS[encoding]
+        else:
+            # /Differences arrays and other custom encodings need glyph names
+            raise UnsupportedPage(f"Unsupported font encoding {encoding!r}")
+
+    def decode(self, data):
+        """Decode shown bytes; raises UnsupportedPage on unmapped codes."""
+        if self.codec is not None:
+            try:
+                return data.decode(self.codec)
+            except UnicodeDecodeError:
+                raise UnsupportedPage("Bytes outside the font encoding")
+        mapping = self.mapping
+        try:
+            if self.code_length == 1:
+                return ''.join([mapping[code] for code in data])
+            if len(data) % 2:
+                raise UnsupportedPage("Odd-length string for two-byte font")
+            return ''.join([mapping[(data[index] << 8) | data[index + 1]]
+                            for index in range(0, len(data), 2)])
+        except KeyError:
+            raise UnsupportedPage("Code missing from ToUnicode")
+
+
+def _get_resource(resources, category, name):
+    """Look up a named resource such as a font or XObject."""
+    group = resources.get(category) if resources is not None else None
+    if group is None:
+        return None
+    group = group.get_object()
+    entry = group.get(name)
+    return entry.get_object() if entry is not None else None
+
+
+def _read_contents(page):
+    """Get a page's decoded content streams joined into one byte string."""
+    contents = page.get('/Contents')
+    if contents is None:
+        return b""
+    contents = contents.get_object()
+    streams = contents if isinstance(contents, list) else [contents]
+    return b"\n".join(stream.get_object().get_data() for stream in streams)
+
+
+class FastTextExtractor:
+    """Extract the text shown by Tj, TJ, ' and " operators straight from content streams.
+
+    Font decoders are kept per font object, so pages of the same document
+    sharing fonts parse each ToUnicode CMap once. Pages that use features
+    the fast path does not model raise UnsupportedPage.
+    """
+
+    def __init__(self):
+        self._decoders = {}
+
+    def get_decoder(self, resources, name):
+        """Get the decoder for a font resource name."""
+        font_reference = None
+        fonts = resources.get('/Font') if resources is not None else None
+        if fonts is not None:
+            fonts = fonts.get_object()
+            if name in fonts:
+                # The raw reference identifies the font across pages
+                font_reference = fonts.raw_get(name)
+        if font_reference is None:
+            raise UnsupportedPage(f"Unknown font {name}")
+        key = (font_reference.idnum, font_reference.generation) if isinstance(
+            font_reference, IndirectObject) else id(font_reference)
+        decoder = self._decoders.get(key)
+        if decoder is None:
+            decoder = self._decoders[key] = FontDecoder(font_reference.get_object())
+        return decoder
+
+    def extract_text(self, page):
+        """Extract a page's text, raising UnsupportedPage where it may be wrong."""
+        resources = page.get('/Resources')
+        if resources is not None:
+            resources = resources.get_object()
+
+        parts = []
+        operands = []
+        decoder = None
+        shown = False
+        images = 0
+        in_array = False
+        array = []
+        line_y = None
+
+        for match in TOKEN_PATTERN.finditer(_read_contents(page)):
+            kind = match.lastindex
+            token = match.group(kind)
+            if kind == OPERATOR:
+                operator = token
+            elif kind == LITERAL:
+                (array if in_array else operands).append(_unescape_literal(token))
+                continue
+            elif kind == HEX:
+                digits = re.sub(rb"\s", b"", token[1:-1])
+                if len(digits) % 2:
+                    digits += b"0"
+                (array if in_array else operands).append(bytes.fromhex(digits.decode('ascii')))
+                continue
+            elif kind == NUMBER:
+                (array if in_array else operands).append(float(token))
+                continue
+            elif kind == NAME:
+                (array if in_array else operands).append(token.decode('latin-1'))
+                continue
+            elif kind == DELIMITER:
+                if token == b'[':
+                    in_array, array = True, []
+                elif token == b']':
+                    in_array = False
+                    operands.append(array)
+                elif token == b'<<':
+                    raise UnsupportedPage("Inline dictionary in content stream")
+                continue
+            elif kind == COMMENT:
+                continue
+            else:
+                raise UnsupportedPage("Unparseable content stream")
+
+            if operator == b'Tf':
+                if not operands or not isinstance(operands[0], str):
+                    raise UnsupportedPage("Malformed Tf")
+                decoder = self.get_decoder(resources, operands[0])
+            elif operator in (b'Tj', b"'", b'"'):
+                if decoder is None or not operands or not isinstance(operands[-1], bytes):
+                    raise UnsupportedPage("Text shown without a font")
+                if operator != b'Tj' and parts:
+                    parts.append('\n')
+                parts.append(decoder.decode(operands[-1]))
+                shown = True
+            elif operator == b'TJ':
+                if decoder is None or not operands or not isinstance(operands[-1], list):
+                    raise UnsupportedPage("Text shown without a font")
+                for item in operands[-1]:
+                    if isinstance(item, bytes):
+                        parts.append(decoder.decode(item))
+                    elif item < TJ_SPACE_THRESHOLD and parts:
+                        _append_space(parts)
+                shown = True
+            elif operator in (b'Td', b'TD'):
+                if len(operands) >= 2 and parts:
+                    if operands[1] != 0:
+                        parts.append('\n')
+                    elif operands[0] != 0:
+                        _append_space(parts)
+            elif operator == b'T*':
+                if parts:
+                    parts.append('\n')
+            elif operator == b'Tm':
+                if len(operands) >= 6:
+                    if line_y is not None and parts:
+                        if operands[5] != line_y:
+                            parts.append('\n')
+                        else:
+                            _append_space(parts)
+                    line_y = operands[5]
+            elif operator == b'Do':
+                xobject = _get_resource(resources, '/XObject', operands[0] if operands else None)
+                if xobject is None or xobject.get('/Subtype') != '/Image':
+                    # Form XObjects can hold text of their own
+                    raise UnsupportedPage("Form XObject")
+                images += 1
+            elif operator in (b'BI', b'ID', b'EI'):
+                raise UnsupportedPage("Inline image")
+            operands = []
+
+        if not shown and images:
+            raise UnsupportedPage("Image-only page")
+        text = ''.join(parts)
+        if _looks_garbled(text):
+            raise UnsupportedPage("Decoded text looks garbled")
+        return text
+
+
+def _append_space(parts):
+    """Separate the next shown string from the last one by a word space."""
+    if parts[-1] and not parts[-1][-1].isspace():
+        parts.append(' ')
+
+
+def _looks_garbled(text):
+    """Check for text dominated by control or private-use characters."""
+    if not text:
+        return False
+    suspicious = sum(1 for char in text
+                     if (char < ' ' and char not in '\n\t') or '\ue000' <= char <= '\uf8ff'
+                     or char == '\ufffd')
+    return suspicious > len(text) * 0.05
@@ -0,0 +1,79 @@
+"""
+Manifest Module for PDF to Text Converter
+Append-only JSONL checkpoint of completed conversions for resumable batches
+Created by Jaswanth
+"""
+
+import json
+import os
+
+from utils import FileUtilities
+from writers import output_files_exist
+
+
+class Manifest:
+    """Record completed files so an interrupted batch can resume where it stopped."""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self._file = None
+        self.load()
+
+    def load(self):
+        """Read existing entries; a torn last line from a crash is ignored."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                self.entries[entry['path']] = entry
+
+    def is_complete(self, path):
+        """Check whether a file was already converted and is unchanged since."""
+        entry = self.entries.get(os.path.abspath(path))
+        if entry is None or not output_files_exist(entry):
+            return False
+        try:
+            size, mtime_ns = FileUtilities.get_file_signature(path)
+        except OSError:
+            return False
+        if size == entry['size'] and mtime_ns == entry['mtime_ns']:
+            return True
+        # Touched but possibly identical (e.g. copied back into place)
+        return size == entry['size'] and FileUtilities.hash_file(path) == entry['digest']
+
+    def record(self, path, output, digest, pages, size=None, mtime_ns=None, **extra):
+        """Append a completed conversion and flush it to disk."""
+        path = os.path.abspath(path)
+        if size is None or mtime_ns is None:
+            size, mtime_ns = FileUtilities.get_file_signature(path)
+        entry = {
+            'path': path,
+            'output': os.path.abspath(output),
+            'digest': digest,
+            'pages': pages,
+            'size': size,
+            'mtime_ns': mtime_ns,
+        }
+        entry.update(extra)
+
+        if self._file is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            FileUtilities.ensure_directory_exists(directory)
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps(entry) + '\n')
+        self._file.flush()
+        self.entries[path] = entry
+        return entry
+
+    def close(self):
+        """Sync and close the manifest file."""
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
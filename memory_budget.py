@@ -0,0 +1,86 @@
+"""
+Memory Budget Module for PDF to Text Converter
+Accounts for page text held in memory and holds producers back when it is over budget
+Created by Jaswanth
+"""
+
+import sys
+import threading
+
+import config
+
+
+def get_text_size(text):
+    """Get the bytes a string of page text occupies in memory."""
+    return sys.getsizeof(text)
+
+
+class MemoryBudget:
+    """Shared count of bytes of page text held in memory, with an optional limit.
+
+    Producers call acquire(), which waits while the budget is used up, so
+    extraction slows to the pace of whoever frees memory. Holders that must
+    not wait, such as the GUI thread, use try_acquire() and spill to disk
+    when it fails or when producers are waiting. Something is always let
+    through while nothing is held, so a single page larger than the budget
+    cannot deadlock.
+    """
+
+    def __init__(self, limit_mb=None):
+        self.limit = int(limit_mb * 1024 * 1024) if limit_mb else None
+        self.used = 0
+        self.peak = 0
+        self.waiting = 0
+        self._condition = threading.Condition()
+
+    def _fits(self, size):
+        return self.limit is None or self.used == 0 or self.used + size <= self.limit
+
+    def _take(self, size):
+        self.used += size
+        self.peak = max(self.peak, self.used)
+
+    def acquire(self, size, timeout=None):
+        """Wait until size bytes fit, then count them; returns False on timeout."""
+        with self._condition:
+            self.waiting += 1
+            try:
+                if not self._condition.wait_for(lambda: self._fits(size), timeout):
+                    return False
+            finally:
+                self.waiting -= 1
+            self._take(size)
+            return True
+
+    def try_acquire(self, size):
+        """Count size bytes if they fit right now; returns whether they did."""
+        with self._condition:
+            if not self._fits(size):
+                return False
+            self._take(size)
+            return True
+
+    def release(self, size):
+        """Stop counting bytes that were freed or moved to disk."""
+        with self._condition:
+            self.used = max(self.used - size, 0)
+            self._condition.notify_all()
+
+    def exceeded(self, extra=0):
+        """Check whether more is held than the limit allows.
+
+        extra counts bytes held outside the budget, such as results kept back
+        for reordering, which must never make acquire() wait.
+        """
+        return self.limit is not None and self.used + extra > self.limit
+
+
+_budget = None
+
+
+def get_memory_budget():
+    """Get the process-wide budget set by PERFORMANCE['memory_budget_mb']."""
+    global _budget
+    if _budget is None:
+        _budget = MemoryBudget(config.PERFORMANCE.get('memory_budget_mb'))
+    return _budget
@@ -0,0 +1,304 @@
+"""
+Metrics Module for PDF to Text Converter
+Low-overhead buffered recording of extraction timings with JSON and Prometheus export
+Created by Jaswanth
+"""
+
+import heapq
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+
+import config
+
+
+# Upper bounds (seconds) of the per-page extraction time histogram
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0)
+
+SLOWEST_PAGES_KEPT = 10
+
+COUNTERS = ('pages', 'files', 'bytes_in', 'characters_out', 'cache_hits',
+            'cache_misses', 'extract_seconds', 'page_errors', 'duplicate_pages')
+
+
+class NullMetricsRecorder:
+    """Recorder used when metrics are disabled; every call is a no-op."""
+
+    enabled = False
+
+    def record_page(self, record):
+        pass
+
+    def record_queue_depth(self, depth):
+        pass
+
+    def increment(self, name, amount=1):
+        pass
+
+    def record_stage(self, name, seconds):
+        pass
+
+    def merge(self, snapshot):
+        pass
+
+    def snapshot(self):
+        return None
+
+    def flush(self):
+        pass
+
+
+class MetricsRecorder:
+    """Collect per-page samples in a buffer and fold them into aggregates in batches."""
+
+    enabled = True
+
+    def __init__(self, flush_pages=None, per_file=True):
+        self.flush_pages = flush_pages or config.METRICS['flush_pages']
+        self.per_file = per_file
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._buffer = []
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.files = {}
+        self.slowest = []
+        self.queue_depth = 0
+        self.queue_depth_max = 0
+        self.stage_seconds = {}
+
+    def record_page(self, record):
+        """Buffer the timing sample carried by a page record."""
+        sample = (record['file'], record['page_num'], record['extract_time'],
+                  record.get('bytes_in', 0), len(record['text']),
+                  record.get('cached', False), record.get('open_time', 0.0))
+        # Appending under the lock keeps a sample from landing in a buffer
+        # that _fold has already taken
+        with self._lock:
+            self._buffer.append(sample)
+            full = len(self._buffer) >= self.flush_pages
+        if full:
+            self._fold()
+
+    def record_queue_depth(self, depth):
+        """Sample the depth of a work or result queue."""
+        self.queue_depth = depth
+        if depth > self.queue_depth_max:
+            self.queue_depth_max = depth
+
+    def increment(self, name, amount=1):
+        """Add to a named counter."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record_stage(self, name, seconds):
+        """Add time spent in a post-processing stage."""
+        with self._lock:
+            self.stage_seconds[name] = self.stage_seconds.get(name, 0.0) + seconds
+
+    def _fold(self):
+        """Move buffered samples into the aggregates."""
+        with self._lock:
+            samples, self._buffer = self._buffer, []
+            counters = self.counters
+            for pdf_file, page_num, seconds, bytes_in, characters, cached, open_time in samples:
+                counters['pages'] += 1
+                if page_num == 1:
+                    counters['files'] += 1
+                counters['bytes_in'] += bytes_in
+                counters['characters_out'] += characters
+                counters['extract_seconds'] += seconds
+                counters['cache_hits' if cached else 'cache_misses'] += 1
+                self.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+                if len(self.slowest) < SLOWEST_PAGES_KEPT:
+                    heapq.heappush(self.slowest, (seconds, pdf_file, page_num))
+                elif seconds > self.slowest[0][0]:
+                    heapq.heapreplace(self.slowest, (seconds, pdf_file, page_num))
+
+                if self.per_file:
+                    totals = self.files.get(pdf_file)
+                    if totals is None:
+                        totals = self.files[pdf_file] = {
+                            'pages': 0, 'seconds': 0.0, 'open_seconds': open_time,
+                            'bytes_in': 0, 'characters': 0}
+                    totals['pages'] += 1
+                    totals['seconds'] += seconds
+                    totals['bytes_in'] += bytes_in
+                    totals['characters'] += characters
+
+    def snapshot(self):
+        """Get all aggregates as a picklable dict."""
+        self._fold()
+        with self._lock:
+            return {
+                'counters': dict(self.counters),
+                'buckets': list(self.buckets),
+                'files': {name: dict(totals) for name, totals in self.files.items()},
+                'slowest': list(self.slowest),
+                'queue_depth': self.queue_depth,
+                'queue_depth_max': self.queue_depth_max,
+                'stage_seconds': dict(self.stage_seconds),
+            }
+
+    def merge(self, snapshot):
+        """Add aggregates recorded elsewhere, e.g. in a worker process."""
+        if not snapshot:
+            return
+        self._fold()
+        with self._lock:
+            for name, value in snapshot['counters'].items():
+                self.counters[name] = self.counters.get(name, 0) + value
+            for index, count in enumerate(snapshot['buckets']):
+                self.buckets[index] += count
+            if self.per_file:
+                for name, totals in snapshot['files'].items():
+                    if name in self.files:
+                        for key, value in totals.items():
+                            self.files[name][key] += value
+                    else:
+                        self.files[name] = dict(totals)
+            for sample in snapshot['slowest']:
+                sample = tuple(sample)
+                if len(self.slowest) < SLOWEST_PAGES_KEPT:
+                    heapq.heappush(self.slowest, sample)
+                elif sample[0] > self.slowest[0][0]:
+                    heapq.heapreplace(self.slowest, sample)
+            self.queue_depth_max = max(self.queue_depth_max, snapshot['queue_depth_max'])
+            for name, seconds in snapshot.get('stage_seconds', {}).items():
+                self.stage_seconds[name] = self.stage_seconds.get(name, 0.0) + seconds
+
+    def latency_percentile(self, fraction):
+        """Estimate a page latency percentile (seconds) from the histogram."""
+        total = sum(self.buckets)
+        if not total:
+            return 0.0
+        target = fraction * total
+        seen = 0
+        lower = 0.0
+        for index, count in enumerate(self.buckets):
+            upper = LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else lower * 2
+            if count and seen + count >= target:
+                return lower + (upper - lower) * (target - seen) / count
+            seen += count
+            lower = upper
+        return lower
+
+    def summary(self):
+        """Get a JSON-serialisable summary of everything recorded."""
+        self._fold()
+        counters = self.counters
+        elapsed = time.time() - self.started
+        return {
+            'elapsed_seconds': elapsed,
+            'counters': dict(counters),
+            'pages_per_sec': counters['pages'] / elapsed if elapsed > 0 else 0.0,
+            'dedup_ratio': (counters['duplicate_pages'] / counters['pages']
+                            if counters['pages'] else 0.0),
+            'latency_seconds': {
+                'p50': self.latency_percentile(0.50),
+                'p95': self.latency_percentile(0.95),
+                'p99': self.latency_percentile(0.99),
+            },
+            'queue_depth': self.queue_depth,
+            'queue_depth_max': self.queue_depth_max,
+            'postprocess_seconds': dict(self.stage_seconds),
+            'slowest_pages': [{'file': pdf_file, 'page': page_num, 'seconds': seconds}
+                              for seconds, pdf_file, page_num
+                              in sorted(self.slowest, reverse=True)],
+            'files': self.files,
+        }
+
+    def export_json(self, path):
+        """Write the summary as JSON."""
+        _write_atomically(path, json.dumps(self.summary(), indent=2) + '\n')
+
+    def format_prometheus(self):
+        """Format aggregates in the Prometheus text exposition format."""
+        self._fold()
+        counters = self.counters
+        lines = []
+
+        def metric(name, kind, help_text, value):
+            lines.append(f"# HELP pdf_converter_{name} {help_text}")
+            lines.append(f"# TYPE pdf_converter_{name} {kind}")
+            lines.append(f"pdf_converter_{name} {value}")
+
+        metric('pages_total', 'counter', "Pages extracted.", counters['pages'])
+        metric('files_total', 'counter', "Files extracted.", counters['files'])
+        metric('bytes_in_total', 'counter', "Content stream bytes read.",
+               counters['bytes_in'])
+        metric('characters_out_total', 'counter', "Characters of text produced.",
+               counters['characters_out'])
+        metric('cache_hits_total', 'counter', "Pages served from the cache.",
+               counters['cache_hits'])
+        metric('cache_misses_total', 'counter', "Pages extracted with PyPDF2.",
+               counters['cache_misses'])
+        metric('page_errors_total', 'counter', "Pages or files that failed to extract.",
+               counters['page_errors'])
+        metric('duplicate_pages_total', 'counter', "Pages written as references to a duplicate.",
+               counters['duplicate_pages'])
+        metric('queue_depth', 'gauge', "Last sampled result queue depth.",
+               self.queue_depth)
+        metric('queue_depth_max', 'gauge', "Highest sampled result queue depth.",
+               self.queue_depth_max)
+
+        if self.stage_seconds:
+            lines.append("# HELP pdf_converter_postprocess_seconds_total Time spent in each "
+                         "post-processing stage.")
+            lines.append("# TYPE pdf_converter_postprocess_seconds_total counter")
+            for name, seconds in sorted(self.stage_seconds.items()):
+                lines.append(f'pdf_converter_postprocess_seconds_total{{stage="{name}"}} '
+                             f'{seconds}')
+
+        lines.append("# HELP pdf_converter_page_extract_seconds Time to extract one page.")
+        lines.append("# TYPE pdf_converter_page_extract_seconds histogram")
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.buckets):
+            cumulative += count
+            lines.append(f'pdf_converter_page_extract_seconds_bucket{{le="{bound}"}} '
+                         f'{cumulative}')
+        cumulative += self.buckets[-1]
+        lines.append(f'pdf_converter_page_extract_seconds_bucket{{le="+Inf"}} {cumulative}')
+        lines.append(f"pdf_converter_page_extract_seconds_sum {counters['extract_seconds']}")
+        lines.append(f"pdf_converter_page_extract_seconds_count {cumulative}")
+        return '\n'.join(lines) + '\n'
+
+    def export_prometheus(self, path):
+        """Write a node-exporter textfile collector file."""
+        _write_atomically(path, self.format_prometheus())
+
+    def flush(self):
+        """Write the exports configured in METRICS."""
+        if config.METRICS.get('json_path'):
+            self.export_json(config.METRICS['json_path'])
+        if config.METRICS.get('prometheus_path'):
+            self.export_prometheus(config.METRICS['prometheus_path'])
+
+
+def _write_atomically(path, text):
+    """Replace a file in one step so collectors never read a partial export."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix='.metrics.', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(temp_path, path)
+    except Exception:
+        os.remove(temp_path)
+        raise
+
+
+_recorder = None
+
+
+def get_recorder():
+    """Get the process-wide recorder selected by METRICS['enabled']."""
+    global _recorder
+    if _recorder is None:
+        _recorder = MetricsRecorder() if config.METRICS.get('enabled') else NullMetricsRecorder()
+    return _recorder
@@ -0,0 +1,212 @@
+"""
+Page Records Module for PDF to Text Converter
+JSON Lines page output with a binary offset index for O(1) page lookup
+Created by Jaswanth
+"""
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+
+import config
+from utils import TextStatistics
+from writers import FILE_MODE, TextFileWriter
+
+
+RECORD_INDEX_MAGIC = b"PDFREC1\n"
+HEADER_STRUCT = struct.Struct('<Q')
+
+# Keys of an extractor page record copied into each JSON line
+RECORD_KEYS = ('file', 'filename', 'file_index', 'page_num', 'num_pages', 'text')
+
+
+def get_record_index_path(output_path):
+    """Get the offset index path saved next to a JSON Lines output."""
+    return output_path + config.RECORD_INDEX_EXTENSION
+
+
+def is_record_output(path):
+    """Check whether an output path asks for JSON Lines page records."""
+    return path.lower().endswith(config.RECORD_OUTPUT_EXTENSION)
+
+
+def make_page_record(record):
+    """Build the JSON-serialisable line stored for a page record."""
+    line = {key: record[key] for key in RECORD_KEYS}
+    line['stats'] = TextStatistics.from_text(record['text']).as_dict()
+    if 'error' in record:
+        line['error'] = record['error']
+        line['error_kind'] = record['error_kind']
+    if 'duplicate_of' in record:
+        line['duplicate_of'] = record['duplicate_of']
+        line['duplicate_kind'] = record['duplicate_kind']
+        line['similarity'] = record['similarity']
+    return line
+
+
+class PageRecordWriter(TextFileWriter):
+    """Write one JSON record per page and, on commit, a sidecar of byte offsets.
+
+    Pages of a file must arrive together and in page order starting at 1,
+    as the extractors yield them, so that any page's position in the index
+    is file_starts[file_index] + page_num - 1.
+    """
+
+    def __init__(self, path, encoding=None, buffer_size=None):
+        super().__init__(path, encoding, buffer_size)
+        self.files = []
+        self.file_starts = []
+        self.file_pages = []
+        self.offsets = array('Q')
+
+    def write_page(self, record, text=None):
+        """Append a page record as one JSON line; returns its byte offset."""
+        file_index = record['file_index']
+        while len(self.files) <= file_index:
+            self.files.append(None)
+            self.file_starts.append(0)
+            self.file_pages.append(0)
+        if self.files[file_index] is None:
+            self.files[file_index] = record['file']
+            self.file_starts[file_index] = len(self.offsets)
+        if (record['page_num'] != self.file_pages[file_index] + 1
+                or self.file_starts[file_index] + self.file_pages[file_index]
+                != len(self.offsets)):
+            raise ValueError(f"Page {record['page_num']} of {record['filename']} "
+                             f"written out of order")
+        self.file_pages[file_index] += 1
+
+        offset = self.write(json.dumps(make_page_record(record), ensure_ascii=False,
+                                       separators=(',', ':')) + '\n')
+        self.offsets.append(offset)
+        return offset
+
+    def commit(self):
+        """Move the records into place, then write their offset index next to them."""
+        if self.closed:
+            return
+        super().commit()
+
+        offsets = array('Q', self.offsets)
+        offsets.append(self.bytes_written)
+        header = json.dumps({
+            'files': self.files,
+            'file_starts': self.file_starts,
+            'file_pages': self.file_pages,
+            'page_count': len(self.offsets),
+            'data_size': self.bytes_written,
+        }, separators=(',', ':')).encode('utf-8')
+        # Pad with JSON whitespace so the offsets after it are 8-byte aligned
+        header += b' ' * (-(len(RECORD_INDEX_MAGIC) + HEADER_STRUCT.size + len(header)) % 8)
+
+        index_path = get_record_index_path(self.path)
+        fd, temp_path = tempfile.mkstemp(prefix='.idx.', dir=os.path.dirname(self.path))
+        with os.fdopen(fd, 'wb') as f:
+            f.write(RECORD_INDEX_MAGIC)
+            f.write(HEADER_STRUCT.pack(len(header)))
+            f.write(header)
+            offsets.tofile(f)
+        os.chmod(temp_path, FILE_MODE)
+        os.replace(temp_path, index_path)
+
+
+class PageRecordReader:
+    """Random access to the page records of a JSON Lines output through its index."""
+
+    def __init__(self, path):
+        self.path = path
+        self.offsets = None
+        self._files = []
+        self._maps = []
+        index_map = self._map(get_record_index_path(path))
+        if index_map[:len(RECORD_INDEX_MAGIC)] != RECORD_INDEX_MAGIC:
+            self.close()
+            raise ValueError(f"Not a page record index: {get_record_index_path(path)}")
+
+        position = len(RECORD_INDEX_MAGIC)
+        (header_length,) = HEADER_STRUCT.unpack_from(index_map, position)
+        position += HEADER_STRUCT.size
+        header = json.loads(index_map[position:position + header_length])
+        position += header_length
+
+        self.files = header['files']
+        self.filenames = [os.path.basename(name) if name else None for name in self.files]
+        self.file_starts = header['file_starts']
+        self.file_pages = header['file_pages']
+        self.page_count = header['page_count']
+        self.offsets = memoryview(index_map)[
+            position:position + (self.page_count + 1) * 8].cast('Q')
+
+        if os.path.getsize(path) != header['data_size']:
+            self.close()
+            raise ValueError(f"Page record index is out of date: {path}")
+        self._data = self._map(path) if header['data_size'] else b""
+
+    def _map(self, path):
+        """Memory-map a file read-only, keeping it open until close()."""
+        f = open(path, 'rb')
+        self._files.append(f)
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(data)
+        return data
+
+    def __len__(self):
+        return self.page_count
+
+    def find_file(self, name):
+        """Get the file index of a source path or filename, or None."""
+        for names in (self.files, self.filenames):
+            if name in names:
+                return names.index(name)
+        return None
+
+    def find_page(self, file_index, page_num):
+        """Get the position of (file_index, page_num) in the output, or None."""
+        if not 0 <= file_index < len(self.file_pages):
+            return None
+        if not 1 <= page_num <= self.file_pages[file_index]:
+            return None
+        return self.file_starts[file_index] + page_num - 1
+
+    def get_record_at(self, position):
+        """Decode the record stored at a position."""
+        data = self._data[self.offsets[position]:self.offsets[position + 1]]
+        return json.loads(data)
+
+    def get_record(self, file_index, page_num):
+        """Get the record of a page; raises KeyError if it is not in the output."""
+        position = self.find_page(file_index, page_num)
+        if position is None:
+            raise KeyError((file_index, page_num))
+        return self.get_record_at(position)
+
+    def get_text(self, file_index, page_num):
+        """Get the text of a page."""
+        return self.get_record(file_index, page_num)['text']
+
+    def __iter__(self):
+        for position in range(self.page_count):
+            yield self.get_record_at(position)
+
+    def close(self):
+        """Release the memory maps."""
+        if self.offsets is not None:
+            self.offsets.release()
+            self.offsets = None
+        self._data = b""
+        for data in self._maps:
+            data.close()
+        for f in self._files:
+            f.close()
+        self._maps = []
+        self._files = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
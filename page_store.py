@@ -0,0 +1,219 @@
+"""
+Page Store Module for PDF to Text Converter
+Indexes formatted output page by page so any page can be fetched on demand
+Created by Jaswanth
+"""
+
+import json
+import tempfile
+from array import array
+
+import config
+from memory_budget import get_text_size
+
+
+class PageStore:
+    """Base class holding the (file, page) index shared by all page stores."""
+
+    def __init__(self):
+        self.filenames = []
+        self.file_starts = []
+        self.page_files = array('I')
+        self.page_numbers = array('I')
+
+    def __len__(self):
+        return len(self.page_numbers)
+
+    def add_entry(self, record):
+        """Index a page record; returns its position in the store."""
+        file_index = record['file_index']
+        while len(self.filenames) <= file_index:
+            self.filenames.append(None)
+            self.file_starts.append(None)
+        if self.filenames[file_index] is None:
+            self.filenames[file_index] = record['filename']
+            self.file_starts[file_index] = len(self.page_numbers)
+        self.page_files.append(file_index)
+        self.page_numbers.append(record['page_num'])
+        return len(self.page_numbers) - 1
+
+    def get_location(self, index):
+        """Get (file_index, page_num) for a page position."""
+        return self.page_files[index], self.page_numbers[index]
+
+    def find_page(self, file_index, page_num=1):
+        """Get the position of a page within a file, or None if not stored."""
+        if file_index >= len(self.file_starts) or self.file_starts[file_index] is None:
+            return None
+        index = self.file_starts[file_index] + page_num - 1
+        if (0 <= index < len(self) and self.page_files[index] == file_index
+                and self.page_numbers[index] == page_num):
+            return index
+        # Ranges that did not start at page 1 are not contiguous from the file start
+        for index in range(self.file_starts[file_index], len(self)):
+            if self.page_files[index] != file_index:
+                break
+            if self.page_numbers[index] == page_num:
+                return index
+        return None
+
+    def get_text(self, index):
+        """Get the formatted text of one page."""
+        raise NotImplementedError
+
+    def iter_text(self):
+        """Yield the formatted text of every page in order."""
+        for index in range(len(self)):
+            yield self.get_text(index)
+
+    def close(self):
+        """Release resources held by the store."""
+
+
+class MemoryPageStore(PageStore):
+    """Page store that keeps each formatted page as a separate string."""
+
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+
+    def append(self, record, chunk):
+        """Add a page and its formatted text."""
+        self.add_entry(record)
+        self.chunks.append(chunk)
+
+    def get_text(self, index):
+        """Get the formatted text of one page."""
+        return self.chunks[index]
+
+
+class SpillingPageStore(MemoryPageStore):
+    """Memory page store that moves pages to a temporary file when the budget runs out.
+
+    Pages are held in memory while the budget has room. When an append does
+    not fit, every page still in memory is written to an anonymous temporary
+    file in one go and read back from there on demand.
+    """
+
+    def __init__(self, budget=None, encoding=None):
+        super().__init__()
+        self.budget = budget
+        self.encoding = encoding or config.TEXT_ENCODING
+        self.offsets = array('Q')
+        self.lengths = array('Q')
+        self.held = 0
+        self.spilled_pages = 0
+        self._file = None
+        self._file_size = 0
+        self._first_held = 0
+
+    def append(self, record, chunk):
+        """Add a page, spilling held pages to disk if the budget is used up."""
+        self.add_entry(record)
+        size = get_text_size(chunk)
+        if self.budget is not None and not self.budget.try_acquire(size):
+            self.spill()
+            if not self.budget.try_acquire(size):
+                # Other holders use the whole budget, so this page goes straight to disk
+                self.chunks.append(None)
+                self.offsets.append(0)
+                self.lengths.append(0)
+                self._write(len(self.chunks) - 1, chunk)
+                return
+        self.chunks.append(chunk)
+        self.offsets.append(0)
+        self.lengths.append(0)
+        self.held += size
+
+    def _write(self, index, chunk):
+        """Append one page to the temporary file."""
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(prefix='pdf_pages_')
+        data = chunk.encode(self.encoding)
+        self._file.seek(self._file_size)
+        self._file.write(data)
+        self.offsets[index] = self._file_size
+        self.lengths[index] = len(data)
+        self._file_size += len(data)
+        self.spilled_pages += 1
+
+    def spill(self):
+        """Move every page held in memory to the temporary file."""
+        if not self.held:
+            return
+        # Pages before _first_held are already on disk
+        for index in range(self._first_held, len(self.chunks)):
+            chunk = self.chunks[index]
+            if chunk is not None:
+                self._write(index, chunk)
+                self.chunks[index] = None
+        self._first_held = len(self.chunks)
+        if self.budget is not None:
+            self.budget.release(self.held)
+        self.held = 0
+
+    def relieve_pressure(self):
+        """Spill held pages if a producer is waiting for room in the budget."""
+        if self.budget is not None and self.budget.waiting and self.held:
+            self.spill()
+
+    def get_text(self, index):
+        """Get the formatted text of one page from memory or the temporary file."""
+        chunk = self.chunks[index]
+        if chunk is not None:
+            return chunk
+        self._file.seek(self.offsets[index])
+        return self._file.read(self.lengths[index]).decode(self.encoding)
+
+    def close(self):
+        """Drop the pages and delete the temporary file."""
+        if self.budget is not None:
+            self.budget.release(self.held)
+        self.held = 0
+        self.chunks = []
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class FilePageStore(PageStore):
+    """Page store that reads pages back from an output file by byte offset."""
+
+    def __init__(self, path, encoding=None):
+        super().__init__()
+        self.path = path
+        self.encoding = encoding or config.TEXT_ENCODING
+        self.offsets = array('Q')
+        self.lengths = array('Q')
+        self._file = None
+
+    def append(self, record, offset, length):
+        """Add a page written at offset with the given byte length."""
+        self.add_entry(record)
+        self.offsets.append(offset)
+        self.lengths.append(length)
+
+    def get_text(self, index):
+        """Read the formatted text of one page from disk."""
+        if self._file is None:
+            self._file = open(self.path, 'rb')
+        self._file.seek(self.offsets[index])
+        return self._file.read(self.lengths[index]).decode(self.encoding)
+
+    def close(self):
+        """Close the output file if it is open."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class RecordFilePageStore(FilePageStore):
+    """File page store over a JSON Lines output that formats records for display."""
+
+    def __init__(self, path, format_page, encoding=None):
+        super().__init__(path, encoding)
+        self.format_page = format_page
+
+    def get_text(self, index):
+        """Read one page record from disk and format it."""
+        return self.format_page(json.loads(super().get_text(index)))
@@ -0,0 +1,128 @@
+"""
+Parallel Extraction Module for PDF to Text Converter
+Fans page ranges out to a process pool, longest first, and yields results in order
+Created by Jaswanth
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import config
+from cache import PageCache
+from dedup import get_deduplicator
+from extractor import TextExtractor, describe_error
+from memory_budget import get_memory_budget
+from scheduler import PageRangeScheduler
+
+
+# Per-process cache connections, opened lazily by the worker functions
+_worker_caches = {}
+
+
+def _get_worker_cache(cache_directory):
+    """Get this process's connection to the page cache, if caching is on."""
+    if cache_directory is None:
+        return None
+    if cache_directory not in _worker_caches:
+        _worker_caches[cache_directory] = PageCache(cache_directory)
+    return _worker_caches[cache_directory]
+
+
+def _count_pages(pdf_file, cache_directory=None, mode=None):
+    """Worker entry point: return the number of pages in a file."""
+    return TextExtractor(cache=_get_worker_cache(cache_directory),
+                         mode=mode).count_pages(pdf_file)
+
+
+def _extract_page_range(pdf_file, file_index, start, stop, cache_directory=None,
+                        deduplicate=True, mode=None):
+    """Worker entry point: extract pages [start, stop) with a private reader.
+
+    Post-processing is left to the parent, which runs the pipeline over the
+    reassembled records.
+    """
+    extractor = TextExtractor(cache=_get_worker_cache(cache_directory),
+                              dedup=get_deduplicator() if deduplicate else None,
+                              mode=mode)
+    return list(extractor.iter_file_pages(pdf_file, file_index, start, stop))
+
+
+class ParallelExtractor(TextExtractor):
+    """Text extractor that spreads page ranges across worker processes.
+
+    By default each call to iter_pages() starts its own pool. A long-lived
+    executor can be passed in instead and shared by many extractors; pass
+    deduplicate=False when they extract unrelated documents, since workers
+    remember pages across every task they run.
+    """
+
+    def __init__(self, max_workers=None, pages_per_task=None, executor=None,
+                 deduplicate=True, **kwargs):
+        super().__init__(**kwargs)
+        self.executor = executor
+        self.deduplicate = deduplicate
+        performance = config.PERFORMANCE
+        self.max_workers = (max_workers or performance.get('max_workers')
+                            or os.cpu_count() or 1)
+        self.pages_per_task = max(1, pages_per_task
+                                  or performance.get('pages_per_task', 8))
+
+    def count_all_pages(self, executor, files):
+        """Count pages of every file in the pool; unreadable files count as 0.
+
+        Files already counted in this batch are not opened again.
+        """
+        cache_directory = self.cache.directory if self.cache is not None else None
+        futures = [None if pdf_file in self.page_counts
+                   else executor.submit(_count_pages, pdf_file, cache_directory, self.mode)
+                   for pdf_file in files]
+        page_counts = []
+        for pdf_file, future in zip(files, futures):
+            if future is None:
+                page_counts.append(self.page_counts[pdf_file])
+                continue
+            try:
+                page_counts.append(future.result())
+            except BrokenProcessPool:
+                # A crashed worker is not a fault of this file
+                raise
+            except Exception as e:
+                # Skip files that cannot be opened instead of failing the batch
+                self.record_error(pdf_file, None, 'error', describe_error(e))
+                page_counts.append(0)
+        return page_counts
+
+    def iter_extracted_pages(self, files):
+        """Yield page records for all files, preserving file and page order."""
+        files = list(files)
+        if self.executor is not None:
+            yield from self._iter_scheduled_pages(self.executor, files)
+            return
+        if self.max_workers <= 1:
+            yield from super().iter_extracted_pages(files)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            yield from self._iter_scheduled_pages(executor, files)
+
+    def _iter_scheduled_pages(self, executor, files):
+        """Extract every file's page ranges on executor and yield records in order."""
+        cache_directory = self.cache.directory if self.cache is not None else None
+        scheduler = PageRangeScheduler(self.count_all_pages(executor, files),
+                                       self.max_workers, self.pages_per_task,
+                                       config.PERFORMANCE.get('max_buffered_pages'),
+                                       get_memory_budget())
+
+        def submit(file_index, start, stop):
+            return executor.submit(_extract_page_range, files[file_index], file_index,
+                                   start, stop, cache_directory, self.deduplicate, self.mode)
+
+        for records in scheduler.run(submit):
+            yield from self._record_results(records)
+
+    def _record_results(self, records):
+        """Record metrics and errors for records returned by a worker, then yield them."""
+        for record in records:
+            self.record_page(record)
+            yield record
@@ -1,10 +1,20 @@
 import tkinter as tk
-from tkinter import filedialog, messagebox, scrolledtext
+from tkinter import filedialog, messagebox
 from tkinter import ttk
-import PyPDF2
 import os
 from datetime import datetime
 
+import config
+from extractor import create_extractor
+from memory_budget import get_memory_budget, get_text_size
+from page_records import is_record_output
+from page_store import FilePageStore, RecordFilePageStore, SpillingPageStore
+from search_index import InvertedIndex, tokenize
+from utils import ValidationUtilities
+from viewer import PagedTextViewer
+from worker import ExtractionWorker, ProgressTracker
+from writers import create_writer
+
 class PDFToTextConverter:
     def __init__(self, root):
         self.root = root
@@ -13,7 +23,14 @@ class PDFToTextConverter:
         self.root.configure(bg="#f0f0f0")
         
         self.selected_files = []
-        self.extracted_text = ""
+        self.page_store = None
+        self.search_index = None
+        self.search_hits = []
+        self.search_position = 0
+        self.extractor = create_extractor()
+        self.budget = get_memory_budget()
+        self.worker = None
+        self.progress = None
         
         self.setup_ui()
     
@@ -49,6 +66,13 @@ class PDFToTextConverter:
                                     font=("Arial", 10, "bold"))
         self.extract_btn.pack(side=tk.LEFT, padx=5)
         
+        # Extract to file button
+        self.extract_file_btn = tk.Button(button_frame, text="Extract to File", 
+                                         command=self.extract_to_file,
+                                         bg="#16a085", fg="white", padx=15, pady=8,
+                                         font=("Arial", 10, "bold"))
+        self.extract_file_btn.pack(side=tk.LEFT, padx=5)
+        
         # Save text button
         self.save_btn = tk.Button(button_frame, text="Save as TXT", 
                                  command=self.save_text,
@@ -63,6 +87,33 @@ class PDFToTextConverter:
                                   font=("Arial", 10, "bold"))
         self.clear_btn.pack(side=tk.LEFT, padx=5)
         
+        # Cancel button
+        self.cancel_btn = tk.Button(button_frame, text="Cancel", 
+                                   command=self.cancel_extraction,
+                                   bg="#7f8c8d", fg="white", padx=15, pady=8,
+                                   font=("Arial", 10, "bold"), state=tk.DISABLED)
+        self.cancel_btn.pack(side=tk.RIGHT, padx=5)
+        
+        # Pause button
+        self.pause_btn = tk.Button(button_frame, text="Pause", 
+                                  command=self.toggle_pause,
+                                  bg="#7f8c8d", fg="white", padx=15, pady=8,
+                                  font=("Arial", 10, "bold"), state=tk.DISABLED)
+        self.pause_btn.pack(side=tk.RIGHT, padx=5)
+        
+        # Progress bar
+        progress_frame = tk.Frame(content_frame, bg="#f0f0f0")
+        progress_frame.pack(fill=tk.X, padx=5)
+        
+        self.progress_bar = ttk.Progressbar(progress_frame, orient=tk.HORIZONTAL,
+                                            mode='determinate')
+        self.progress_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        self.progress_label = tk.Label(progress_frame, text="", width=40,
+                                       bg="#f0f0f0", fg="#2c3e50",
+                                       font=("Arial", 9), anchor="e")
+        self.progress_label.pack(side=tk.RIGHT, padx=5)
+        
         # Status label
         self.status_label = tk.Label(content_frame, text="Ready", 
                                     bg="#ecf0f1", fg="#2c3e50",
@@ -88,17 +139,37 @@ class PDFToTextConverter:
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.file_listbox.config(yscrollcommand=scrollbar.set)
         
-        # Text display label
-        text_label = tk.Label(content_frame, text="Extracted Text:", 
+        # Text display label with search bar
+        text_header = tk.Frame(content_frame, bg="#f0f0f0")
+        text_header.pack(fill=tk.X, padx=5, pady=(10, 0))
+        
+        text_label = tk.Label(text_header, text="Extracted Text:", 
                              bg="#f0f0f0", fg="#2c3e50",
                              font=("Arial", 10, "bold"))
-        text_label.pack(anchor="w", padx=5, pady=(10, 0))
+        text_label.pack(side=tk.LEFT)
+        
+        self.search_label = tk.Label(text_header, text="", bg="#f0f0f0", fg="#2c3e50",
+                                     font=("Arial", 9))
+        self.search_label.pack(side=tk.RIGHT, padx=5)
         
-        # Text display area
-        self.text_display = scrolledtext.ScrolledText(content_frame, height=15, 
-                                                      bg="white", fg="#2c3e50",
-                                                      font=("Courier", 9),
-                                                      wrap=tk.WORD)
+        self.next_hit_btn = tk.Button(text_header, text="Next", command=self.next_search_hit,
+                                      font=("Arial", 9))
+        self.next_hit_btn.pack(side=tk.RIGHT)
+        
+        self.search_btn = tk.Button(text_header, text="Search", command=self.search_text,
+                                    font=("Arial", 9))
+        self.search_btn.pack(side=tk.RIGHT, padx=5)
+        
+        self.search_var = tk.StringVar()
+        self.search_entry = tk.Entry(text_header, textvariable=self.search_var, width=30)
+        self.search_entry.pack(side=tk.RIGHT)
+        self.search_entry.bind("<Return>", lambda event: self.search_text())
+        
+        # Text display area (only a window of pages is loaded at a time)
+        self.text_display = PagedTextViewer(content_frame, height=15, 
+                                            bg="white", fg="#2c3e50",
+                                            font=("Courier", 9),
+                                            wrap=tk.WORD)
         self.text_display.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
         # Footer
@@ -116,10 +187,22 @@ class PDFToTextConverter:
         )
         
         if files:
-            self.selected_files = list(files)
+            validation = config.VALIDATION
+            results = ValidationUtilities.validate_files(
+                files, max_size_mb=validation['max_file_size_mb'],
+                sniff_bytes=validation['sniff_bytes'], max_workers=validation['max_workers'])
+            self.selected_files = [file for file, is_valid, message in results if is_valid]
+            rejected = [f"{os.path.basename(file)}: {message}"
+                        for file, is_valid, message in results if not is_valid]
             self.update_file_list()
             self.update_status(f"{len(self.selected_files)} file(s) selected")
-            messagebox.showinfo("Success", f"Selected {len(self.selected_files)} PDF file(s)")
+            if rejected:
+                shown = "\n".join(rejected[:10])
+                if len(rejected) > 10:
+                    shown += f"\n... and {len(rejected) - 10} more"
+                messagebox.showwarning("Warning", f"Skipped {len(rejected)} invalid file(s):\n{shown}")
+            else:
+                messagebox.showinfo("Success", f"Selected {len(self.selected_files)} PDF file(s)")
         else:
             self.update_status("No files selected")
     
@@ -132,67 +215,235 @@ class PDFToTextConverter:
     
     def extract_text(self):
         """Extract text from selected PDF files."""
-        if not self.selected_files:
-            messagebox.showwarning("Warning", "Please select at least one PDF file first!")
-            self.update_status("No files selected for extraction")
+        if self.check_can_extract():
+            self.start_extraction()
+    
+    def extract_to_file(self):
+        """Extract text straight to a file without keeping it in memory."""
+        if not self.check_can_extract():
+            return
+        
+        file_path = self.ask_save_path(allow_records=True)
+        if not file_path:
+            self.update_status("Extraction cancelled")
             return
         
         try:
-            self.extracted_text = ""
-            total_pages = 0
-            
-            for pdf_file in self.selected_files:
-                with open(pdf_file, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    num_pages = len(pdf_reader.pages)
-                    total_pages += num_pages
-                    
-                    # Add file header
-                    self.extracted_text += f"\n{'='*80}\n"
-                    self.extracted_text += f"File: {os.path.basename(pdf_file)}\n"
-                    self.extracted_text += f"Pages: {num_pages}\n"
-                    self.extracted_text += f"{'='*80}\n\n"
-                    
-                    # Extract text from each page
-                    for page_num, page in enumerate(pdf_reader.pages, 1):
-                        text = page.extract_text()
-                        self.extracted_text += f"--- Page {page_num} ---\n"
-                        self.extracted_text += text + "\n\n"
-            
-            # Display extracted text
-            self.text_display.delete(1.0, tk.END)
-            self.text_display.insert(1.0, self.extracted_text)
-            
-            msg = f"Successfully extracted text from {len(self.selected_files)} file(s) ({total_pages} pages total)"
-            self.update_status(msg)
-            messagebox.showinfo("Success", msg)
-            
+            writer = create_writer(file_path)
         except Exception as e:
-            error_msg = f"Error extracting text: {str(e)}"
+            error_msg = f"Error saving file: {str(e)}"
+            self.update_status(error_msg)
+            messagebox.showerror("Error", error_msg)
+            return
+        
+        self.start_extraction(writer)
+    
+    def check_can_extract(self):
+        """Check that files are selected and no extraction is running."""
+        if not self.selected_files:
+            messagebox.showwarning("Warning", "Please select at least one PDF file first!")
+            self.update_status("No files selected for extraction")
+            return False
+        
+        if self.worker is not None and self.worker.is_alive():
+            self.update_status("Extraction already running")
+            return False
+        
+        return True
+    
+    def start_extraction(self, writer=None):
+        """Start the background worker, streaming to writer if one is given."""
+        self.close_page_store()
+        if writer is None or not writer.seekable:
+            # Compressed output cannot be read back page by page, so keep it
+            # in memory, moving it to a temporary file beyond the memory budget
+            self.page_store = SpillingPageStore(self.budget)
+            self.text_display.set_store(self.page_store)
+        elif is_record_output(writer.path):
+            self.page_store = RecordFilePageStore(writer.path, self.extractor.format_page)
+            self.text_display.clear()
+        else:
+            self.page_store = FilePageStore(writer.path)
+            self.text_display.clear()
+        self.progress = ProgressTracker()
+        self.progress_bar.config(value=0, maximum=1)
+        self.progress_label.config(text="")
+        self.set_running(True)
+        self.update_status("Extracting text...")
+        
+        self.search_index = InvertedIndex()
+        self.worker = ExtractionWorker(self.extractor, self.selected_files, writer,
+                                       self.search_index, self.budget)
+        self.worker.start()
+        self.root.after(config.PERFORMANCE['update_interval_ms'], self.poll_worker)
+    
+    def poll_worker(self):
+        """Drain worker events and refresh the progress display once per tick."""
+        finished = None
+        max_events = config.PERFORMANCE.get('max_events_per_tick')
+        events = self.worker.drain(max_events)
+        for event, value in events:
+            if event == 'page':
+                # The worker counted this page against the budget when queuing it
+                self.budget.release(get_text_size(value['text']))
+                if isinstance(self.page_store, FilePageStore):
+                    self.page_store.append(value, value['output_offset'],
+                                           value['output_length'])
+                else:
+                    self.page_store.append(value, self.extractor.format_page(value))
+                self.progress.done += 1
+            elif event == 'total':
+                self.progress.total = value
+                self.progress_bar.config(maximum=max(value, 1))
+            else:
+                finished = (event, value)
+        if isinstance(self.page_store, SpillingPageStore):
+            self.page_store.relieve_pressure()
+        
+        self.progress_bar.config(value=self.progress.done)
+        self.progress_label.config(text=self.progress.format())
+        if self.text_display.store is not None:
+            self.text_display.refresh()
+        
+        if finished is None:
+            # Come back at once while a backlog is left, still letting Tk
+            # handle input in between
+            backlog = max_events is not None and len(events) >= max_events
+            self.root.after(1 if backlog else config.PERFORMANCE['update_interval_ms'],
+                            self.poll_worker)
+        else:
+            self.finish_extraction(*finished)
+    
+    def finish_extraction(self, event, value):
+        """Show the extraction result once the worker has stopped."""
+        self.set_running(False)
+        self.extractor.metrics.flush()
+        to_file = isinstance(self.page_store, FilePageStore)
+        output_path = self.worker.writer.path if self.worker.writer is not None else None
+        
+        if event == 'error':
+            if to_file:
+                self.close_page_store()
+            error_msg = f"Error extracting text: {str(value)}"
             self.update_status(error_msg)
             messagebox.showerror("Error", error_msg)
+            return
+        
+        total_pages = self.progress.done
+        if value:
+            if to_file:
+                self.close_page_store()
+            msg = f"Extraction cancelled after {total_pages} pages"
+            self.update_status(msg)
+            return
+        
+        # Display extracted text
+        if to_file:
+            self.text_display.set_store(self.page_store)
+        else:
+            self.text_display.refresh()
+        msg = f"Successfully extracted text from {len(self.selected_files)} file(s) ({total_pages} pages total)"
+        if output_path:
+            msg += f" to {os.path.basename(output_path)}"
+        duplicates = self.extractor.duplicate_pages
+        if duplicates:
+            msg += (f"\n{duplicates} duplicate page(s) written as references "
+                    f"({duplicates / max(total_pages, 1):.0%} of pages)")
+        
+        errors = self.extractor.errors
+        if errors:
+            msg += f"\n{len(errors)} page(s) or file(s) could not be extracted"
+            if output_path:
+                msg += f" (see {os.path.basename(output_path)}{config.ERROR_REPORT_EXTENSION})"
+            first = errors[0]
+            where = f"page {first['page']}" if first['page'] else "file"
+            msg += f"\nFirst error: {os.path.basename(first['file'])} {where}: {first['message']}"
+            self.update_status(msg.split("\n")[0])
+            messagebox.showwarning("Warning", msg)
+            return
+        self.update_status(msg)
+        messagebox.showinfo("Success", msg)
+    
+    def set_running(self, running):
+        """Enable the controls that apply while an extraction is (not) running."""
+        idle_state = tk.DISABLED if running else tk.NORMAL
+        busy_state = tk.NORMAL if running else tk.DISABLED
+        for button in (self.select_btn, self.extract_btn, self.extract_file_btn,
+                       self.save_btn, self.clear_btn, self.search_btn, self.next_hit_btn):
+            button.config(state=idle_state)
+        for button in (self.pause_btn, self.cancel_btn):
+            button.config(state=busy_state)
+        self.pause_btn.config(text="Pause")
+    
+    def toggle_pause(self):
+        """Pause or resume the running extraction."""
+        if self.worker is None:
+            return
+        if self.worker.is_paused():
+            self.worker.resume()
+            self.progress.resume()
+            self.pause_btn.config(text="Pause")
+            self.update_status("Extracting text...")
+        else:
+            self.worker.pause()
+            self.progress.pause()
+            self.pause_btn.config(text="Resume")
+            self.update_status("Extraction paused")
+    
+    def cancel_extraction(self):
+        """Stop the running extraction after the current page."""
+        if self.worker is not None:
+            self.worker.cancel()
+            self.progress.resume()
+            self.update_status("Cancelling extraction...")
+    
+    def search_text(self):
+        """Find pages containing every search term and jump to the first hit."""
+        if self.worker is not None and self.worker.is_alive():
+            self.update_status("Search is available once extraction finishes")
+            return
+        if not self.page_store or self.search_index is None:
+            self.update_status("No extracted text to search")
+            return
+        
+        query = self.search_var.get().strip()
+        self.search_hits = self.search_index.search(query) if query else []
+        self.search_position = 0
+        self.text_display.highlight([term.rstrip('*') for term in tokenize(query)])
+        if not self.search_hits:
+            self.search_label.config(text="No matches")
+            return
+        self.show_search_hit()
+    
+    def next_search_hit(self):
+        """Jump to the next search hit, wrapping around at the end."""
+        if not self.search_hits:
+            return
+        self.search_position = (self.search_position + 1) % len(self.search_hits)
+        self.show_search_hit()
+    
+    def show_search_hit(self):
+        """Show the current search hit in the viewer."""
+        hit = self.search_hits[self.search_position]
+        self.text_display.show_file_page(hit['file_index'], hit['page_num'])
+        self.search_label.config(
+            text=f"Hit {self.search_position + 1} of {len(self.search_hits)}: "
+                 f"{hit['filename']} page {hit['page_num']}")
     
     def save_text(self):
         """Save extracted text to a file."""
-        if not self.extracted_text:
+        if not self.page_store:
             messagebox.showwarning("Warning", "No extracted text to save. Please extract text first!")
             self.update_status("No text to save")
             return
         
         try:
-            # Suggest filename with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            default_name = f"extracted_text_{timestamp}.txt"
-            
-            file_path = filedialog.asksaveasfilename(
-                defaultextension=".txt",
-                filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")],
-                initialfile=default_name
-            )
+            file_path = self.ask_save_path()
             
             if file_path:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(self.extracted_text)
+                with create_writer(file_path, allow_records=False) as writer:
+                    for chunk in self.page_store.iter_text():
+                        writer.write(chunk)
                 
                 msg = f"Text saved successfully to {os.path.basename(file_path)}"
                 self.update_status(msg)
@@ -205,19 +456,46 @@ class PDFToTextConverter:
             self.update_status(error_msg)
             messagebox.showerror("Error", error_msg)
     
+    def ask_save_path(self, allow_records=False):
+        """Ask for an output path, suggesting a timestamped filename.
+        
+        With allow_records, a .jsonl path selects one JSON record per page.
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        default_name = f"extracted_text_{timestamp}.txt"
+        filetypes = [("Text Files", "*.txt")]
+        if allow_records:
+            filetypes.append(("JSON Lines (one record per page)",
+                              f"*{config.RECORD_OUTPUT_EXTENSION}"))
+        filetypes.append(("All Files", "*.*"))
+        
+        return filedialog.asksaveasfilename(
+            defaultextension=".txt",
+            filetypes=filetypes,
+            initialfile=default_name
+        )
+    
     def clear_display(self):
         """Clear the text display and reset."""
-        self.text_display.delete(1.0, tk.END)
-        self.extracted_text = ""
+        self.close_page_store()
         self.selected_files = []
         self.file_listbox.delete(0, tk.END)
         self.update_status("Display cleared")
         messagebox.showinfo("Success", "Display cleared and ready for new extraction")
     
+    def close_page_store(self):
+        """Forget the current extraction result and empty the viewer."""
+        self.text_display.clear()
+        if self.page_store is not None:
+            self.page_store.close()
+        self.page_store = None
+        self.search_index = None
+        self.search_hits = []
+        self.search_label.config(text="")
+    
     def update_status(self, message):
         """Update the status label."""
         self.status_label.config(text=f"Status: {message}")
-        self.root.update()
 
 def main():
     root = tk.Tk()
@@ -0,0 +1,233 @@
+"""
+Post-Processing Module for PDF to Text Converter
+Per-page text clean-up stages chained as generators, with the cost of each stage
+Created by Jaswanth
+"""
+
+import re
+import time
+import unicodedata
+from collections import Counter, deque
+
+import config
+
+
+LINE_BREAKS = re.compile(r'\r\n?')
+TRAILING_SPACE = re.compile(r'[ \t\f\v]+$', re.MULTILINE)
+EDGE_SPACE = re.compile(r'^[ \t\f\v]+|[ \t\f\v]+$', re.MULTILINE)
+INNER_SPACE = re.compile(r'[ \t\f\v]{2,}|[\t\f\v]')
+BLANK_LINES = re.compile(r'\n{3,}')
+# A hard or soft hyphen ending a line, with the indent of the next line
+HYPHEN_BREAK = re.compile(r'(?<=\w)[-\u00ad]\n[ \t]*(?=\w)')
+# A page number filling the whole line: "12", "Page 12", "12 of 40", "- 12 -"
+STANDALONE_PAGE_NUMBER = re.compile(r'^[-\s]*(?:page\s+)?\d+(?:\s+of\s+\d+)?[-\s]*$',
+                                    re.IGNORECASE)
+# A page number ending a running title of three or more words; shorter lines
+# such as "Article 3" are more likely numbered headings
+TRAILING_PAGE_NUMBER = re.compile(r'^(\S+(?:\s\S+){2,})\s\d+$')
+
+
+def normalize_line_endings(pages):
+    """Turn CRLF and CR line endings into LF."""
+    for record in pages:
+        if '\r' in record['text']:
+            record['text'] = LINE_BREAKS.sub('\n', record['text'])
+        yield record
+
+
+def collapse_whitespace(pages, preserve=None):
+    """Tidy whitespace as PRESERVE_WHITESPACE asks.
+
+    When whitespace is preserved only trailing spaces are dropped, keeping
+    indentation and column alignment. Otherwise runs of spaces become one,
+    lines are stripped and runs of blank lines become a single blank line.
+    """
+    preserve = config.PRESERVE_WHITESPACE if preserve is None else preserve
+    for record in pages:
+        text = record['text']
+        if preserve:
+            text = TRAILING_SPACE.sub('', text)
+        else:
+            text = INNER_SPACE.sub(' ', EDGE_SPACE.sub('', text))
+            text = BLANK_LINES.sub('\n\n', text)
+        record['text'] = text
+        yield record
+
+
+def _join_hyphenated(match):
+    """Rejoin a word split across lines unless the second part looks like a new word."""
+    if not match.string[match.end()].islower():
+        return match.group(0)
+    return ''
+
+
+def dehyphenate(pages):
+    """Rejoin words hyphenated across line breaks.
+
+    The second part of the word moves up to the first, and whatever followed
+    it, a space or a line break, is kept as it was.
+    """
+    for record in pages:
+        text = record['text']
+        if '-\n' in text or '\u00ad\n' in text:
+            record['text'] = HYPHEN_BREAK.sub(_join_hyphenated, text)
+        yield record
+
+
+def _get_line_key(line):
+    """Key a line for comparison across pages, ignoring a page number in it."""
+    line = ' '.join(line.split())
+    if STANDALONE_PAGE_NUMBER.match(line):
+        return '#'
+    return TRAILING_PAGE_NUMBER.sub(r'\1 #', line)
+
+
+def _get_edge_lines(record, count):
+    """Split a page into lines and key its first and last count non-blank lines.
+
+    Returns (record, lines, {line_index: key}, strippable). Only pages with
+    more than 2 * count non-blank lines are strippable, so removing edge
+    lines never empties a page or eats into a short page's only content.
+    """
+    lines = record['text'].split('\n')
+    filled = [index for index, line in enumerate(lines) if line.strip()]
+    keys = {}
+    for position, index in enumerate(filled[:count]):
+        keys[index] = ('top', position, _get_line_key(lines[index]))
+    for position, index in enumerate(reversed(filled[-count:])):
+        keys.setdefault(index, ('bottom', position, _get_line_key(lines[index])))
+    return record, lines, keys, len(filled) > 2 * count
+
+
+def _strip_repeated(entry, counts, min_repeats):
+    """Remove the edge lines of a page that repeat on enough neighbouring pages."""
+    record, lines, keys, strippable = entry
+    if not strippable:
+        return record
+    drop = {index for index, key in keys.items() if counts[key] >= min_repeats}
+    if drop:
+        record['text'] = '\n'.join(line for index, line in enumerate(lines)
+                                   if index not in drop)
+    return record
+
+
+def strip_headers_footers(pages, lines=None, window=None, min_repeats=None):
+    """Drop running headers and footers: edge lines repeated on nearby pages.
+
+    Each page is compared with up to window // 2 pages before and after it
+    in the same file, so only that many pages are held at a time. Lines
+    match when they differ only in a page number, either the whole line or
+    a number ending a running title.
+    """
+    settings = config.POSTPROCESS
+    lines = lines or settings['header_footer_lines']
+    half = max(1, (window or settings['header_footer_window']) // 2)
+    min_repeats = min_repeats or settings['header_footer_min_repeats']
+
+    entries = deque()
+    counts = Counter()
+    current = 0
+    file_index = None
+    for record in pages:
+        if record['file_index'] != file_index:
+            # Headers never carry over between files
+            while current < len(entries):
+                yield _strip_repeated(entries[current], counts, min_repeats)
+                current += 1
+            entries.clear()
+            counts.clear()
+            current = 0
+            file_index = record['file_index']
+
+        entry = _get_edge_lines(record, lines)
+        entries.append(entry)
+        counts.update(entry[2].values())
+        while len(entries) - current > half:
+            yield _strip_repeated(entries[current], counts, min_repeats)
+            current += 1
+            if current > half:
+                old = entries.popleft()
+                counts.subtract(old[2].values())
+                current -= 1
+    while current < len(entries):
+        yield _strip_repeated(entries[current], counts, min_repeats)
+        current += 1
+
+
+def normalize_unicode(pages, form=None):
+    """Apply a Unicode normalization form, e.g. NFKC to unfold ligatures."""
+    form = form or config.POSTPROCESS['unicode_form']
+    for record in pages:
+        text = record['text']
+        if not text.isascii() and not unicodedata.is_normalized(form, text):
+            record['text'] = unicodedata.normalize(form, text)
+        yield record
+
+
+# Stage names accepted in POSTPROCESS['stages']
+STAGES = {
+    'line_endings': normalize_line_endings,
+    'whitespace': collapse_whitespace,
+    'dehyphenate': dehyphenate,
+    'headers_footers': strip_headers_footers,
+    'unicode': normalize_unicode,
+}
+
+
+class TextPipeline:
+    """Chain of post-processing stages applied to a stream of page records.
+
+    Records are changed in place and passed on one page at a time. The time
+    spent in each stage, excluding the stages and extraction upstream of it,
+    is added to stage_seconds.
+    """
+
+    def __init__(self, stages=None):
+        names = config.POSTPROCESS['stages'] if stages is None else stages
+        unknown = [name for name in names if name not in STAGES]
+        if unknown:
+            raise ValueError(f"Unknown post-processing stage(s): {', '.join(unknown)}")
+        self.stages = [(name, STAGES[name]) for name in names]
+        self.stage_seconds = dict.fromkeys(names, 0.0)
+
+    def reset(self):
+        """Zero the per-stage timings."""
+        self.stage_seconds = dict.fromkeys(self.stage_seconds, 0.0)
+
+    @staticmethod
+    def _timed(pages, totals, position):
+        """Pass records through, adding the time spent producing each to totals."""
+        iterator = iter(pages)
+        while True:
+            started = time.perf_counter()
+            try:
+                record = next(iterator)
+            except StopIteration:
+                totals[position] += time.perf_counter() - started
+                return
+            totals[position] += time.perf_counter() - started
+            yield record
+
+    def process(self, pages, metrics=None):
+        """Yield records after every stage; timings are recorded when the stream ends."""
+        # totals[k] includes everything upstream of stage k, because upstream
+        # stages only run inside the downstream stage's next()
+        totals = [0.0] * (len(self.stages) + 1)
+        chain = self._timed(pages, totals, 0)
+        for position, (_, stage) in enumerate(self.stages, 1):
+            chain = self._timed(stage(chain), totals, position)
+        try:
+            yield from chain
+        finally:
+            for position, (name, _) in enumerate(self.stages, 1):
+                seconds = totals[position] - totals[position - 1]
+                self.stage_seconds[name] += seconds
+                if metrics is not None:
+                    metrics.record_stage(name, seconds)
+
+
+def create_pipeline():
+    """Create the pipeline selected by POSTPROCESS, or None if no stages are enabled."""
+    if not config.POSTPROCESS.get('stages'):
+        return None
+    return TextPipeline()
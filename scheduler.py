@@ -0,0 +1,162 @@
+"""
+Scheduler Module for PDF to Text Converter
+Longest-first page-range scheduling with range splitting and in-order reassembly
+Created by Jaswanth
+"""
+
+import heapq
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from memory_budget import get_text_size
+
+
+# Page-range tasks planned per worker before any splitting
+TASKS_PER_WORKER = 4
+
+
+def plan_page_ranges(page_counts, workers, min_pages, max_pages=None):
+    """Split files into (file_index, start, stop) page ranges sized for the pool.
+
+    Ranges are sized so the whole batch makes about TASKS_PER_WORKER tasks
+    per worker, but never fewer than min_pages pages, so small files stay a
+    single task and huge ones are cut into many.
+    """
+    total_pages = sum(page_counts)
+    chunk = max(min_pages, -(-total_pages // (max(1, workers) * TASKS_PER_WORKER)))
+    if max_pages:
+        chunk = max(min_pages, min(chunk, max_pages))
+    ranges = []
+    for file_index, num_pages in enumerate(page_counts):
+        for start in range(0, num_pages, chunk):
+            ranges.append((file_index, start, min(start + chunk, num_pages)))
+    return ranges
+
+
+class PageRangeScheduler:
+    """Run page-range tasks on a pool, longest first, and yield results in page order.
+
+    Only as many tasks as there are workers are in flight; the rest wait
+    here, where they can still be divided. Whenever a worker frees up and
+    fewer tasks are waiting than workers are idle, the largest waiting range
+    is split in half, so workers that run out of work take over part of
+    another worker's share instead of sitting idle behind one long file.
+
+    Finished ranges are held until every page before them has been yielded.
+    Once more than max_buffered_pages are held, or their text plus what the
+    memory budget already counts exceeds its limit, only the range the
+    output is waiting on is started until it catches up. Held text is not
+    charged to the budget itself: the consumer may be waiting on the budget
+    for the very page that would let the held ranges drain.
+    """
+
+    def __init__(self, page_counts, workers, min_pages, max_buffered_pages=None,
+                 budget=None):
+        self.page_counts = list(page_counts)
+        self.workers = max(1, workers)
+        self.min_pages = max(1, min_pages)
+        self.max_buffered_pages = max_buffered_pages
+        self.budget = budget
+        self.waiting = []
+        self.waiting_starts = {}
+        for task in plan_page_ranges(self.page_counts, self.workers, self.min_pages):
+            self._add_waiting(task)
+        self.splits = 0
+
+    def _add_waiting(self, task):
+        """Queue a range, keyed so the largest (then earliest) comes out first."""
+        file_index, start, stop = task
+        heapq.heappush(self.waiting, (start - stop, file_index, start, stop))
+        self.waiting_starts[(file_index, start)] = stop
+
+    def _pop_waiting(self, head=None):
+        """Take the largest waiting range, or the one starting at head if given."""
+        if head is not None:
+            stop = self.waiting_starts.pop(head)
+            # The heap entry goes stale and is skipped when it surfaces
+            return head[0], head[1], stop
+        while self.waiting:
+            _, file_index, start, stop = heapq.heappop(self.waiting)
+            if self.waiting_starts.get((file_index, start)) == stop:
+                del self.waiting_starts[(file_index, start)]
+                return file_index, start, stop
+        return None
+
+    def _split_largest(self):
+        """Halve the largest waiting range; returns False if none is big enough."""
+        while self.waiting:
+            size, file_index, start, stop = self.waiting[0]
+            if self.waiting_starts.get((file_index, start)) != stop:
+                heapq.heappop(self.waiting)
+                continue
+            if -size < self.min_pages * 2:
+                return False
+            heapq.heappop(self.waiting)
+            middle = start + (stop - start) // 2
+            self._add_waiting((file_index, start, middle))
+            self._add_waiting((file_index, middle, stop))
+            self.splits += 1
+            return True
+        return False
+
+    def _first_position(self, file_index):
+        """Get the output position at the start of the next file that has pages."""
+        while file_index < len(self.page_counts) and not self.page_counts[file_index]:
+            file_index += 1
+        return (file_index, 0)
+
+    def is_over_budget(self, buffered_pages, buffered_bytes=0):
+        """Check whether finished ranges take more room than allowed."""
+        if self.max_buffered_pages is not None and buffered_pages > self.max_buffered_pages:
+            return True
+        return self.budget is not None and self.budget.exceeded(buffered_bytes)
+
+    def run(self, submit):
+        """Yield the result of every range in page order.
+
+        submit(file_index, start, stop) must return a future whose result is
+        the list of records for those pages.
+        """
+        running = {}
+        finished = {}
+        buffered_pages = buffered_bytes = 0
+        head = self._first_position(0)
+        try:
+            while self.waiting_starts or running or finished:
+                while len(running) < self.workers and self.waiting_starts:
+                    if self.is_over_budget(buffered_pages, buffered_bytes):
+                        # Hold back: only the range the output is waiting on may start
+                        if head not in self.waiting_starts:
+                            break
+                        task = self._pop_waiting(head)
+                    else:
+                        idle = self.workers - len(running)
+                        while len(self.waiting_starts) < idle and self._split_largest():
+                            pass
+                        task = self._pop_waiting()
+                    running[submit(*task)] = task
+
+                # Hand out everything that is now contiguous with the output
+                while head in finished:
+                    stop, records, size = finished.pop(head)
+                    buffered_pages -= stop - head[1]
+                    buffered_bytes -= size
+                    yield records
+                    head = ((head[0], stop) if stop < self.page_counts[head[0]]
+                            else self._first_position(head[0] + 1))
+                if not running:
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file_index, start, stop = running.pop(future)
+                    records = future.result()
+                    size = 0
+                    if self.budget is not None:
+                        size = sum(get_text_size(record['text']) for record in records)
+                    finished[(file_index, start)] = (stop, records, size)
+                    buffered_pages += stop - start
+                    buffered_bytes += size
+        finally:
+            # Abandoned early, e.g. the consumer went away: drop work not yet started
+            for future in running:
+                future.cancel()
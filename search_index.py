@@ -0,0 +1,236 @@
+"""
+Search Index Module for PDF to Text Converter
+Inverted index from terms to (file, page) postings with instant lookup
+Created by Jaswanth
+"""
+
+import argparse
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left
+
+import config
+
+
+# Words plus dotted/hyphenated identifiers such as clause numbers (4.2.1, 12-b)
+TOKEN_PATTERN = re.compile(r"\w+(?:[./-]\w+)*")
+
+INDEX_MAGIC = b"PDFIDX1\n"
+HEADER_STRUCT = struct.Struct('<Q')
+
+
+def tokenize(text):
+    """Split text into lowercase search terms."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class InvertedIndex:
+    """Term -> sorted page id postings, with page ids mapped to (file, page)."""
+
+    def __init__(self):
+        self.filenames = []
+        self.page_files = array('I')
+        self.page_numbers = array('I')
+        self.postings = {}
+        self._terms = None
+        self._mmap = None
+        self._file = None
+        self._term_table = None
+
+    def __len__(self):
+        return len(self.page_numbers)
+
+    def add_page(self, record):
+        """Index the text of a page record; returns its page id."""
+        page_id = len(self.page_numbers)
+        file_index = record['file_index']
+        while len(self.filenames) <= file_index:
+            self.filenames.append(None)
+        self.filenames[file_index] = record['filename']
+        self.page_files.append(file_index)
+        self.page_numbers.append(record['page_num'])
+
+        postings = self.postings
+        for term in set(tokenize(record['text'])):
+            term_postings = postings.get(term)
+            if term_postings is None:
+                term_postings = postings[term] = array('I')
+            term_postings.append(page_id)
+        self._terms = None
+        return page_id
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def get_postings(self, term):
+        """Get the sorted page ids containing a term."""
+        if self._term_table is not None:
+            entry = self._term_table.get(term)
+            if entry is None:
+                return ()
+            offset, count = entry
+            return memoryview(self._mmap)[offset:offset + count * 4].cast('I')
+        return self.postings.get(term, ())
+
+    def get_terms(self):
+        """Get all terms in sorted order."""
+        if self._terms is None:
+            source = self._term_table if self._term_table is not None else self.postings
+            self._terms = sorted(source)
+        return self._terms
+
+    def expand_prefix(self, prefix):
+        """Get every term starting with prefix."""
+        terms = self.get_terms()
+        matches = []
+        for index in range(bisect_left(terms, prefix), len(terms)):
+            if not terms[index].startswith(prefix):
+                break
+            matches.append(terms[index])
+        return matches
+
+    def get_query_postings(self, query_term):
+        """Get postings for a query term; a trailing '*' matches any suffix."""
+        if not query_term.endswith('*'):
+            return self.get_postings(query_term)
+        page_ids = set()
+        for term in self.expand_prefix(query_term[:-1]):
+            page_ids.update(self.get_postings(term))
+        return sorted(page_ids)
+
+    def search_page_ids(self, query):
+        """Get sorted page ids containing every term of the query."""
+        query_terms = [term + '*' if word.endswith('*') else term
+                       for word in query.lower().split()
+                       for term in tokenize(word)]
+        if not query_terms:
+            return []
+        postings = sorted((self.get_query_postings(term) for term in query_terms), key=len)
+        result = list(postings[0])
+        for other in postings[1:]:
+            if not result:
+                break
+            # Binary-search the longer list for each surviving id
+            size = len(other)
+            kept = []
+            for page_id in result:
+                position = bisect_left(other, page_id)
+                if position < size and other[position] == page_id:
+                    kept.append(page_id)
+            result = kept
+        return result
+
+    def search(self, query, limit=None):
+        """Get hits for a query as dicts with file_index, filename and page_num."""
+        hits = []
+        for page_id in self.search_page_ids(query)[:limit]:
+            file_index = self.page_files[page_id]
+            hits.append({
+                'file_index': file_index,
+                'filename': self.filenames[file_index],
+                'page_num': self.page_numbers[page_id],
+            })
+        return hits
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path):
+        """Write the index: magic, header length, JSON header, then raw arrays."""
+        terms = sorted(self.postings) if self._term_table is None else None
+        if terms is None:
+            raise ValueError("A loaded index is read-only")
+
+        page_bytes = self.page_files.tobytes() + self.page_numbers.tobytes()
+        term_table = []
+        offset = 0
+        for term in terms:
+            count = len(self.postings[term])
+            term_table.append((term, offset, count))
+            offset += count * 4
+        header = json.dumps({
+            'filenames': self.filenames,
+            'page_count': len(self),
+            'terms': term_table,
+        }, separators=(',', ':')).encode('utf-8')
+        # Pad with JSON whitespace so the arrays after it are 8-byte aligned
+        header += b' ' * (-(len(INDEX_MAGIC) + HEADER_STRUCT.size + len(header)) % 8)
+
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(prefix='.search.', dir=directory)
+        with os.fdopen(fd, 'wb', buffering=config.PERFORMANCE['buffer_size']) as f:
+            f.write(INDEX_MAGIC)
+            f.write(HEADER_STRUCT.pack(len(header)))
+            f.write(header)
+            f.write(page_bytes)
+            for term in terms:
+                self.postings[term].tofile(f)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Open a saved index; postings stay on disk and are memory-mapped."""
+        index = cls()
+        index._file = open(path, 'rb')
+        index._mmap = mmap.mmap(index._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if index._mmap[:len(INDEX_MAGIC)] != INDEX_MAGIC:
+            index.close()
+            raise ValueError(f"Not a search index: {path}")
+
+        position = len(INDEX_MAGIC)
+        (header_length,) = HEADER_STRUCT.unpack_from(index._mmap, position)
+        position += HEADER_STRUCT.size
+        header = json.loads(index._mmap[position:position + header_length])
+        position += header_length
+
+        page_count = header['page_count']
+        index.filenames = header['filenames']
+        index.page_files = memoryview(index._mmap)[position:position + page_count * 4].cast('I')
+        position += page_count * 4
+        index.page_numbers = memoryview(index._mmap)[position:position + page_count * 4].cast('I')
+        position += page_count * 4
+        index._term_table = {term: (position + offset, count)
+                             for term, offset, count in header['terms']}
+        return index
+
+    def close(self):
+        """Release the memory map of a loaded index."""
+        if self._mmap is not None:
+            self.page_files = self.page_numbers = array('I')
+            self._mmap.close()
+            self._file.close()
+            self._mmap = self._file = None
+
+
+def get_index_path(output_path):
+    """Get the search index path saved next to an output file."""
+    return output_path + config.SEARCH_INDEX_EXTENSION
+
+
+def main(argv=None):
+    """Query a saved search index from the command line."""
+    parser = argparse.ArgumentParser(description="Search a saved page index.")
+    parser.add_argument('index', help="index file, or the output it was saved next to")
+    parser.add_argument('query', nargs='+', help="terms that must all appear on a page")
+    parser.add_argument('-n', '--limit', type=int, default=None, help="maximum hits")
+    args = parser.parse_args(argv)
+
+    path = args.index
+    if not path.endswith(config.SEARCH_INDEX_EXTENSION):
+        path = get_index_path(path)
+    index = InvertedIndex.load(path)
+    for hit in index.search(' '.join(args.query), args.limit):
+        print(f"{hit['filename']}\tpage {hit['page_num']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,486 @@
+"""
+Server Module for PDF to Text Converter
+Local asyncio HTTP service streaming page text from a bounded worker pool
+Created by Jaswanth
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import signal
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+import config
+from cache import PageCache, default_cache_directory
+from extractor import describe_error
+from metrics import MetricsRecorder
+from page_records import make_page_record
+from parallel import ParallelExtractor
+from utils import FileUtilities, PDFUtilities
+
+
+# Largest request line plus headers accepted
+MAX_HEADER_BYTES = 64 * 1024
+
+# Bytes read from the socket per step of an upload
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+# Seconds a client turned away with 429 is asked to wait before retrying
+RETRY_AFTER_SECONDS = 1
+
+# Seconds spent discarding an unread upload after an error response, so the
+# client reads the response instead of a connection reset
+LINGER_SECONDS = 1.0
+
+DEFAULT_UPLOAD_NAME = 'upload.pdf'
+
+
+class HTTPError(Exception):
+    """A request answered with an error status and a JSON message."""
+
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = HTTPStatus(status)
+        self.headers = headers or {}
+
+
+def _get_pid():
+    """Worker entry point used to start and warm up pool processes."""
+    return os.getpid()
+
+
+def format_head(status, headers):
+    """Format a status line and headers."""
+    status = HTTPStatus(status)
+    lines = [f"HTTP/1.1 {status.value} {status.phrase}"]
+    lines.extend(f"{name}: {value}" for name, value in headers.items())
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+
+def get_upload_name(query, headers):
+    """Get a safe file name for an upload from ?filename= or X-Filename."""
+    name = (query.get('filename') or [headers.get('x-filename', '')])[0]
+    name = os.path.basename(name.replace('\\', '/')).strip()
+    if not name or name.startswith('.'):
+        return DEFAULT_UPLOAD_NAME
+    if not FileUtilities.is_valid_pdf(name):
+        name += '.pdf'
+    return name
+
+
+async def read_request_head(reader, timeout):
+    """Read the request line and headers; returns (method, path, query, headers).
+
+    Returns None if the client closed the connection without sending a request.
+    """
+    try:
+        head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), timeout)
+    except asyncio.IncompleteReadError:
+        return None
+    except asyncio.LimitOverrunError:
+        raise HTTPError(431, "Request headers too large")
+    except asyncio.TimeoutError:
+        raise HTTPError(408, "Timed out waiting for the request")
+
+    lines = head.decode('latin-1').split('\r\n')
+    parts = lines[0].split(' ')
+    if len(parts) != 3 or not parts[2].startswith('HTTP/'):
+        raise HTTPError(400, "Malformed request line")
+    headers = {}
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, separator, value = line.partition(':')
+        if not separator:
+            raise HTTPError(400, "Malformed header line")
+        headers[name.strip().lower()] = value.strip()
+    url = urlsplit(parts[1])
+    return parts[0], url.path, parse_qs(url.query), headers
+
+
+async def iter_body(reader, headers, limit, timeout):
+    """Yield a request body in pieces, from a Content-Length or chunked upload."""
+    async def read(size):
+        data = await asyncio.wait_for(reader.read(size), timeout)
+        if not data:
+            raise HTTPError(400, "Upload ended early")
+        return data
+
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        received = 0
+        while True:
+            size_line = await asyncio.wait_for(reader.readline(), timeout)
+            try:
+                size = int(size_line.split(b';')[0], 16)
+            except ValueError:
+                raise HTTPError(400, "Malformed chunk size")
+            if size == 0:
+                # Skip any trailers up to the closing blank line
+                while (await asyncio.wait_for(reader.readline(), timeout)).strip():
+                    pass
+                return
+            received += size
+            if received > limit:
+                raise HTTPError(413, f"Upload larger than {limit // (1024 * 1024)} MB")
+            while size:
+                data = await read(min(size, UPLOAD_CHUNK_SIZE))
+                size -= len(data)
+                yield data
+            await asyncio.wait_for(reader.readline(), timeout)
+
+    try:
+        remaining = int(headers['content-length'])
+    except KeyError:
+        raise HTTPError(411, "Content-Length or chunked transfer encoding required")
+    except ValueError:
+        raise HTTPError(400, "Malformed Content-Length")
+    if remaining > limit:
+        raise HTTPError(413, f"Upload larger than {limit // (1024 * 1024)} MB")
+    while remaining > 0:
+        data = await read(min(remaining, UPLOAD_CHUNK_SIZE))
+        remaining -= len(data)
+        yield data
+
+
+class ExtractionServer:
+    """Serve PDF extraction over HTTP from a bounded pool of worker processes.
+
+    POST /extract takes a PDF as the request body and streams its pages
+    back as NDJSON, one page record per line as pages complete, followed
+    by a summary line. Uploads are streamed to a temporary file and never
+    held in memory. At most one request per worker extracts at a time and
+    max_queued more may wait; anything beyond that is answered with 429
+    before its upload is read. GET /health and GET /metrics report the
+    server's state. Each connection carries one request.
+    """
+
+    def __init__(self, host=None, port=None, workers=None, max_queued=None):
+        settings = config.SERVER
+        self.host = host or settings['host']
+        self.port = settings['port'] if port is None else port
+        self.workers = max(1, workers or settings.get('workers') or os.cpu_count() or 1)
+        self.max_queued = max(0, settings['max_queued'] if max_queued is None
+                              else max_queued)
+        max_upload_mb = (settings.get('max_upload_mb')
+                         or config.VALIDATION['max_file_size_mb'])
+        self.max_upload_bytes = int(max_upload_mb * 1024 * 1024)
+        self.read_timeout = settings['read_timeout']
+        self.upload_dir = settings.get('upload_dir')
+        self.cache = PageCache(default_cache_directory()) if config.CACHE.get('enabled') else None
+        # The endpoint always serves metrics, whatever METRICS['enabled'] says
+        self.metrics = MetricsRecorder(per_file=False)
+        self.pool = None
+        self.threads = None
+        self.pending = 0
+        self.active = 0
+        self.slots = None
+        self._loop = None
+        self._stopping = None
+
+    @property
+    def capacity(self):
+        """Requests that may be extracting or waiting at once."""
+        return self.workers + self.max_queued
+
+    def start_pool(self):
+        """Start every worker process and wait until all of them answer."""
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        futures = [self.pool.submit(_get_pid) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+        # One thread per extraction slot pulls records from the extractor
+        self.threads = ThreadPoolExecutor(max_workers=self.workers,
+                                          thread_name_prefix='extract')
+
+    def replace_pool(self, broken):
+        """Swap in a new pool after a crashed worker broke the old one."""
+        if self.pool is broken:
+            broken.shutdown(wait=False, cancel_futures=True)
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+
+    def stop(self):
+        """Ask serve() to return; safe to call from any thread."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+
+    def serve_forever(self, ready=None):
+        """Warm up the workers and serve until stop(), SIGTERM or SIGINT."""
+        self.start_pool()
+        try:
+            asyncio.run(self.serve(ready))
+        finally:
+            self.close()
+
+    async def serve(self, ready=None):
+        """Listen until stop() is called; ready(server) is called once listening."""
+        loop = asyncio.get_running_loop()
+        self.slots = asyncio.Semaphore(self.workers)
+        self._stopping = asyncio.Event()
+        self._loop = loop
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(signum, self.stop)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass
+        server = await asyncio.start_server(self.handle_connection, self.host, self.port,
+                                            limit=MAX_HEADER_BYTES)
+        # Port 0 picks a free port; report the real one
+        self.port = server.sockets[0].getsockname()[1]
+        if ready is not None:
+            ready(self)
+        async with server:
+            await self._stopping.wait()
+        self._loop = None
+
+    def close(self):
+        """Stop the workers and write the configured metrics exports."""
+        if self.pool is not None:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            self.pool = None
+        if self.threads is not None:
+            self.threads.shutdown(wait=False, cancel_futures=True)
+            self.threads = None
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
+        self.metrics.flush()
+
+    async def handle_connection(self, reader, writer):
+        """Answer the one request sent on a connection."""
+        try:
+            try:
+                request = await read_request_head(reader, self.read_timeout)
+                if request is not None:
+                    await self.dispatch(reader, writer, *request)
+            except HTTPError as e:
+                await self.send_json(writer, e.status, {'error': str(e)}, e.headers)
+                await self._linger(reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _linger(self, reader, writer):
+        """Discard what is left of an unread upload for a moment before closing."""
+        if writer.can_write_eof():
+            writer.write_eof()
+        deadline = time.monotonic() + LINGER_SECONDS
+        while (remaining := deadline - time.monotonic()) > 0:
+            if not await asyncio.wait_for(reader.read(UPLOAD_CHUNK_SIZE), remaining):
+                break
+
+    async def dispatch(self, reader, writer, method, path, query, headers):
+        """Route a request to its endpoint."""
+        routes = {
+            '/extract': ('POST', self.extract),
+            '/health': ('GET', self.health),
+            '/metrics': ('GET', self.send_metrics),
+        }
+        if path not in routes:
+            raise HTTPError(404, f"No such endpoint: {path}")
+        allowed, handler = routes[path]
+        if method != allowed:
+            raise HTTPError(405, f"{path} only accepts {allowed}", {'Allow': allowed})
+        await handler(reader, writer, query, headers)
+
+    async def send(self, writer, status, body, content_type, headers=None):
+        """Send a complete response."""
+        head = {'Content-Type': content_type, 'Content-Length': len(body),
+                'Connection': 'close'}
+        head.update(headers or {})
+        writer.write(format_head(status, head) + body)
+        await writer.drain()
+
+    async def send_json(self, writer, status, value, headers=None):
+        """Send a JSON response."""
+        await self.send(writer, status, json.dumps(value).encode('utf-8') + b'\n',
+                        'application/json', headers)
+
+    async def health(self, reader, writer, query, headers):
+        """Report whether the server is accepting work and how busy it is."""
+        status = 'stopping' if self._stopping.is_set() else 'ok'
+        await self.send_json(writer, 200 if status == 'ok' else 503, {
+            'status': status,
+            'pid': os.getpid(),
+            'workers': self.workers,
+            'active': self.active,
+            'queued': self.pending - self.active,
+            'capacity': self.capacity,
+        })
+
+    def format_metrics(self):
+        """Format the extraction metrics plus request counts for Prometheus."""
+        text = self.metrics.format_prometheus()
+        counters = self.metrics.counters
+        lines = []
+
+        def metric(name, kind, help_text, value):
+            lines.append(f"# HELP pdf_converter_{name} {help_text}")
+            lines.append(f"# TYPE pdf_converter_{name} {kind}")
+            lines.append(f"pdf_converter_{name} {value}")
+
+        metric('http_requests_total', 'counter', "Extraction requests accepted.",
+               counters.get('http_requests', 0))
+        metric('http_rejected_total', 'counter', "Extraction requests rejected with 429.",
+               counters.get('http_rejected', 0))
+        metric('http_active_requests', 'gauge', "Requests being extracted.", self.active)
+        metric('http_queued_requests', 'gauge', "Requests waiting for a worker.",
+               self.pending - self.active)
+        return text + '\n'.join(lines) + '\n'
+
+    async def send_metrics(self, reader, writer, query, headers):
+        """Serve metrics in the Prometheus text exposition format."""
+        await self.send(writer, 200, self.format_metrics().encode('utf-8'),
+                        'text/plain; version=0.0.4; charset=utf-8')
+
+    async def extract(self, reader, writer, query, headers):
+        """Take a PDF upload and stream its pages back as NDJSON."""
+        if self._stopping.is_set():
+            raise HTTPError(503, "Server is shutting down")
+        if self.pending >= self.capacity:
+            self.metrics.increment('http_rejected')
+            raise HTTPError(429, "Too many requests queued; retry later",
+                            {'Retry-After': RETRY_AFTER_SECONDS})
+
+        self.pending += 1
+        self.metrics.increment('http_requests')
+        self.metrics.record_queue_depth(self.pending - self.active)
+        upload_directory = tempfile.mkdtemp(prefix='pdf_converter-', dir=self.upload_dir)
+        try:
+            filename = get_upload_name(query, headers)
+            path = os.path.join(upload_directory, filename)
+            if headers.get('expect', '').lower() == '100-continue':
+                writer.write(b'HTTP/1.1 100 Continue\r\n\r\n')
+            try:
+                with open(path, 'wb') as f:
+                    async for data in iter_body(reader, headers, self.max_upload_bytes,
+                                                self.read_timeout):
+                        f.write(data)
+            except asyncio.TimeoutError:
+                raise HTTPError(408, "Timed out waiting for the upload")
+
+            is_valid, message = PDFUtilities.sniff_pdf_file(
+                path, sniff_bytes=config.VALIDATION['sniff_bytes'])
+            if not is_valid:
+                raise HTTPError(422, message)
+
+            async with self.slots:
+                self.active += 1
+                try:
+                    await self.stream_pages(writer, path, filename)
+                finally:
+                    self.active -= 1
+        finally:
+            self.pending -= 1
+            shutil.rmtree(upload_directory, ignore_errors=True)
+
+    async def stream_pages(self, writer, path, filename):
+        """Extract a file in the pool and write each page as a chunk as it arrives."""
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        pool = self.pool
+        extractor = ParallelExtractor(executor=pool, max_workers=self.workers,
+                                      deduplicate=False, cache=self.cache,
+                                      metrics=self.metrics)
+        pages = extractor.iter_pages([path])
+
+        async def next_record():
+            # The extractor blocks on the pool, so it is advanced off the event loop
+            try:
+                return await loop.run_in_executor(self.threads, next, pages, None)
+            except BrokenProcessPool:
+                self.replace_pool(pool)
+                raise
+
+        async def write_line(value):
+            data = json.dumps(value).encode('utf-8') + b'\n'
+            writer.write(b'%x\r\n%s\r\n' % (len(data), data))
+            await writer.drain()
+
+        try:
+            try:
+                record = await next_record()
+            except BrokenProcessPool:
+                raise HTTPError(503, "A worker crashed; retry the request")
+            if record is None and extractor.errors:
+                raise HTTPError(422, extractor.errors[0]['message'])
+
+            writer.write(format_head(200, {'Content-Type': 'application/x-ndjson',
+                                           'Transfer-Encoding': 'chunked',
+                                           'Connection': 'close'}))
+            count = 0
+            try:
+                while record is not None:
+                    line = make_page_record(record)
+                    line['file'] = line['filename'] = filename
+                    await write_line(line)
+                    count += 1
+                    record = await next_record()
+            except ConnectionError:
+                raise
+            except Exception as e:
+                # The status line is already sent, so report the failure in the stream
+                await write_line({'error': describe_error(e)})
+            await write_line({'done': True, 'file': filename, 'pages': count,
+                              'failed_pages': len(extractor.errors),
+                              'seconds': time.perf_counter() - started})
+            writer.write(b'0\r\n\r\n')
+            await writer.drain()
+        finally:
+            try:
+                # Stops the scheduler if the client went away mid-stream
+                await loop.run_in_executor(self.threads, pages.close)
+            except ValueError:
+                # Still running in a cancelled next(); it is closed when collected
+                pass
+
+
+def build_parser():
+    """Build the command-line argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Serve PDF text extraction over HTTP on the local machine.")
+    parser.add_argument('--host', help="address to listen on (default: SERVER['host'])")
+    parser.add_argument('-p', '--port', type=int,
+                        help="port to listen on, 0 for any free port "
+                             "(default: SERVER['port'])")
+    parser.add_argument('-j', '--workers', type=int,
+                        help="extraction processes (default: SERVER['workers'])")
+    parser.add_argument('--max-queued', type=int,
+                        help="requests waiting for a worker before new ones get 429 "
+                             "(default: SERVER['max_queued'])")
+    return parser
+
+
+def main(argv=None):
+    """Run the server until it receives SIGTERM or SIGINT."""
+    args = build_parser().parse_args(argv)
+    server = ExtractionServer(args.host, args.port, args.workers, args.max_queued)
+
+    def ready(server):
+        print(f"Listening on http://{server.host}:{server.port} with "
+              f"{server.workers} worker(s)", file=sys.stderr, flush=True)
+
+    try:
+        server.serve_forever(ready)
+    except OSError as e:
+        print(f"Cannot start server: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
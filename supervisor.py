@@ -0,0 +1,288 @@
+"""
+Supervisor Module for PDF to Text Converter
+Extracts pages in watched worker processes that are killed and respawned on hang or crash
+Created by Jaswanth
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+from dedup import get_deduplicator
+from extractor import TextExtractor, describe_error
+from memory_budget import get_memory_budget
+from metrics import NullMetricsRecorder
+from scheduler import PageRangeScheduler
+
+try:
+    import resource
+except ImportError:  # Windows has no rlimits; the memory limit is not enforced there
+    resource = None
+
+
+# Seconds a worker is given to exit cleanly before it is killed
+SHUTDOWN_TIMEOUT = 5
+
+# Workers must not inherit each other's pipes, or a crashed worker's pipe
+# never reports EOF while a sibling holds a copy; forkserver and spawn
+# start every worker with only its own
+_START_METHOD = ('forkserver' if 'forkserver' in multiprocessing.get_all_start_methods()
+                 else 'spawn')
+
+
+class WorkerError(RuntimeError):
+    """A worker could not open a file, timed out or died."""
+
+
+def _apply_memory_limit(memory_limit_mb):
+    """Cap this process's address space so runaway pages raise MemoryError."""
+    if resource is None or not memory_limit_mb:
+        return
+    limit = int(memory_limit_mb * 1024 * 1024)
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _serve(connection, memory_limit_mb, cache_directory, mode=None):
+    """Worker process loop: answer count and page range requests until told to stop.
+
+    Replies are ('count', n), ('page', record) for each page as soon as it is
+    extracted, ('done', None) after a range and ('failed', message) when a
+    file cannot be opened at all. Post-processing is left to the parent.
+    """
+    _apply_memory_limit(memory_limit_mb)
+    cache = None
+    if cache_directory is not None:
+        from cache import PageCache
+        cache = PageCache(cache_directory)
+    extractor = TextExtractor(cache=cache, metrics=NullMetricsRecorder(),
+                              dedup=get_deduplicator(), mode=mode)
+    try:
+        while True:
+            request = connection.recv()
+            if request is None:
+                break
+            try:
+                if request[0] == 'count':
+                    connection.send(('count', extractor.count_pages(request[1])))
+                    continue
+                for record in extractor.iter_file_pages(*request[1:]):
+                    connection.send(('page', record))
+                connection.send(('done', None))
+            except Exception as e:
+                connection.send(('failed', describe_error(e)))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+class WorkerProcess:
+    """One supervised extraction process and its end of the pipe."""
+
+    def __init__(self, memory_limit_mb=None, cache_directory=None, mode=None):
+        self.memory_limit_mb = memory_limit_mb
+        self.cache_directory = cache_directory
+        self.mode = mode
+        self.process = None
+        self.connection = None
+        self.restarts = 0
+
+    def start(self):
+        """Spawn the process."""
+        context = multiprocessing.get_context(_START_METHOD)
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(
+            target=_serve, args=(child_connection, self.memory_limit_mb,
+                                 self.cache_directory, self.mode), daemon=True)
+        self.process.start()
+        child_connection.close()
+
+    def ensure_started(self):
+        """Start the process if it is not running."""
+        if self.process is None or not self.process.is_alive():
+            self.start()
+
+    def send(self, request):
+        """Send a request, respawning first if the process has died."""
+        self.ensure_started()
+        self.connection.send(request)
+
+    def receive(self, timeout):
+        """Get the next reply; returns None on timeout, raises EOFError if the process died."""
+        if not self.connection.poll(timeout):
+            return None
+        return self.connection.recv()
+
+    def kill(self):
+        """Kill the process; the next request starts a fresh one."""
+        if self.process is not None:
+            self.process.kill()
+            self.process.join()
+            self.connection.close()
+            self.process = self.connection = None
+            self.restarts += 1
+
+    def exit_reason(self):
+        """Describe how a dead process ended."""
+        self.process.join(SHUTDOWN_TIMEOUT)
+        code = self.process.exitcode
+        if code is not None and code < 0:
+            return f"Worker process killed by signal {-code}"
+        return f"Worker process exited with code {code}"
+
+    def stop(self):
+        """Ask the process to exit, killing it if it does not."""
+        if self.process is None:
+            return
+        try:
+            self.connection.send(None)
+        except OSError:
+            pass
+        self.process.join(SHUTDOWN_TIMEOUT)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.connection.close()
+        self.process = self.connection = None
+
+
+class SupervisedExtractor(TextExtractor):
+    """Text extractor that isolates every page in a killable worker process.
+
+    A page that exceeds the time limit or crashes its worker (including
+    hitting the memory limit hard enough to die) is replaced by an empty
+    record carrying 'error' and 'error_kind', and is added to self.errors;
+    the worker is respawned and extraction continues with the next page.
+    """
+
+    def __init__(self, max_workers=1, page_timeout=None, memory_limit_mb=None,
+                 pages_per_task=None, **kwargs):
+        super().__init__(**kwargs)
+        supervision = config.SUPERVISION
+        self.max_workers = max(1, max_workers or 1)
+        self.page_timeout = page_timeout or supervision.get('page_timeout')
+        self.memory_limit_mb = (supervision.get('memory_limit_mb')
+                                if memory_limit_mb is None else memory_limit_mb)
+        self.pages_per_task = max(1, pages_per_task
+                                  or config.PERFORMANCE.get('pages_per_task', 8))
+        self._local = threading.local()
+        self._workers = []
+        self._workers_lock = threading.Lock()
+
+    def _get_worker(self):
+        """Get the worker process owned by the calling thread."""
+        worker = getattr(self._local, 'worker', None)
+        if worker is None:
+            cache_directory = self.cache.directory if self.cache is not None else None
+            worker = self._local.worker = WorkerProcess(self.memory_limit_mb,
+                                                        cache_directory, self.mode)
+            with self._workers_lock:
+                self._workers.append(worker)
+        return worker
+
+    def close(self):
+        """Stop every worker process."""
+        with self._workers_lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.stop()
+        self._local = threading.local()
+
+    def count_pages(self, pdf_file):
+        """Get the number of pages in a file, opening it in a worker process."""
+        if pdf_file in self.page_counts:
+            return self.page_counts[pdf_file]
+        worker = self._get_worker()
+        worker.send(('count', pdf_file))
+        try:
+            reply = worker.receive(self.page_timeout)
+        except EOFError:
+            reason = worker.exit_reason()
+            worker.kill()
+            raise WorkerError(f"{reason} while opening the file")
+        if reply is None:
+            worker.kill()
+            raise WorkerError(f"Opening took longer than {self.page_timeout} seconds")
+        if reply[0] == 'failed':
+            raise WorkerError(reply[1])
+        self.page_counts[pdf_file] = reply[1]
+        return reply[1]
+
+    def _try_count_pages(self, pdf_file):
+        """Count pages, recording a whole-file error and returning 0 on failure."""
+        try:
+            return self.count_pages(pdf_file)
+        except WorkerError as e:
+            self.record_error(pdf_file, None, 'error', str(e))
+        except Exception as e:
+            self.record_error(pdf_file, None, 'error', describe_error(e))
+        return 0
+
+    def extract_range(self, pdf_file, file_index, start, stop, num_pages):
+        """Extract pages [start, stop) under supervision; returns their records in order."""
+        worker = self._get_worker()
+        records = []
+        page_index = start
+        while page_index < stop:
+            worker.send(('pages', pdf_file, file_index, page_index, stop))
+            while True:
+                try:
+                    reply = worker.receive(self.page_timeout)
+                except EOFError:
+                    kind, message = 'crash', worker.exit_reason()
+                    reply = None
+                else:
+                    kind = 'timeout'
+                    message = f"Page took longer than {self.page_timeout} seconds"
+                if reply is None:
+                    # The worker is hung or gone: write the page off, respawn
+                    # and carry on from the next page
+                    worker.kill()
+                    records.append(self.make_failed_record(
+                        pdf_file, file_index, page_index + 1, num_pages, kind, message))
+                    page_index += 1
+                    break
+
+                tag, value = reply
+                if tag == 'page':
+                    records.append(value)
+                    page_index += 1
+                    continue
+                message = value if tag == 'failed' else "Page not found"
+                for index in range(page_index, stop):
+                    records.append(self.make_failed_record(
+                        pdf_file, file_index, index + 1, num_pages, 'error', message))
+                page_index = stop
+                break
+        return records
+
+    def iter_extracted_pages(self, files):
+        """Yield page records for all files in order, isolating every page."""
+        files = list(files)
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                page_counts = list(executor.map(self._try_count_pages, files))
+                scheduler = PageRangeScheduler(page_counts, self.max_workers,
+                                               self.pages_per_task,
+                                               config.PERFORMANCE.get('max_buffered_pages'),
+                                               get_memory_budget())
+
+                def submit(file_index, start, stop):
+                    return executor.submit(self.extract_range, files[file_index], file_index,
+                                           start, stop, page_counts[file_index])
+
+                for records in scheduler.run(submit):
+                    yield from self._record_results(records)
+        finally:
+            self.close()
+
+    def _record_results(self, records):
+        """Record metrics and errors for records from a worker, then yield them."""
+        for record in records:
+            self.record_page(record)
+            yield record
@@ -0,0 +1,68 @@
+"""
+Test helpers for PDF to Text Converter
+Puts the modules on the import path and builds small PDFs for the tests
+Created by Jaswanth
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FONT = b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+
+
+def make_stream(data, entries=b""):
+    """Build a stream object body."""
+    return (b"<< " + entries + b" /Length %d >>\nstream\n" % len(data)
+            + data + b"\nendstream")
+
+
+def make_text_stream(lines):
+    """Build a content stream that shows each line of text below the last."""
+    parts = [b"BT /F1 10 Tf 12 TL 50 760 Td"]
+    for line in lines:
+        escaped = line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+        parts.append(b"(" + escaped.encode('latin-1') + b") Tj T*")
+    parts.append(b"ET")
+    return b"\n".join(parts)
+
+
+def write_pdf(path, pages, extra_objects=()):
+    """Write a PDF; pages are (content stream, resources) pairs.
+
+    Object 3 is a Helvetica font and extra objects are numbered from 4, so
+    resources can refer to them; page objects follow.
+    """
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, FONT]
+    objects.extend(extra_objects)
+    kids = []
+    for stream, resources in pages:
+        number = len(objects) + 1
+        kids.append(b"%d 0 R" % number)
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources " + resources + b" /Contents %d 0 R >>" % (number + 1))
+        objects.append(make_stream(stream))
+    objects[1] = (b"<< /Type /Pages /Kids [" + b" ".join(kids)
+                  + b"] /Count %d >>" % len(pages))
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += (b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+               % (len(objects) + 1, xref_offset))
+    with open(path, 'wb') as f:
+        f.write(output)
+    return path
+
+
+def write_text_pdf(path, pages):
+    """Write a PDF with one page per list of text lines."""
+    return write_pdf(path, [(make_text_stream(lines), b"<< /Font << /F1 3 0 R >> >>")
+                            for lines in pages])
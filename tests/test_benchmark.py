@@ -0,0 +1,24 @@
+"""
+Tests for the Benchmark Module
+"""
+
+import os
+
+import benchmark
+from benchmark import CorpusGenerator
+
+
+def test_regenerating_keeps_unrelated_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(benchmark, 'CORPUS_PROFILES', {'small': (2, 1, 'text')})
+    first = CorpusGenerator(str(tmp_path), seed=1).generate()
+    user_file = tmp_path / 'notes.txt'
+    user_file.write_text('keep me')
+    stray_pdf = tmp_path / 'small' / 'mine.pdf'
+    stray_pdf.write_bytes(b'%PDF-1.4')
+
+    second = CorpusGenerator(str(tmp_path), seed=2, scale=0.5).generate()
+    assert user_file.read_text() == 'keep me'
+    assert stray_pdf.exists()
+    assert first['small'][1] not in second['small']
+    assert not os.path.exists(first['small'][1])
+    assert all(os.path.exists(path) for path in second['small'])
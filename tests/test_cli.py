@@ -0,0 +1,32 @@
+"""
+Tests for the Command-Line Module
+"""
+
+import os
+
+from cli import convert_file
+from conftest import write_text_pdf
+from search_index import InvertedIndex, get_index_path
+
+
+def test_convert_file_saves_search_index(tmp_path):
+    path = str(write_text_pdf(tmp_path / 'terms.pdf', [['Payment terms'],
+                                                       ['Termination notice']]))
+    output_path = str(tmp_path / 'out' / 'terms.txt')
+    result = convert_file(path, output_path, search_index=True)
+
+    index_path = get_index_path(output_path)
+    assert os.path.abspath(index_path) in result['files']
+    index = InvertedIndex.load(index_path)
+    try:
+        assert index.search('termination') == [
+            {'file_index': 0, 'filename': 'terms.pdf', 'page_num': 2}]
+    finally:
+        index.close()
+
+
+def test_convert_file_skips_search_index_by_default(tmp_path):
+    path = str(write_text_pdf(tmp_path / 'terms.pdf', [['Payment terms']]))
+    output_path = str(tmp_path / 'terms.txt')
+    convert_file(path, output_path)
+    assert not os.path.exists(get_index_path(output_path))
@@ -0,0 +1,80 @@
+"""
+Tests for the Deduplication Module
+"""
+
+import PyPDF2
+
+from conftest import make_stream, make_text_stream, write_pdf, write_text_pdf
+from dedup import PageDeduplicator, get_page_fingerprint
+from extractor import TextExtractor
+
+WORDS = ("the supplier shall deliver all goods described in schedule one to the "
+         "customer premises within thirty days of the order date and shall bear "
+         "every cost of transport insurance and packaging until delivery is "
+         "accepted in writing by an authorised representative of the customer").split()
+
+
+def extract(path, dedup):
+    extractor = TextExtractor(add_page_numbers=False, add_file_headers=False, dedup=dedup)
+    return list(extractor.iter_pages([path]))
+
+
+def test_exact_duplicate_pages_become_references(tmp_path):
+    path = write_text_pdf(tmp_path / 'terms.pdf',
+                          [['Terms and conditions'], ['Cover letter'],
+                           ['Terms and conditions']])
+    records = extract(path, PageDeduplicator(near_duplicates=False))
+
+    texts = [record['text'].strip() for record in records[:2]]
+    assert texts == ['Terms and conditions', 'Cover letter']
+    assert records[2]['duplicate_kind'] == 'exact'
+    assert records[2]['duplicate_of']['page_num'] == 1
+    assert 'duplicate_of' not in records[1]
+
+
+def test_near_duplicate_found_above_threshold():
+    dedup = PageDeduplicator(near_duplicates=True, near_threshold=0.8, num_bins=64,
+                             shingle_words=3)
+    original = ' '.join(WORDS)
+    match, signature = dedup.find_near(original)
+    assert match is None
+    dedup.add_near(signature, {'file': 'a.pdf', 'filename': 'a.pdf', 'page_num': 1})
+
+    # One word changed near the end of a long page
+    edited = ' '.join(WORDS[:-2] + ['the', 'buyer'])
+    match, _ = dedup.find_near(edited)
+    assert match is not None
+    reference, similarity = match
+    assert reference['page_num'] == 1 and similarity >= 0.8
+
+    match, _ = dedup.find_near(' '.join(reversed(WORDS)))
+    assert match is None
+
+
+def write_form_pdf(path, texts):
+    """Pages that only draw a form XObject, each form showing different text."""
+    forms = [make_stream(make_text_stream([text]),
+                         b"/Type /XObject /Subtype /Form /BBox [0 0 612 792] "
+                         b"/Resources << /Font << /F1 3 0 R >> >>")
+             for text in texts]
+    pages = [(b"q /Fm0 Do Q", b"<< /XObject << /Fm0 %d 0 R >> >>" % (4 + index))
+             for index in range(len(texts))]
+    return write_pdf(path, pages, forms)
+
+
+def test_fingerprint_covers_form_xobjects(tmp_path):
+    path = write_form_pdf(tmp_path / 'forms.pdf', ['First form', 'Second form',
+                                                   'Third form'])
+    pages = PyPDF2.PdfReader(str(path)).pages
+    assert len({get_page_fingerprint(page) for page in pages}) == 3
+
+    records = extract(path, PageDeduplicator(near_duplicates=False))
+    texts = [record['text'].strip() for record in records]
+    assert texts == ['First form', 'Second form', 'Third form']
+    assert not any('duplicate_of' in record for record in records)
+
+
+def test_identical_form_pages_are_duplicates(tmp_path):
+    path = write_form_pdf(tmp_path / 'forms.pdf', ['Same form', 'Same form'])
+    pages = PyPDF2.PdfReader(str(path)).pages
+    assert get_page_fingerprint(pages[0]) == get_page_fingerprint(pages[1])
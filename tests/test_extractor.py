@@ -0,0 +1,26 @@
+"""
+Tests for the Text Extractor Module
+"""
+
+from cache import PageCache
+from conftest import write_text_pdf
+from dedup import PageDeduplicator
+from extractor import TextExtractor
+
+
+def test_pages_after_a_duplicate_are_cached(tmp_path):
+    path = str(write_text_pdf(tmp_path / 'doc.pdf', [['Cover'], ['Cover'], ['Second'],
+                                                     ['Third']]))
+    cache = PageCache(str(tmp_path / 'cache'))
+    extractor = TextExtractor(cache=cache, dedup=PageDeduplicator(near_duplicates=False))
+    records = list(extractor.iter_file_pages(path))
+    assert records[1]['duplicate_kind'] == 'exact'
+
+    digest = cache.get_digest(path)
+    assert cache.get_pages(digest, extractor.version, 0, 1)[1] == [records[0]['text']]
+    assert cache.get_pages(digest, extractor.version, 2, 4)[1] == [records[2]['text'],
+                                                                   records[3]['text']]
+    # The duplicate itself is not cached, so the whole file is extracted again
+    assert cache.get_pages(digest, extractor.version, 1, 2) is None
+    assert cache.get_pages(digest, extractor.version) is None
+    cache.close()
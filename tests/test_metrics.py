@@ -0,0 +1,32 @@
+"""
+Tests for the Metrics Module
+"""
+
+import sys
+import threading
+
+from metrics import MetricsRecorder
+
+
+def test_no_samples_lost_across_threads():
+    metrics = MetricsRecorder(flush_pages=7, per_file=False)
+    threads_count, pages = 8, 2000
+
+    def record_pages(thread):
+        for page in range(pages):
+            metrics.record_page({'file': f'{thread}.pdf', 'page_num': page + 2,
+                                 'extract_time': 0.001, 'text': 'x'})
+
+    threads = [threading.Thread(target=record_pages, args=(thread,))
+               for thread in range(threads_count)]
+    # Switch threads as often as possible to expose an unlocked buffer handoff
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert metrics.summary()['counters']['pages'] == threads_count * pages
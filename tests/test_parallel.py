@@ -0,0 +1,23 @@
+"""
+Tests for the Parallel Extraction Module
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import fast_text
+from conftest import write_text_pdf
+from parallel import ParallelExtractor
+
+
+def test_workers_use_the_extraction_mode(tmp_path, monkeypatch):
+    path = write_text_pdf(tmp_path / 'doc.pdf', [['First page'], ['Second page']])
+    monkeypatch.setattr(fast_text.FastTextExtractor, 'extract_text',
+                        lambda self, page: 'from the fast path')
+
+    # Threads run the worker functions in this process, where the fast path is patched
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        extractor = ParallelExtractor(max_workers=2, executor=executor, mode='fast',
+                                      add_page_numbers=False, add_file_headers=False,
+                                      deduplicate=False)
+        texts = [record['text'] for record in extractor.iter_pages([str(path)])]
+    assert texts == ['from the fast path'] * 2
@@ -0,0 +1,104 @@
+"""
+Tests for the Post-Processing Module
+"""
+
+import pytest
+
+from metrics import MetricsRecorder
+from postprocess import (TextPipeline, collapse_whitespace, dehyphenate,
+                         normalize_line_endings, normalize_unicode, strip_headers_footers)
+
+
+def make_pages(texts, file_index=0):
+    return [{'file_index': file_index, 'page_num': number, 'text': text}
+            for number, text in enumerate(texts, 1)]
+
+
+def run(stage, texts, **kwargs):
+    return [record['text'] for record in stage(make_pages(texts), **kwargs)]
+
+
+def strip(texts):
+    return run(strip_headers_footers, texts, lines=2, window=8, min_repeats=3)
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('exam-\nple\nnext line', 'example\nnext line'),
+    ('exam-\nple', 'example'),
+    ('para-\ngraph\n\nNew', 'paragraph\n\nNew'),
+    ('exam-\n   ple rest of line', 'example rest of line'),
+    ('soft\u00ad\nware', 'software'),
+    ('well-\nKnown', 'well-\nKnown'),
+    ('ends with a dash -\nnext', 'ends with a dash -\nnext'),
+])
+def test_dehyphenate(text, expected):
+    assert run(dehyphenate, [text]) == [expected]
+
+
+def test_line_endings():
+    assert run(normalize_line_endings, ['a\r\nb\rc\n']) == ['a\nb\nc\n']
+
+
+def test_whitespace_preserved_keeps_indentation():
+    assert run(collapse_whitespace, ['  a  b  \n\n\n\nc\t'],
+               preserve=True) == ['  a  b\n\n\n\nc']
+
+
+def test_whitespace_collapsed():
+    assert run(collapse_whitespace, ['  a  b  \n\n\n\nc\t'], preserve=False) == ['a b\n\nc']
+
+
+def test_unicode_unfolds_ligatures():
+    assert run(normalize_unicode, ['\ufb01nal', 'plain'], form='NFKC') == ['final', 'plain']
+
+
+def body(number):
+    return [f"Body line {number}.{line} about something else" for line in range(4)]
+
+
+def test_running_headers_and_page_numbers_are_stripped():
+    texts = ['\n'.join(["Annual Report Chapter 3", *body(number), f"Page {number}"])
+             for number in range(1, 9)]
+    assert strip(texts) == ['\n'.join(body(number)) for number in range(1, 9)]
+
+
+def test_running_title_with_trailing_page_number_is_stripped():
+    texts = ['\n'.join([f"Chapter 4: Function reference {number + 9}", *body(number)])
+             for number in range(1, 9)]
+    assert strip(texts) == ['\n'.join(body(number)) for number in range(1, 9)]
+
+
+def test_numbered_headings_are_kept():
+    texts = ['\n'.join([f"Article {number}", *body(number)]) for number in range(1, 9)]
+    assert strip(texts) == texts
+
+
+def test_short_pages_are_never_stripped():
+    four_lines = ['\n'.join(["Header", f"Line {number}", f"More {number}", "Footer"])
+                  for number in range(20)]
+    assert strip(four_lines) == four_lines
+    two_lines = ['Same title\nSame footer'] * 5
+    assert strip(two_lines) == two_lines
+
+
+def test_headers_do_not_carry_over_between_files():
+    first = make_pages(['\n'.join(["Shared header", *body(number)]) for number in range(2)])
+    second = make_pages(['\n'.join(["Shared header", *body(number)]) for number in range(2)],
+                        file_index=1)
+    records = list(strip_headers_footers(first + second, lines=2, window=8, min_repeats=3))
+    assert all(record['text'].startswith("Shared header") for record in records)
+
+
+def test_pipeline_records_time_per_stage():
+    metrics = MetricsRecorder()
+    pipeline = TextPipeline(['line_endings', 'dehyphenate'])
+    texts = [record['text'] for record in pipeline.process(make_pages(['exam-\r\nple']),
+                                                           metrics)]
+    assert texts == ['example']
+    assert set(pipeline.stage_seconds) == {'line_endings', 'dehyphenate'}
+    assert set(metrics.summary()['postprocess_seconds']) == {'line_endings', 'dehyphenate'}
+
+
+def test_pipeline_rejects_unknown_stage():
+    with pytest.raises(ValueError):
+        TextPipeline(['spellcheck'])
@@ -0,0 +1,56 @@
+"""
+Tests for the Utility Functions Module
+"""
+
+import random
+
+import pytest
+
+from utils import TextStatistics, TextUtilities
+
+
+def whole_text_statistics(text):
+    """The original whole-text definition the streamed statistics must match."""
+    return {
+        'characters': len(text),
+        'words': len(text.split()),
+        'lines': len(text.split('\n')),
+        'paragraphs': len([p for p in text.split('\n\n') if p.strip()]),
+    }
+
+
+def random_text(rng, length):
+    return ''.join(rng.choice('ab \n\n\t\r') for _ in range(length))
+
+
+def split_randomly(rng, text):
+    cuts = sorted(rng.randrange(len(text) + 1) for _ in range(rng.randrange(6)))
+    return [text[start:stop] for start, stop in zip([0] + cuts, cuts + [len(text)])]
+
+
+@pytest.mark.parametrize('text', ['', '\n', '\n\n\n', 'a', ' a ', 'a\n\nb', '\n\na\n\n',
+                                  'a\n \nb', 'a\n\n\n\nb\n', '  \n\n  ', 'word'])
+def test_statistics_of_edge_cases(text):
+    assert TextUtilities.get_text_statistics(text) == whole_text_statistics(text)
+    for chunk_size in (1, 2, 3):
+        assert (TextUtilities.get_text_statistics(text, chunk_size)
+                == whole_text_statistics(text))
+
+
+def test_streamed_statistics_match_whole_text():
+    rng = random.Random(12)
+    for _ in range(2000):
+        text = random_text(rng, rng.randrange(40))
+        expected = whole_text_statistics(text)
+        assert TextUtilities.get_text_statistics(text, rng.randrange(1, 8)) == expected
+        assert TextUtilities.get_pages_statistics(split_randomly(rng, text)) == expected
+
+
+def test_merged_statistics_match_whole_text():
+    rng = random.Random(7)
+    for _ in range(500):
+        chunks = [random_text(rng, rng.randrange(15)) for _ in range(rng.randrange(1, 5))]
+        stats = TextStatistics()
+        for chunk in chunks:
+            stats.merge(TextStatistics.from_text(chunk))
+        assert stats.as_dict() == whole_text_statistics(''.join(chunks))
@@ -0,0 +1,41 @@
+"""
+Tests for the Background Worker Module
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import parallel
+from conftest import write_text_pdf
+from parallel import ParallelExtractor
+from worker import ExtractionWorker
+
+
+def test_drain_takes_at_most_max_events():
+    worker = ExtractionWorker(None, [])
+    for number in range(5):
+        worker.events.put(('page', number))
+    assert [value for _, value in worker.drain(3)] == [0, 1, 2]
+    assert [value for _, value in worker.drain(3)] == [3, 4]
+    assert worker.drain(3) == []
+
+
+def test_files_are_counted_once(tmp_path, monkeypatch):
+    files = [str(write_text_pdf(tmp_path / f'{name}.pdf', [['One'], ['Two']]))
+             for name in ('a', 'b')]
+    counted = []
+
+    def count_pages(pdf_file, *args):
+        counted.append(pdf_file)
+        return 2
+    monkeypatch.setattr(parallel, '_count_pages', count_pages)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        extractor = ParallelExtractor(max_workers=2, executor=executor, pipeline=[])
+        worker = ExtractionWorker(extractor, files)
+        worker.start()
+        worker.join(30)
+    events = worker.drain()
+    assert events[0] == ('total', 4)
+    assert sum(event == 'page' for event, _ in events) == 4
+    assert events[-1] == ('done', False)
+    assert counted == []
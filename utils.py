@@ -4,11 +4,20 @@ Provides helper functions for the application
 Created by Jaswanth
 """
 
+import hashlib
 import os
+import re
+import stat
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
 
+# Characters of a long text handed to TextStatistics at a time
+STATISTICS_CHUNK_SIZE = 64 * 1024
+
+
 class FileUtilities:
     """Utility class for file operations."""
     
@@ -26,6 +35,21 @@ class FileUtilities:
         except Exception:
             return 0
     
+    @staticmethod
+    def get_file_signature(filepath):
+        """Get (size_bytes, mtime_ns) from a single stat call."""
+        file_stat = os.stat(filepath)
+        return file_stat.st_size, file_stat.st_mtime_ns
+    
+    @staticmethod
+    def hash_file(filepath, chunk_size=1024 * 1024):
+        """Get SHA-256 hex digest of file contents."""
+        digest = hashlib.sha256()
+        with open(filepath, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
     @staticmethod
     def get_file_extension(filepath):
         """Get file extension."""
@@ -75,15 +99,22 @@ class TextUtilities:
         return len(text.split('\n'))
     
     @staticmethod
-    def get_text_statistics(text):
-        """Get comprehensive text statistics."""
-        stats = {
-            'characters': len(text),
-            'words': TextUtilities.count_words(text),
-            'lines': TextUtilities.count_lines(text),
-            'paragraphs': len([p for p in text.split('\n\n') if p.strip()]),
-        }
-        return stats
+    def get_text_statistics(text, chunk_size=STATISTICS_CHUNK_SIZE):
+        """Get comprehensive text statistics.
+        
+        The text is read in slices of chunk_size characters, so working
+        memory stays bounded however long the document is.
+        """
+        return TextUtilities.get_pages_statistics(
+            text[start:start + chunk_size] for start in range(0, len(text), chunk_size))
+    
+    @staticmethod
+    def get_pages_statistics(chunks):
+        """Get text statistics over an iterable of text chunks, one chunk at a time."""
+        stats = TextStatistics()
+        for chunk in chunks:
+            stats.update(chunk)
+        return stats.as_dict()
     
     @staticmethod
     def remove_extra_whitespace(text):
@@ -96,6 +127,134 @@ class TextUtilities:
         return text.replace('\r\n', '\n').replace('\r', '\n')
 
 
+class TextStatistics:
+    """One-pass statistics accumulator that can be updated per page and merged.
+    
+    Results do not depend on where the text is split into chunks: they
+    equal the whole-text counts of characters, len(text.split()),
+    len(text.split('\n')) and the non-blank pieces of text.split('\n\n').
+    """
+    
+    # Paragraphs are the pieces of text.split('\n\n') that are not blank;
+    # a run of two or more newlines separates them however long it is
+    PARAGRAPH_BREAK = re.compile(r'\n{2,}')
+    
+    def __init__(self, text=""):
+        self.characters = 0
+        self.words = 0
+        self.newlines = 0
+        self.starts_in_word = False
+        self.ends_in_word = False
+        # Paragraph state: leading/trailing newline runs, and the pieces
+        # between separators (count, first/last non-blank, non-blank total)
+        self.leading_newlines = 0
+        self.trailing_newlines = 0
+        self.pieces = 0
+        self.first_piece_has_text = False
+        self.last_piece_has_text = False
+        self.pieces_with_text = 0
+        if text:
+            self.update(text)
+    
+    @classmethod
+    def from_text(cls, text):
+        """Compute statistics for a single chunk of text."""
+        stats = cls()
+        if not text:
+            return stats
+        stats.characters = len(text)
+        stats.words = len(text.split())
+        stats.newlines = text.count('\n')
+        stats.starts_in_word = not text[0].isspace()
+        stats.ends_in_word = not text[-1].isspace()
+        
+        if stats.newlines == len(text):
+            stats.leading_newlines = len(text)
+            return stats
+        core = text.strip('\n')
+        stats.leading_newlines = len(text) - len(text.lstrip('\n'))
+        stats.trailing_newlines = len(text) - len(text.rstrip('\n'))
+        
+        first = last = None
+        for piece in cls.PARAGRAPH_BREAK.split(core):
+            has_text = bool(piece) and not piece.isspace()
+            if first is None:
+                first = has_text
+            last = has_text
+            stats.pieces += 1
+            stats.pieces_with_text += has_text
+        stats.first_piece_has_text = first
+        stats.last_piece_has_text = last
+        return stats
+    
+    def update(self, text):
+        """Add the next chunk of text."""
+        return self.merge(TextStatistics.from_text(text))
+    
+    def merge(self, other):
+        """Append statistics of text that directly follows this text."""
+        if other.characters == 0:
+            return self
+        if self.characters == 0:
+            self.__dict__.update(other.__dict__)
+            return self
+        
+        self.words += other.words
+        if self.ends_in_word and other.starts_in_word:
+            self.words -= 1
+        self.ends_in_word = other.ends_in_word
+        
+        if self.pieces == 0:
+            # This text is only newlines; they extend the other's leading run
+            leading = self.newlines + other.leading_newlines
+            self.__dict__.update({key: value for key, value in other.__dict__.items()
+                                  if key not in ('characters', 'words', 'newlines',
+                                                 'starts_in_word', 'ends_in_word')})
+            self.leading_newlines = leading
+        elif other.pieces == 0:
+            self.trailing_newlines += other.newlines
+        else:
+            if self.trailing_newlines + other.leading_newlines >= 2:
+                self.pieces += other.pieces
+                self.pieces_with_text += other.pieces_with_text
+                self.last_piece_has_text = other.last_piece_has_text
+            else:
+                # The last piece here and the first piece there are one piece
+                joined = self.last_piece_has_text or other.first_piece_has_text
+                if self.pieces == 1:
+                    self.first_piece_has_text = joined
+                self.pieces_with_text += (other.pieces_with_text + joined
+                                          - self.last_piece_has_text
+                                          - other.first_piece_has_text)
+                self.pieces += other.pieces - 1
+                self.last_piece_has_text = (other.last_piece_has_text
+                                            if other.pieces > 1 else joined)
+            self.trailing_newlines = other.trailing_newlines
+        
+        self.characters += other.characters
+        self.newlines += other.newlines
+        return self
+    
+    @property
+    def lines(self):
+        """Number of lines, as len(text.split('\n'))."""
+        return self.newlines + 1
+    
+    @property
+    def paragraphs(self):
+        """Number of non-blank pieces of text.split('\n\n')."""
+        return self.pieces_with_text
+    
+    def as_dict(self):
+        """Get statistics in the format of TextUtilities.get_text_statistics."""
+        return {
+            'characters': self.characters,
+            'words': self.words,
+            'lines': self.lines,
+            'paragraphs': self.paragraphs,
+        }
+
+
 class PDFUtilities:
     """Utility class for PDF operations."""
     
@@ -113,6 +272,41 @@ class PDFUtilities:
         
         return True, "Valid PDF file"
     
+    @staticmethod
+    def sniff_pdf_file(filepath, max_size_mb=None, sniff_bytes=4096):
+        """Validate a PDF with one stat and small reads of its head and tail."""
+        if not FileUtilities.is_valid_pdf(filepath):
+            return False, "File is not a PDF"
+        
+        try:
+            with open(filepath, 'rb', buffering=0) as f:
+                info = os.fstat(f.fileno())
+                if not stat.S_ISREG(info.st_mode):
+                    return False, "Not a regular file"
+                size = info.st_size
+                if size == 0:
+                    return False, "PDF file is empty"
+                if max_size_mb and size > max_size_mb * 1024 * 1024:
+                    return False, f"Larger than {max_size_mb} MB"
+                
+                # The header may follow a little junk; the trailer ends the file
+                head = f.read(min(sniff_bytes, size))
+                if b'%PDF-' not in head:
+                    return False, "Missing %PDF- header"
+                if size > len(head):
+                    f.seek(max(size - sniff_bytes, len(head)))
+                    tail = head[-16:] + f.read()
+                else:
+                    tail = head
+                if b'%%EOF' not in tail and b'startxref' not in tail:
+                    return False, "Missing %%EOF trailer (truncated file?)"
+        except FileNotFoundError:
+            return False, "File not found"
+        except OSError as e:
+            return False, f"Cannot read file: {e.strerror or e}"
+        
+        return True, "Valid PDF file"
+    
     @staticmethod
     def get_pdf_info(filepath):
         """Get PDF file information."""
@@ -152,17 +346,43 @@ class ValidationUtilities:
         if not files:
             return False, "No files selected"
         
-        valid_files = []
-        for file in files:
-            is_valid, msg = PDFUtilities.validate_pdf_file(file)
-            if is_valid:
-                valid_files.append(file)
+        valid_files = [file for file, is_valid, msg
+                       in ValidationUtilities.iter_validated_files(files) if is_valid]
         
         if not valid_files:
             return False, "No valid PDF files found"
         
         return True, f"{len(valid_files)} valid file(s)"
     
+    @staticmethod
+    def iter_validated_files(items, key=None, max_size_mb=None, sniff_bytes=4096,
+                             max_workers=32):
+        """Yield (item, is_valid, message) in order, sniffing files on a thread pool.
+        
+        key maps an item to its path (default: the item is the path). Only a
+        bounded window of items is in flight, so huge inputs stream.
+        """
+        window = max_workers * 4
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = deque()
+            for item in items:
+                path = key(item) if key is not None else item
+                pending.append((item, executor.submit(PDFUtilities.sniff_pdf_file, path,
+                                                      max_size_mb, sniff_bytes)))
+                if len(pending) >= window:
+                    item, future = pending.popleft()
+                    yield (item,) + future.result()
+            while pending:
+                item, future = pending.popleft()
+                yield (item,) + future.result()
+    
+    @staticmethod
+    def validate_files(files, max_size_mb=None, sniff_bytes=4096, max_workers=32):
+        """Validate many files concurrently; returns a list of (file, is_valid, message)."""
+        return list(ValidationUtilities.iter_validated_files(
+            files, max_size_mb=max_size_mb, sniff_bytes=sniff_bytes,
+            max_workers=max_workers))
+    
     @staticmethod
     def validate_save_path(path):
         """Validate save path."""
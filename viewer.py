@@ -0,0 +1,282 @@
+"""
+Text Viewer Module for PDF to Text Converter
+Virtualized viewer that keeps only a small window of pages in the Tk widget
+Created by Jaswanth
+"""
+
+import re
+import tkinter as tk
+from tkinter import ttk
+
+import config
+
+
+class PagedTextViewer(tk.Frame):
+    """Text widget showing a sliding window of pages fetched from a page store."""
+
+    def __init__(self, master, window_pages=None, **text_options):
+        super().__init__(master, bg=text_options.get('bg', "white"))
+        self.window_pages = max(2, window_pages or config.TEXT_DISPLAY_WINDOW_PAGES)
+        self.store = None
+        self.first = 0
+        self.last = 0
+        self._combo_files = []
+        self._current_file = None
+        self._check_pending = False
+        self._highlight_pattern = None
+
+        # Navigation bar
+        nav_frame = tk.Frame(self, bg="#f0f0f0")
+        nav_frame.pack(fill=tk.X, pady=(0, 5))
+
+        tk.Label(nav_frame, text="File:", bg="#f0f0f0", fg="#2c3e50",
+                 font=("Arial", 9)).pack(side=tk.LEFT)
+        self.file_var = tk.StringVar()
+        self.file_combo = ttk.Combobox(nav_frame, textvariable=self.file_var,
+                                       state="readonly", width=40)
+        self.file_combo.pack(side=tk.LEFT, padx=5)
+        self.file_combo.bind("<<ComboboxSelected>>", self._on_file_selected)
+
+        tk.Label(nav_frame, text="Page:", bg="#f0f0f0", fg="#2c3e50",
+                 font=("Arial", 9)).pack(side=tk.LEFT)
+        self.page_var = tk.StringVar()
+        self.page_entry = tk.Entry(nav_frame, textvariable=self.page_var, width=7)
+        self.page_entry.pack(side=tk.LEFT, padx=5)
+        self.page_entry.bind("<Return>", self._on_page_entered)
+
+        tk.Button(nav_frame, text="Go", command=self._on_page_entered,
+                  font=("Arial", 9)).pack(side=tk.LEFT)
+        tk.Button(nav_frame, text="<", command=self.previous_page,
+                  font=("Arial", 9)).pack(side=tk.LEFT, padx=(10, 0))
+        tk.Button(nav_frame, text=">", command=self.next_page,
+                  font=("Arial", 9)).pack(side=tk.LEFT)
+
+        self.position_label = tk.Label(nav_frame, text="", bg="#f0f0f0", fg="#2c3e50",
+                                       font=("Arial", 9), anchor="e")
+        self.position_label.pack(side=tk.RIGHT)
+
+        # Text area
+        text_frame = tk.Frame(self)
+        text_frame.pack(fill=tk.BOTH, expand=True)
+        self.text = tk.Text(text_frame, **text_options)
+        self.scrollbar = ttk.Scrollbar(text_frame, orient=tk.VERTICAL,
+                                       command=self.text.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.text.config(yscrollcommand=self._on_scroll)
+        self.text.tag_config("search_hit", background="#f9e79f")
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def set_store(self, store):
+        """Show pages from a new page store, starting at the first page."""
+        self.store = store
+        self._reset_window()
+        self.refresh()
+
+    def clear(self):
+        """Remove all pages and forget the store."""
+        self.store = None
+        self._reset_window()
+        self._highlight_pattern = None
+        self._combo_files = []
+        self._current_file = None
+        self.file_combo.config(values=())
+        self.file_var.set("")
+        self.page_var.set("")
+        self.position_label.config(text="")
+
+    def refresh(self):
+        """Pick up pages added to the store since the last refresh."""
+        if self.store is None:
+            return
+        if len(self._combo_files) != len(self.store.filenames):
+            self._combo_files = [file_index for file_index, name
+                                 in enumerate(self.store.filenames) if name is not None]
+            self.file_combo.config(values=[self.store.filenames[file_index]
+                                           for file_index in self._combo_files])
+        while self.last < len(self.store) and self.last - self.first < self.window_pages:
+            self._append_page()
+        self._update_position()
+
+    def show_page(self, index):
+        """Jump to a page position in the store."""
+        if self.store is None or not len(self.store):
+            return
+        index = max(0, min(index, len(self.store) - 1))
+        if not self.first <= index < self.last:
+            self._reset_window(index)
+            while self.last < len(self.store) and self.last - self.first < self.window_pages:
+                self._append_page()
+        self.text.yview(f"page{index}")
+        self._update_position()
+
+    def show_file_page(self, file_index, page_num=1):
+        """Jump to a page of a file; returns False if it is not in the store."""
+        if self.store is None:
+            return False
+        index = self.store.find_page(file_index, page_num)
+        if index is None:
+            return False
+        self.show_page(index)
+        return True
+
+    def highlight(self, terms):
+        """Highlight whole-word, case-insensitive occurrences of terms in loaded pages."""
+        self.text.tag_remove("search_hit", "1.0", tk.END)
+        terms = [term for term in terms if term]
+        if not terms:
+            self._highlight_pattern = None
+            return
+        # Tcl regular expression: \m and \M anchor the start and end of a word
+        alternatives = '|'.join(re.escape(term) for term in terms)
+        self._highlight_pattern = rf"\m({alternatives})\M"
+        self._highlight_range("1.0", tk.END)
+
+    def _highlight_range(self, start, end):
+        """Tag highlight matches between two indexes."""
+        if self._highlight_pattern is None:
+            return
+        count = tk.IntVar()
+        position = start
+        while True:
+            position = self.text.search(self._highlight_pattern, position, end,
+                                        regexp=True, nocase=True, count=count)
+            if not position or not count.get():
+                break
+            match_end = f"{position}+{count.get()}c"
+            self.text.tag_add("search_hit", position, match_end)
+            position = match_end
+
+    def current_page(self):
+        """Get the position of the page at the top of the view."""
+        if self.first == self.last:
+            return None
+        top = self.text.index("@0,0")
+        for index in range(self.last - 1, self.first, -1):
+            if self.text.compare(f"page{index}", "<=", top):
+                return index
+        return self.first
+
+    def next_page(self):
+        """Scroll to the next page."""
+        current = self.current_page()
+        if current is not None:
+            self.show_page(current + 1)
+
+    def previous_page(self):
+        """Scroll to the previous page."""
+        current = self.current_page()
+        if current is not None:
+            self.show_page(current - 1)
+
+    # ------------------------------------------------------------------
+    # Window management
+    # ------------------------------------------------------------------
+
+    def _reset_window(self, index=0):
+        """Empty the widget so the window starts at index."""
+        self.text.delete("1.0", tk.END)
+        for mark in self.text.mark_names():
+            if mark.startswith("page"):
+                self.text.mark_unset(mark)
+        self.first = self.last = index
+
+    def _append_page(self):
+        """Load the page after the window at the bottom of the widget."""
+        index = self.last
+        start = self.text.index("end-1c")
+        self.text.insert(tk.END, self.store.get_text(index))
+        self.text.mark_set(f"page{index}", start)
+        self.text.mark_gravity(f"page{index}", tk.RIGHT)
+        self.last += 1
+        self._highlight_range(f"page{index}", "end-1c")
+
+    def _prepend_page(self):
+        """Load the page before the window at the top of the widget."""
+        index = self.first - 1
+        self.text.insert("1.0", self.store.get_text(index))
+        self.text.mark_set(f"page{index}", "1.0")
+        self.text.mark_gravity(f"page{index}", tk.RIGHT)
+        self.first = index
+        self._highlight_range("1.0", f"page{index + 1}")
+
+    def _drop_first_page(self):
+        """Unload the page at the top of the widget."""
+        self.text.delete("1.0", f"page{self.first + 1}")
+        self.text.mark_unset(f"page{self.first}")
+        self.first += 1
+
+    def _drop_last_page(self):
+        """Unload the page at the bottom of the widget."""
+        self.last -= 1
+        self.text.delete(f"page{self.last}", "end-1c")
+        self.text.mark_unset(f"page{self.last}")
+
+    def _on_scroll(self, low, high):
+        """Update the scrollbar and slide the window when the view nears an edge."""
+        self.scrollbar.set(low, high)
+        if not self._check_pending:
+            self._check_pending = True
+            self.after_idle(self._slide_window)
+
+    def _slide_window(self):
+        """Load pages ahead of the view and unload pages far behind it."""
+        self._check_pending = False
+        if self.store is None or self.first == self.last:
+            return
+        low, high = self.text.yview()
+
+        self.text.mark_set("view_anchor", "@0,0")
+        self.text.mark_gravity("view_anchor", tk.RIGHT)
+        # Only pages that are completely out of view are unloaded, so the
+        # window grows when many short pages fit on screen at once
+        if high > 0.9 and self.last < len(self.store):
+            self._append_page()
+            while (self.last - self.first > self.window_pages and
+                   self.text.compare(f"page{self.first + 1}", "<=", "view_anchor")):
+                self._drop_first_page()
+        elif low < 0.1 and self.first > 0:
+            self._prepend_page()
+            bottom = self.text.index(f"@0,{self.text.winfo_height()}")
+            while (self.last - self.first > self.window_pages and
+                   self.text.compare(f"page{self.last - 1}", ">", bottom)):
+                self._drop_last_page()
+        self.text.yview("view_anchor")
+        self._update_position()
+
+    def _update_position(self):
+        """Show which page is at the top of the view."""
+        current = self.current_page()
+        if current is None:
+            self.position_label.config(text="")
+            return
+        file_index, page_num = self.store.get_location(current)
+        if self._current_file != file_index and file_index in self._combo_files:
+            self._current_file = file_index
+            self.file_combo.current(self._combo_files.index(file_index))
+        if self.focus_get() is not self.page_entry:
+            self.page_var.set(str(page_num))
+        self.position_label.config(
+            text=f"Page {current + 1} of {len(self.store)}")
+
+    def _on_file_selected(self, event=None):
+        """Jump to the first page of the chosen file."""
+        selected = self.file_combo.current()
+        if self.store is not None and selected >= 0:
+            self.show_file_page(self._combo_files[selected], 1)
+
+    def _on_page_entered(self, event=None):
+        """Jump to the typed page number within the selected file."""
+        if self.store is None:
+            return
+        try:
+            page_num = int(self.page_var.get())
+        except ValueError:
+            return
+        if self._current_file is not None:
+            self.show_file_page(self._current_file, page_num)
+        else:
+            self.show_page(page_num - 1)
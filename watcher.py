@@ -0,0 +1,250 @@
+"""
+Folder Watcher Module for PDF to Text Converter
+Incremental re-extraction of a folder driven by a persistent stat index
+Created by Jaswanth
+"""
+
+import json
+import os
+import tempfile
+import time
+
+import config
+from utils import FileUtilities, ValidationUtilities
+from writers import get_output_files, output_files_exist
+
+
+# A sync saves the index after this many recorded files or seconds, so a
+# crash part way through a large sync loses little work
+SAVE_EVERY_FILES = 50
+SAVE_INTERVAL_SECONDS = 5.0
+
+
+def scan_stats(directory):
+    """Yield (path, size, mtime_ns) for every PDF below directory, batched per folder."""
+    stack = [directory]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif FileUtilities.is_valid_pdf(entry.name) and entry.is_file():
+                            stat = entry.stat()
+                            yield entry.path, stat.st_size, stat.st_mtime_ns
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+
+class StatIndex:
+    """Persistent map of path -> (size, mtime_ns, digest, output) for a watched folder."""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.dirty = False
+        self.unsaved = 0
+        self.last_save = time.monotonic()
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    def record(self, path, output, digest, pages, size=None, mtime_ns=None, files=None,
+               **extra):
+        """Store the state of a freshly converted file (same signature as Manifest.record)."""
+        path = os.path.abspath(path)
+        if size is None or mtime_ns is None:
+            size, mtime_ns = FileUtilities.get_file_signature(path)
+        self.entries[path] = {
+            'size': size,
+            'mtime_ns': mtime_ns,
+            'digest': digest,
+            'output': os.path.abspath(output),
+            'files': files or [os.path.abspath(output)],
+            'pages': pages,
+        }
+        self.dirty = True
+        self.checkpoint()
+
+    def record_failure(self, path, error):
+        """Remember a file that failed so it is only retried once it changes."""
+        try:
+            size, mtime_ns = FileUtilities.get_file_signature(path)
+        except OSError:
+            return
+        self.entries[os.path.abspath(path)] = {
+            'size': size,
+            'mtime_ns': mtime_ns,
+            'digest': None,
+            'output': None,
+            'error': str(error),
+        }
+        self.dirty = True
+        self.checkpoint()
+
+    def remove(self, path):
+        """Forget a file; returns its entry, if any."""
+        entry = self.entries.pop(path, None)
+        if entry is not None:
+            self.dirty = True
+        return entry
+
+    def checkpoint(self):
+        """Save once enough files were recorded or enough time passed since the last save."""
+        self.unsaved += 1
+        if (self.unsaved >= SAVE_EVERY_FILES
+                or time.monotonic() - self.last_save >= SAVE_INTERVAL_SECONDS):
+            self.save()
+
+    def save(self):
+        """Write the index atomically if anything changed."""
+        self.unsaved = 0
+        self.last_save = time.monotonic()
+        if not self.dirty:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        FileUtilities.ensure_directory_exists(directory)
+        fd, temp_path = tempfile.mkstemp(prefix='.index.', dir=directory)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, separators=(',', ':'))
+        os.replace(temp_path, self.path)
+        self.dirty = False
+
+
+class FolderWatcher:
+    """Keep an output folder in sync with the PDFs in a source folder."""
+
+    def __init__(self, source_directory, output_directory, index_path=None,
+                 workers=1, log=None, extension=None, search_index=None):
+        self.source_directory = os.path.abspath(source_directory)
+        self.output_directory = os.path.abspath(output_directory)
+        self.index = StatIndex(index_path or
+                               os.path.join(self.output_directory, '.watch_index.json'))
+        self.workers = workers
+        self.log = log
+        self.extension = extension
+        self.search_index = search_index
+
+    def find_changes(self):
+        """Compare the folder with the index; returns (changed_paths, deleted_paths)."""
+        changed = []
+        seen = set()
+        entries = self.index.entries
+        for path, size, mtime_ns in scan_stats(self.source_directory):
+            path = os.path.abspath(path)
+            seen.add(path)
+            entry = entries.get(path)
+            if entry is not None and entry['size'] == size and entry['mtime_ns'] == mtime_ns:
+                continue
+            if (entry is not None and entry['size'] == size and entry['output']
+                    and output_files_exist(entry)):
+                # Touched but unchanged content: refresh the stat, skip extraction
+                try:
+                    if FileUtilities.hash_file(path) == entry['digest']:
+                        entry['mtime_ns'] = mtime_ns
+                        self.index.dirty = True
+                        continue
+                except OSError:
+                    continue
+            changed.append(path)
+        deleted = [path for path in entries if path not in seen]
+        return changed, deleted
+
+    def remove_outputs(self, deleted):
+        """Delete outputs of source files that no longer exist."""
+        for path in deleted:
+            entry = self.index.remove(path)
+            if entry['output']:
+                outputs = set(get_output_files(entry['output']) + entry.get('files', []))
+                outputs.update((entry['output'] + config.ERROR_REPORT_EXTENSION,
+                                entry['output'] + config.RECORD_INDEX_EXTENSION,
+                                entry['output'] + config.SEARCH_INDEX_EXTENSION))
+                for output in outputs:
+                    try:
+                        os.remove(output)
+                    except OSError:
+                        pass
+            if self.log:
+                self.log(f"Removed output for deleted file {path}")
+
+    def validate(self, changed):
+        """Yield changed files that pass the CLI's checks; others are recorded as failed."""
+        validation = config.VALIDATION
+        results = ValidationUtilities.iter_validated_files(
+            changed, max_size_mb=validation['max_file_size_mb'],
+            sniff_bytes=validation['sniff_bytes'], max_workers=validation['max_workers'])
+        for path, is_valid, message in results:
+            if is_valid:
+                yield path
+                continue
+            if self.log:
+                self.log(f"Skipping {path}: {message}")
+            # Not retried until the file changes again
+            self.index.record_failure(path, message)
+
+    def assign_outputs(self, paths):
+        """Pair files with output paths, never reusing an output another file owns.
+
+        Files whose names differ only in extension case, such as a.pdf and
+        a.PDF, map to the same output; the later one gets a numbered suffix
+        and the clash is reported.
+        """
+        from cli import get_output_path
+
+        owners = {entry['output']: path for path, entry in self.index.entries.items()
+                  if entry.get('output')}
+        for path in paths:
+            output = get_output_path(path, self.source_directory, self.output_directory,
+                                     self.extension)
+            entry = self.index.entries.get(path)
+            if (entry and entry.get('output')
+                    and os.path.splitext(entry['output'])[1] == os.path.splitext(output)[1]):
+                # Keep the output chosen when the file was first converted
+                output = entry['output']
+            elif owners.get(output, path) != path:
+                stem, extension = os.path.splitext(output)
+                suffix = 1
+                while owners.get(f"{stem}_{suffix}{extension}", path) != path:
+                    suffix += 1
+                if self.log:
+                    self.log(f"{path} and {owners[output]} both map to {output}; "
+                             f"writing {stem}_{suffix}{extension} instead")
+                output = f"{stem}_{suffix}{extension}"
+            owners[output] = path
+            yield path, output
+
+    def sync(self):
+        """Extract new and changed files and clean up deleted ones; returns counts."""
+        # Imported here so importing the watcher does not pull in the batch runner
+        from cache import default_cache_directory
+        from cli import run_batch
+
+        changed, deleted = self.find_changes()
+        self.remove_outputs(deleted)
+        self.index.save()
+        jobs = list(self.assign_outputs(self.validate(changed)))
+        done = failed = 0
+        if jobs:
+            cache_directory = default_cache_directory() if config.CACHE.get('enabled') else None
+            done, failed = run_batch(jobs, self.workers, self.index, cache_directory,
+                                     log=self.log, on_failure=self.index.record_failure,
+                                     search_index=self.search_index)
+        self.index.save()
+        return {'converted': done, 'failed': failed, 'deleted': len(deleted)}
+
+    def watch(self, interval, iterations=None):
+        """Sync every interval seconds until interrupted (or for a number of iterations)."""
+        count = 0
+        while iterations is None or count < iterations:
+            started = time.monotonic()
+            result = self.sync()
+            if self.log and (result['converted'] or result['failed'] or result['deleted']):
+                self.log(f"Converted {result['converted']} file(s), {result['failed']} "
+                         f"failed, removed {result['deleted']} output(s)")
+            count += 1
+            if iterations is None or count < iterations:
+                time.sleep(max(interval - (time.monotonic() - started), 0))
@@ -0,0 +1,193 @@
+"""
+Background Worker Module for PDF to Text Converter
+Runs extraction off the GUI thread and reports progress through a queue
+Created by Jaswanth
+"""
+
+import queue
+import threading
+import time
+
+import config
+from memory_budget import get_text_size
+from search_index import get_index_path
+
+
+# Seconds between cancel checks while waiting for room in the memory budget
+BUDGET_WAIT_SECONDS = 0.1
+
+
+class ProgressTracker:
+    """Track pages done against a total, with rate and ETA that ignore paused time."""
+
+    def __init__(self, total=0):
+        self.total = total
+        self.done = 0
+        self.started = time.monotonic()
+        self.paused_at = None
+        self.paused_seconds = 0.0
+
+    def pause(self):
+        """Stop the clock used for rate and ETA."""
+        if self.paused_at is None:
+            self.paused_at = time.monotonic()
+
+    def resume(self):
+        """Restart the clock after a pause."""
+        if self.paused_at is not None:
+            self.paused_seconds += time.monotonic() - self.paused_at
+            self.paused_at = None
+
+    def elapsed(self):
+        """Get seconds spent running, excluding pauses."""
+        now = self.paused_at if self.paused_at is not None else time.monotonic()
+        return max(now - self.started - self.paused_seconds, 0.0)
+
+    def rate(self):
+        """Get pages completed per second."""
+        elapsed = self.elapsed()
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    def eta(self):
+        """Get estimated seconds remaining, or None if unknown."""
+        rate = self.rate()
+        if rate <= 0 or self.total <= 0:
+            return None
+        return max(self.total - self.done, 0) / rate
+
+    def format(self):
+        """Format progress as a one-line summary."""
+        eta = self.eta()
+        eta_text = "--:--" if eta is None else time.strftime("%H:%M:%S", time.gmtime(eta))
+        return (f"{self.done}/{self.total} pages | {self.rate():.1f} pages/sec "
+                f"| ETA {eta_text}")
+
+
+class ExtractionWorker:
+    """Run an extractor on a background thread, posting events to a queue.
+
+    Events are tuples: ('total', pages), ('page', record), ('done', cancelled)
+    and ('error', exception). When a writer is given, each formatted page is
+    written to it from the worker thread and the record gains output_offset
+    and output_length; the writer is committed when the batch completes and
+    aborted on cancel or error. When a search index is given, every page is
+    added to it, and it is saved next to the writer's output on commit.
+    Pages and files that fail are collected in extractor.errors and, with a
+    writer, saved next to its output as an error report.
+
+    With a memory budget, the text of every queued page is counted against
+    it and the worker waits for room before queuing more; whoever drains a
+    'page' event must release get_text_size(record['text']) from the budget.
+    """
+
+    def __init__(self, extractor, files, writer=None, index=None, budget=None):
+        self.extractor = extractor
+        self.files = list(files)
+        self.writer = writer
+        self.index = index
+        self.budget = budget
+        self.events = queue.Queue()
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        """Start extracting in the background."""
+        self._thread.start()
+
+    def pause(self):
+        """Pause before the next page."""
+        self._running.clear()
+
+    def resume(self):
+        """Continue after a pause."""
+        self._running.set()
+
+    def cancel(self):
+        """Stop before the next page, even if paused."""
+        self._cancelled.set()
+        self._running.set()
+
+    def is_paused(self):
+        """Check whether the worker is paused."""
+        return not self._running.is_set()
+
+    def is_alive(self):
+        """Check whether the worker thread is still running."""
+        return self._thread.is_alive()
+
+    def join(self, timeout=None):
+        """Wait for the worker thread to finish."""
+        self._thread.join(timeout)
+
+    def _count_pages(self, pdf_file):
+        """Count pages for the progress total; unreadable files count as 0.
+
+        The extractor reports such files itself when it reaches them.
+        """
+        try:
+            return self.extractor.count_pages(pdf_file)
+        except Exception:
+            return 0
+
+    def _run(self):
+        """Extract every page, honouring pause and cancel between pages."""
+        pages = None
+        try:
+            self.extractor.start_batch()
+            total = sum(self._count_pages(pdf_file) for pdf_file in self.files)
+            self.events.put(('total', total))
+
+            pages = self.extractor.iter_pages(self.files)
+            for record in pages:
+                self._running.wait()
+                if self._cancelled.is_set():
+                    break
+                if self.index is not None:
+                    self.index.add_page(record)
+                if self.writer is not None:
+                    offset = self.writer.write_page(record,
+                                                    self.extractor.format_page(record))
+                    record['output_offset'] = offset
+                    record['output_length'] = self.writer.bytes_written - offset
+                if self.budget is not None and not self._wait_for_budget(record):
+                    break
+                self.events.put(('page', record))
+                self.extractor.metrics.record_queue_depth(self.events.qsize())
+
+            if self.writer is not None:
+                if self._cancelled.is_set():
+                    self.writer.abort()
+                else:
+                    self.writer.commit()
+                    if self.index is not None:
+                        self.index.save(get_index_path(self.writer.path))
+                    self.extractor.write_error_report(self.writer.path +
+                                                      config.ERROR_REPORT_EXTENSION)
+            self.events.put(('done', self._cancelled.is_set()))
+        except Exception as e:
+            if self.writer is not None:
+                self.writer.abort()
+            self.events.put(('error', e))
+        finally:
+            if pages is not None:
+                pages.close()
+
+    def _wait_for_budget(self, record):
+        """Count a page against the budget, waiting for room; False if cancelled."""
+        size = get_text_size(record['text'])
+        while not self.budget.acquire(size, BUDGET_WAIT_SECONDS):
+            if self._cancelled.is_set():
+                return False
+        return True
+
+    def drain(self, max_events=None):
+        """Get queued events without blocking."""
+        events = []
+        while max_events is None or len(events) < max_events:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                break
+        return events
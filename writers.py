@@ -0,0 +1,358 @@
+"""
+Output Writers Module for PDF to Text Converter
+Streams extracted text to disk and commits files with an atomic rename
+Created by Jaswanth
+"""
+
+import bz2
+import gzip
+import json
+import lzma
+import os
+import queue
+import tempfile
+import threading
+
+import config
+
+
+def _get_umask():
+    """Get the process umask without leaving it changed."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# Read once at import; changing the umask is not thread-safe
+FILE_MODE = 0o666 & ~_get_umask()
+
+
+# File extension and streaming compressor for each OUTPUT['compression'] choice
+COMPRESSORS = {
+    'gzip': ('.gz', lambda raw, level: gzip.GzipFile(fileobj=raw, mode='wb',
+                                                     compresslevel=level)),
+    'bz2': ('.bz2', lambda raw, level: bz2.BZ2File(raw, 'wb', compresslevel=max(level, 1))),
+    'lzma': ('.xz', lambda raw, level: lzma.LZMAFile(raw, 'wb', preset=level)),
+}
+
+
+class TextFileWriter:
+    """Write text through a buffered temporary file that replaces the target on commit."""
+
+    # Pages can be read back from the output by byte offset
+    seekable = True
+
+    def __init__(self, path, encoding=None, buffer_size=None):
+        self.path = os.path.abspath(path)
+        self.encoding = encoding or config.TEXT_ENCODING
+        buffer_size = buffer_size or config.PERFORMANCE['buffer_size']
+
+        directory, filename = os.path.split(self.path)
+        fd, self.temp_path = tempfile.mkstemp(prefix=f".{filename}.", suffix='.tmp',
+                                              dir=directory)
+        self._file = os.fdopen(fd, 'wb', buffering=buffer_size)
+        self.bytes_written = 0
+        self.closed = False
+
+    def write(self, text):
+        """Append text and return the byte offset it was written at."""
+        data = text.encode(self.encoding)
+        offset = self.bytes_written
+        self._file.write(data)
+        self.bytes_written += len(data)
+        return offset
+
+    def write_page(self, record, text):
+        """Append the formatted text of a page; returns its byte offset."""
+        return self.write(text)
+
+    def commit(self):
+        """Flush to disk and atomically move the file into place."""
+        if self.closed:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.chmod(self.temp_path, FILE_MODE)
+        os.replace(self.temp_path, self.path)
+        self.closed = True
+
+    def abort(self):
+        """Discard everything written so far and leave the target untouched."""
+        if self.closed:
+            return
+        self._file.close()
+        try:
+            os.remove(self.temp_path)
+        except OSError:
+            pass
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+        return False
+
+
+class ShardedWriter:
+    """Compress and/or shard text output on a writer thread fed by a bounded queue.
+
+    write() only encodes and queues, so extraction never waits on the
+    compressor unless the queue is full. A shard is closed at the first page
+    boundary after it reaches shard_size_mb on disk or shard_pages pages.
+    Shards are written to temporary files and renamed on commit, together
+    with a manifest listing them when sharding is on. Offsets returned by
+    write() count uncompressed bytes across all shards.
+    """
+
+    seekable = False
+
+    def __init__(self, path, compression=None, level=None, shard_size_mb=None,
+                 shard_pages=None, encoding=None, buffer_size=None, queue_size=None):
+        output = config.OUTPUT
+        if compression is not None and compression not in COMPRESSORS:
+            raise ValueError(f"Unknown compression: {compression}")
+        self.path = os.path.abspath(path)
+        self.compression = compression
+        self.level = output['compression_level'] if level is None else level
+        self.shard_bytes = int(shard_size_mb * 1024 * 1024) if shard_size_mb else None
+        self.shard_pages = shard_pages or None
+        self.sharded = bool(self.shard_bytes or self.shard_pages)
+        self.encoding = encoding or config.TEXT_ENCODING
+        self.buffer_size = buffer_size or config.PERFORMANCE['buffer_size']
+        self.bytes_written = 0
+        self.pages_written = 0
+        self.shards = []
+        self.closed = False
+
+        # State owned by the writer thread
+        self._raw = None
+        self._stream = None
+        self._shard = None
+        self._temp_paths = []
+        self._error = None
+        self._queue = queue.Queue(maxsize=queue_size or output['queue_chunks'])
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def get_shard_path(self, number):
+        """Get the final path of a shard."""
+        extension = COMPRESSORS[self.compression][0] if self.compression else ''
+        if not self.sharded:
+            return self.path + extension
+        stem, suffix = os.path.splitext(self.path)
+        return f"{stem}.{number:05d}{suffix}{extension}"
+
+    def get_manifest_path(self):
+        """Get the path of the shard manifest."""
+        return self.path + config.SHARD_MANIFEST_EXTENSION
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def write(self, text):
+        """Queue text and return the uncompressed byte offset it starts at."""
+        return self._put(text, 0)
+
+    def write_page(self, record, text):
+        """Queue the formatted text of a page; shards only roll over between pages."""
+        self.pages_written += 1
+        return self._put(text, 1)
+
+    def _put(self, text, pages):
+        if self._error is not None:
+            raise self._error
+        data = text.encode(self.encoding)
+        offset = self.bytes_written
+        self._queue.put((data, pages))
+        self.bytes_written += len(data)
+        return offset
+
+    def _finish(self):
+        """Stop the writer thread once it has written everything queued."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def commit(self):
+        """Wait for the writer thread, then move shards and manifest into place."""
+        if self.closed:
+            return
+        self._finish()
+        self.closed = True
+        if self._error is not None:
+            self._remove_temp_files()
+            raise self._error
+
+        previous = self._read_previous_shards()
+        for shard, temp_path in zip(self.shards, self._temp_paths):
+            os.chmod(temp_path, FILE_MODE)
+            os.replace(temp_path, os.path.join(os.path.dirname(self.path), shard['path']))
+        self._temp_paths = []
+        if self.sharded:
+            self._write_manifest()
+            # Shards left over from a longer earlier run are no longer listed
+            current = {shard['path'] for shard in self.shards}
+            for name in previous - current:
+                try:
+                    os.remove(os.path.join(os.path.dirname(self.path), name))
+                except OSError:
+                    pass
+
+    def abort(self):
+        """Discard every shard written so far."""
+        if self.closed:
+            return
+        self._finish()
+        self.closed = True
+        self._remove_temp_files()
+
+    def _remove_temp_files(self):
+        for temp_path in self._temp_paths:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+        self._temp_paths = []
+
+    def _read_previous_shards(self):
+        """Get shard names listed by an existing manifest for this output."""
+        try:
+            with open(self.get_manifest_path(), 'r', encoding='utf-8') as f:
+                return {shard['path'] for shard in json.load(f)['shards']}
+        except (OSError, ValueError, KeyError):
+            return set()
+
+    def _write_manifest(self):
+        manifest = {
+            'compression': self.compression,
+            'encoding': self.encoding,
+            'pages': self.pages_written,
+            'bytes': self.bytes_written,
+            'shards': self.shards,
+        }
+        fd, temp_path = tempfile.mkstemp(prefix='.shards.', dir=os.path.dirname(self.path))
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.chmod(temp_path, FILE_MODE)
+        os.replace(temp_path, self.get_manifest_path())
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        offset = 0
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                data, pages = item
+                if self._stream is None:
+                    self._open_shard(offset)
+                self._stream.write(data)
+                offset += len(data)
+                self._shard['bytes'] += len(data)
+                self._shard['pages'] += pages
+                if pages and self._is_shard_full():
+                    self._close_shard()
+            # An unsharded output always exists, even when empty
+            if self._stream is None and not self.sharded:
+                self._open_shard(offset)
+            if self._stream is not None:
+                self._close_shard()
+        except Exception as e:
+            self._error = e
+            if self._raw is not None:
+                self._raw.close()
+            # Keep consuming so the producer never blocks on a full queue
+            while self._queue.get() is not None:
+                pass
+
+    def _open_shard(self, offset):
+        number = len(self.shards)
+        directory, filename = os.path.split(self.get_shard_path(number))
+        fd, temp_path = tempfile.mkstemp(prefix=f".{filename}.", suffix='.tmp', dir=directory)
+        self._temp_paths.append(temp_path)
+        self._raw = os.fdopen(fd, 'wb', buffering=self.buffer_size)
+        if self.compression:
+            self._stream = COMPRESSORS[self.compression][1](self._raw, self.level)
+        else:
+            self._stream = self._raw
+        self._shard = {'path': filename, 'offset': offset, 'bytes': 0, 'pages': 0}
+
+    def _is_shard_full(self):
+        if self.shard_pages and self._shard['pages'] >= self.shard_pages:
+            return True
+        # tell() on the raw file counts compressed bytes, as they land on disk
+        return bool(self.shard_bytes and self._raw.tell() >= self.shard_bytes)
+
+    def _close_shard(self):
+        if self._stream is not self._raw:
+            self._stream.close()
+        self._raw.flush()
+        os.fsync(self._raw.fileno())
+        self._shard['stored_bytes'] = self._raw.tell()
+        self._raw.close()
+        self.shards.append(self._shard)
+        self._raw = self._stream = self._shard = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+        return False
+
+
+def create_writer(path, allow_records=True):
+    """Create the writer for an output path and the OUTPUT settings.
+
+    A .jsonl path gets JSON Lines page records (never compressed, so the
+    offset index stays valid); other paths get a ShardedWriter when
+    compression or sharding is configured, else a plain TextFileWriter.
+    """
+    from page_records import PageRecordWriter, is_record_output
+    if allow_records and is_record_output(path):
+        return PageRecordWriter(path)
+    output = config.OUTPUT
+    if output.get('compression') or output.get('shard_size_mb') or output.get('shard_pages'):
+        return ShardedWriter(path, output.get('compression'),
+                             shard_size_mb=output.get('shard_size_mb'),
+                             shard_pages=output.get('shard_pages'))
+    return TextFileWriter(path)
+
+
+def get_output_files(path):
+    """Get the files that exist on disk for an output path, including shards."""
+    directory = os.path.dirname(os.path.abspath(path))
+    files = [path]
+    files.extend(path + extension for extension, _ in COMPRESSORS.values())
+    manifest_path = path + config.SHARD_MANIFEST_EXTENSION
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            files.extend(os.path.join(directory, shard['path'])
+                         for shard in json.load(f)['shards'])
+        files.append(manifest_path)
+    except (OSError, ValueError, KeyError):
+        pass
+    return [name for name in files if os.path.exists(name)]
+
+
+def output_files_exist(entry):
+    """Check that the files recorded for a converted output are all still on disk.
+
+    Entries list the files the writer produced under 'files'; older ones
+    only have 'output', which is what a plain text writer produces.
+    """
+    files = entry.get('files') or [entry['output']]
+    return all(os.path.exists(name) for name in files)